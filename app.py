@@ -23,9 +23,15 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 86400  # 24시간
 
+# 서버 측 세션 저장소 (쿠키에는 세션 ID만 저장, SESSION_BACKEND=cookie면 기본 쿠키 세션)
+if os.getenv('SESSION_BACKEND', 'sqlite').lower() == 'sqlite':
+    from utils.session_store import SQLiteSessionInterface
+    app.session_interface = SQLiteSessionInterface()
+
 # 확장 초기화
 db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+# SQLite는 ALTER TABLE 지원이 제한적이므로 마이그레이션을 테이블 재생성(batch) 방식으로 생성
+migrate = Migrate(app, db, render_as_batch=True)
 CORS(app, 
      supports_credentials=True,
      origins=['http://localhost:3000', 'http://127.0.0.1:3000'],
@@ -51,6 +57,12 @@ def log_request_info():
         logging.info(f'요청 데이터: {request.get_json()}')
     logging.info(f'세션 키: {list(session.keys())}')
 
+# 다른 워커의 영양 데이터 재로딩/추가 반영 (세대 번호만 확인)
+@app.before_request
+def sync_nutrition_catalog():
+    from services.nutrition_data_service import get_nutrition_data_service
+    get_nutrition_data_service().sync_with_shared_catalog()
+
 # 블루프린트 등록
 app.register_blueprint(profile_bp, url_prefix='/api')
 app.register_blueprint(classification_bp, url_prefix='/api')
@@ -58,6 +70,21 @@ app.register_blueprint(nutrition_bp, url_prefix='/api')
 app.register_blueprint(intake_bp, url_prefix='/api')
 app.register_blueprint(recommendation_bp, url_prefix='/api')
 
+# 정적 안내 응답 사전 계산 (직렬화/압축 결과 보관)
+with app.app_context():
+    from routes.classification_routes import precompute_static_responses
+    precompute_static_responses()
+
+# 섭취 기록 테이블 준비 (gunicorn 등 __main__이 아닌 실행에서도 생성, 추이 조회는 영속화 비활성화 시에도 사용)
+# 이전 스키마이면 'flask db upgrade' 안내 후 DB 저장 중지
+from services.intake_persistence_service import get_intake_persistence
+with app.app_context():
+    get_intake_persistence().prepare_schema(db)
+
+# 음식 검색 색인 미리 생성 (백그라운드)
+from services.food_search_service import get_food_search_service
+get_food_search_service().warm_up()
+
 @app.route('/')
 def index():
     return jsonify({
@@ -0,0 +1,6 @@
+"""
+추천 엔진 성능 벤치마크
+
+합성 카탈로그와 무작위 프로필/섭취 상태로 추천 엔진과 영양 분석기의 소요 시간을
+측정하고 JSON 기준값과 비교합니다. 실행 방법은 recommendation_benchmark.py 참고.
+"""
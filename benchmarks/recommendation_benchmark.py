@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+추천 엔진 성능 벤치마크
+
+합성 카탈로그(기본 10, 1천, 1만, 10만 개)마다 무작위 프로필/섭취 상태를 만들고,
+Flask 테스트 요청 컨텍스트 안에서 추천 생성, 추천 점수 계산, 영양 부족분 분석,
+영양 점수 계산 시간을 측정합니다. 결과는 JSON 기준값으로 저장하고, 비교 모드에서는
+중앙값이 기준값보다 임계치 이상 느려진 항목을 회귀로 표시합니다 (종료 코드 1).
+
+사용법:
+    python -m benchmarks.recommendation_benchmark --output benchmarks/baseline.json
+    python -m benchmarks.recommendation_benchmark --compare benchmarks/baseline.json
+    python -m benchmarks.recommendation_benchmark --sizes 10 1000 --profiles 5 --threshold 0.3
+"""
+
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BENCHMARK_FORMAT = 'babmechu-benchmark'
+BENCHMARK_VERSION = 2  # 2: 영양 부족분 분석에 분석 컨텍스트 계산 포함
+
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+DEFAULT_PROFILES = 20
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2      # 중앙값 20% 이상 느려지면 회귀
+DEFAULT_MIN_DELTA_MS = 0.05  # 이보다 작은 차이는 측정 오차로 보고 무시
+
+# 추천 API 최대 개수와 같게 측정
+BENCHMARK_RECOMMENDATIONS = 5
+
+CASES = (
+    'calculate_nutrition_score',
+    'analyze_nutritional_gaps',
+    'calculate_recommendation_scores',
+    'generate_recommendations',
+    'generate_recommendations_cached'
+)
+
+def _summarize(samples: List[float]) -> Dict:
+    """측정값 요약 (밀리초)"""
+    ordered = sorted(samples)
+    p95_index = max(0, min(len(ordered) - 1, int(round(0.95 * len(ordered))) - 1))
+    return {
+        'median_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[p95_index], 4),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'min_ms': round(ordered[0], 4),
+        'samples': len(ordered)
+    }
+
+def _time_calls(function: Callable, repeat: int) -> List[float]:
+    """한 번 예열 호출 후 repeat번 측정 (밀리초)"""
+    function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def _install_catalog(size: int, seed: int, workdir: str):
+    """
+    합성 카탈로그를 컴파일된 카탈로그로 저장하고 영양 데이터 서비스로 올림
+    
+    Returns:
+        새 카탈로그를 읽은 NutritionDataService (전역 인스턴스로도 등록)
+    """
+    import services.nutrition_data_service as nutrition_data_module
+    from utils.catalog_ingest_utils import write_compiled_catalog
+    from benchmarks.synthetic_data import generate_catalog
+    
+    directory = os.path.join(workdir, f'catalog_{size}')
+    data_directory = os.path.join(directory, 'nutrition')
+    os.makedirs(data_directory, exist_ok=True)
+    
+    catalog_path = os.path.join(directory, 'nutrition_catalog.json')
+    write_compiled_catalog(catalog_path, generate_catalog(size, seed), sources=['synthetic'])
+    os.environ['NUTRITION_COMPILED_CATALOG'] = catalog_path
+    
+    # 추천 엔진은 get_nutrition_data_service()로 조회하므로 전역 인스턴스를 교체
+    service = nutrition_data_module.NutritionDataService(data_directory)
+    nutrition_data_module._nutrition_data_service = service
+    return service
+
+def run_size(size: int, profiles: List[Dict], repeat: int, seed: int, workdir: str) -> Dict:
+    """
+    카탈로그 크기 하나에 대한 측정
+    
+    Args:
+        size: 카탈로그 음식 수
+        profiles: 무작위 프로필 목록 (프로필마다 섭취 상태를 새로 만듦)
+        repeat: 프로필당 측정 반복 횟수
+        seed: 난수 시드
+        workdir: 카탈로그/공유 상태 임시 디렉토리
+    
+    Returns:
+        측정 항목 -> 요약
+    """
+    from flask import Flask, g
+    from services.analysis_context import ANALYSIS_CONTEXT_KEY, get_analysis_context
+    from services.intake_service import SessionIntakeService
+    from services.profile_service import SessionProfileService
+    from services.recommendation_cache_service import RecommendationResultCache
+    from services.recommendation_service import MenuRecommendationEngine, RecommendationEngine
+    from utils.nutrition_utils import calculate_nutrition_score
+    from benchmarks.synthetic_data import generate_intake
+    
+    service = _install_catalog(size, seed, workdir)
+    food_names, nutrient_matrix, _ = service.get_nutrient_matrix()
+    
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'benchmark'
+    
+    samples = {case: [] for case in CASES}
+    cache_enabled = RecommendationResultCache.ENABLED
+    
+    def generate(engine: MenuRecommendationEngine, cached: bool):
+        # 요청 단위 분석 결과를 지워 매번 분석부터 다시 수행
+        RecommendationResultCache.ENABLED = cached
+        g.pop(ANALYSIS_CONTEXT_KEY, None)
+        return engine.generate_recommendations(BENCHMARK_RECOMMENDATIONS)
+    
+    def analyze(engine: RecommendationEngine):
+        # 섭취량 합산/부족·과잉 판정(분석 컨텍스트 계산)까지 포함해 측정
+        g.pop(ANALYSIS_CONTEXT_KEY, None)
+        return engine.analyze_nutritional_gaps()
+    
+    try:
+        for number, profile in enumerate(profiles):
+            with app.test_request_context():
+                SessionProfileService.create_profile(profile)
+                for food_name in generate_intake(food_names, seed + number):
+                    SessionIntakeService.log_meal(food_name, service.get_nutrition_data(food_name)['nutrition'])
+                
+                context = get_analysis_context()
+                gap_engine = RecommendationEngine()
+                menu_engine = MenuRecommendationEngine()
+                analysis = gap_engine.analyze_nutritional_gaps(context=context)
+                
+                cases = {
+                    'calculate_nutrition_score': lambda: calculate_nutrition_score(
+                        context.current_intake, context.targets
+                    ),
+                    'analyze_nutritional_gaps': lambda: analyze(gap_engine),
+                    'calculate_recommendation_scores': lambda: menu_engine._calculate_recommendation_scores(
+                        nutrient_matrix, analysis['deficient_nutrients'], analysis['excess_nutrients'],
+                        analysis['remaining_allowance'], analysis['current_intake'],
+                        analysis['targets'], analysis['analysis_summary']['nutrition_score']
+                    ),
+                    'generate_recommendations': lambda: generate(menu_engine, cached=False),
+                    'generate_recommendations_cached': lambda: generate(menu_engine, cached=True)
+                }
+                for case in CASES:
+                    samples[case].extend(_time_calls(cases[case], repeat))
+    finally:
+        RecommendationResultCache.ENABLED = cache_enabled
+    
+    return {case: _summarize(timings) for case, timings in samples.items()}
+
+def run_benchmarks(sizes: List[int], profile_count: int, repeat: int, seed: int) -> Dict:
+    """
+    전체 벤치마크 실행
+    
+    Returns:
+        기준값 JSON 형식의 결과
+    """
+    import numpy as np
+    from benchmarks.synthetic_data import generate_profiles
+    
+    workdir = tempfile.mkdtemp(prefix='babmechu-benchmark-')
+    # 공유 상태(카탈로그/추천 캐시)는 실제 인스턴스와 섞이지 않도록 임시 디렉토리 사용
+    os.environ['SHARED_STATE_DIR'] = os.path.join(workdir, 'shared')
+    # 섭취 기록 DB 저장은 측정 대상이 아니며 실제 DB에 쓰지 않도록 끔
+    os.environ['INTAKE_PERSISTENCE_ENABLED'] = 'false'
+    
+    try:
+        profiles = generate_profiles(profile_count, seed)
+        results = {}
+        for size in sizes:
+            started = time.perf_counter()
+            results[str(size)] = run_size(size, profiles, repeat, seed, workdir)
+            print(f"  {size:>7,}개 카탈로그 측정 완료 ({time.perf_counter() - started:.1f}초)", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    return {
+        'format': BENCHMARK_FORMAT,
+        'version': BENCHMARK_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {
+            'sizes': list(sizes),
+            'profiles': profile_count,
+            'repeat': repeat,
+            'seed': seed,
+            'recommendations': BENCHMARK_RECOMMENDATIONS
+        },
+        'results': results
+    }
+
+def load_results(path: str) -> Dict:
+    """저장된 벤치마크 결과(기준값) 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if data.get('format') != BENCHMARK_FORMAT:
+        raise ValueError(f"벤치마크 결과 형식이 아닙니다: {path}")
+    if data.get('version') != BENCHMARK_VERSION:
+        raise ValueError(f"지원하지 않는 벤치마크 결과 버전입니다: {data.get('version')}")
+    return data
+
+def save_results(path: str, data: Dict):
+    """벤치마크 결과 저장"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Dict]:
+    """
+    기준값 대비 중앙값 변화 비교
+    
+    Args:
+        current: 이번 결과
+        baseline: 기준값
+        threshold: 회귀로 볼 증가율 (0.2 = 20%)
+        min_delta_ms: 회귀로 볼 최소 증가량 (밀리초)
+    
+    Returns:
+        크기/항목별 비교 목록 ('status': regression, improved, ok, new)
+    """
+    comparisons = []
+    for size, cases in current['results'].items():
+        for case, summary in cases.items():
+            reference = baseline['results'].get(size, {}).get(case)
+            entry = {
+                'size': int(size),
+                'case': case,
+                'median_ms': summary['median_ms'],
+                'baseline_ms': reference['median_ms'] if reference else None,
+                'change': None,
+                'status': 'new'
+            }
+            
+            if reference:
+                delta = summary['median_ms'] - reference['median_ms']
+                entry['change'] = delta / reference['median_ms'] if reference['median_ms'] > 0 else None
+                if delta > min_delta_ms and delta > threshold * reference['median_ms']:
+                    entry['status'] = 'regression'
+                elif -delta > min_delta_ms and -delta > threshold * reference['median_ms']:
+                    entry['status'] = 'improved'
+                else:
+                    entry['status'] = 'ok'
+            
+            comparisons.append(entry)
+    return comparisons
+
+def print_results(data: Dict, comparisons: Optional[List[Dict]] = None):
+    """결과 표 출력 (비교 결과가 있으면 기준값과 변화율 포함)"""
+    status_of = {(entry['size'], entry['case']): entry for entry in comparisons or []}
+    
+    header = f"{'카탈로그':>9}  {'항목':<34}{'중앙값(ms)':>12}{'p95(ms)':>11}"
+    if comparisons is not None:
+        header += f"{'기준값(ms)':>12}{'변화':>9}  상태"
+    print(header)
+    
+    for size, cases in data['results'].items():
+        for case, summary in cases.items():
+            line = f"{int(size):>9,}  {case:<34}{summary['median_ms']:>12.3f}{summary['p95_ms']:>11.3f}"
+            entry = status_of.get((int(size), case))
+            if entry is not None:
+                baseline = f"{entry['baseline_ms']:.3f}" if entry['baseline_ms'] is not None else '-'
+                change = f"{entry['change']:+.1%}" if entry['change'] is not None else '-'
+                line += f"{baseline:>12}{change:>9}  {entry['status']}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description='추천 엔진 성능 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help=f'카탈로그 음식 수 (기본: {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--profiles', type=int, default=DEFAULT_PROFILES, help='크기별 무작위 프로필 수')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='프로필당 측정 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--output', '-o', help='결과를 JSON 기준값으로 저장할 경로')
+    parser.add_argument('--compare', '-c', metavar='BASELINE', help='비교할 기준값 JSON 경로')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'회귀로 볼 중앙값 증가율 (기본: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f'회귀로 볼 최소 증가량 (기본: {DEFAULT_MIN_DELTA_MS}ms)')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(message)s')
+    
+    try:
+        baseline = load_results(args.compare) if args.compare else None
+        data = run_benchmarks(args.sizes, args.profiles, args.repeat, args.seed)
+    except Exception as e:
+        print(f"❌ 벤치마크 실패: {str(e)}")
+        return 1
+    
+    comparisons = None
+    if baseline is not None:
+        comparisons = compare_results(data, baseline, args.threshold, args.min_delta_ms)
+    print_results(data, comparisons)
+    
+    if args.output:
+        save_results(args.output, data)
+        print(f"✅ 결과 저장: {args.output}")
+    
+    regressions = [entry for entry in comparisons or [] if entry['status'] == 'regression']
+    if regressions:
+        print(f"❌ 성능 회귀 {len(regressions)}건 (임계치 {args.threshold:.0%})")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+벤치마크용 합성 데이터 생성 (카탈로그, 프로필, 섭취 상태)
+
+음식명은 한 끼 분류 접미사와 재료 키워드를 붙여 만들어 분류/식이 태그가 실제
+카탈로그처럼 섞이도록 하고, 영양소는 분류별 기준값에 난수 배율을 곱해 만듭니다.
+같은 시드는 항상 같은 데이터를 만듭니다.
+"""
+
+import random
+from typing import Dict, List
+from utils.nutrition_utils import NUTRIENT_KEYS
+
+# 음식명 접미사별 1회 제공량 기준 영양소 (NUTRIENT_KEYS 순서)
+SUFFIX_NUTRITION = {
+    '밥': (300, 60, 1, 6, 2, 0.5, 0, 300, 2),
+    '죽': (180, 35, 2, 5, 2, 0.4, 10, 500, 1),
+    '국수': (420, 75, 4, 14, 6, 1.5, 20, 1500, 3),
+    '국': (120, 8, 2, 8, 5, 1.5, 30, 900, 2),
+    '찌개': (200, 10, 3, 14, 10, 3, 50, 1300, 3),
+    '탕': (350, 12, 2, 28, 18, 6, 120, 1400, 2),
+    '나물': (60, 6, 1, 3, 3, 0.4, 0, 350, 3),
+    '조림': (180, 10, 6, 18, 7, 2, 60, 700, 1),
+    '볶음': (220, 15, 5, 10, 12, 3, 40, 600, 2),
+    '구이': (250, 2, 1, 25, 15, 5, 80, 500, 0),
+    '전': (230, 18, 2, 8, 14, 3, 60, 450, 1),
+    '떡': (250, 55, 15, 4, 1, 0.2, 0, 150, 1),
+    '주스': (120, 28, 24, 1, 0.3, 0, 0, 10, 1)
+}
+
+# 음식명 앞에 붙이는 재료 (식이 제한 태그 분포용, 빈 문자열은 태그 없음)
+INGREDIENT_PREFIXES = ('', '', '', '돼지', '소고기', '닭', '두부', '계란', '새우', '오징어', '버섯', '감자')
+
+GENDERS = ('M', 'F')
+ACTIVITY_LEVELS = ('low', 'moderate', 'high')
+GOALS = ('lose', 'maintain', 'gain')
+DIETARY_RESTRICTIONS = ('vegetarian', 'no_pork', 'shrimp', 'egg', 'gluten_free')
+
+def generate_catalog(size: int, seed: int = 0) -> Dict[str, Dict]:
+    """
+    합성 음식 카탈로그 생성
+    
+    Args:
+        size: 음식 수
+        seed: 난수 시드
+    
+    Returns:
+        음식명 -> {'name', 'serving_size', 'nutrition'} (write_compiled_catalog 입력 형식)
+    """
+    rng = random.Random(seed)
+    suffixes = list(SUFFIX_NUTRITION)
+    foods = {}
+    
+    for number in range(size):
+        suffix = rng.choice(suffixes)
+        name = f"합성{number:06d}{rng.choice(INGREDIENT_PREFIXES)}{suffix}"
+        foods[name] = {
+            'name': name,
+            'serving_size': 100.0,
+            'nutrition': {
+                nutrient: round(base * rng.uniform(0.3, 1.8), 1)
+                for nutrient, base in zip(NUTRIENT_KEYS, SUFFIX_NUTRITION[suffix])
+            }
+        }
+    
+    return foods
+
+def generate_profiles(count: int, seed: int = 0) -> List[Dict]:
+    """
+    무작위 프로필 생성 (SessionProfileService.create_profile 입력 형식)
+    
+    Args:
+        count: 프로필 수
+        seed: 난수 시드
+    
+    Returns:
+        프로필 목록 (약 20%는 식이 제한 포함)
+    """
+    rng = random.Random(seed)
+    profiles = []
+    
+    for _ in range(count):
+        profiles.append({
+            'age': rng.randint(18, 75),
+            'height': round(rng.uniform(150, 190), 1),
+            'weight': round(rng.uniform(45, 100), 1),
+            'gender': rng.choice(GENDERS),
+            'activity_level': rng.choice(ACTIVITY_LEVELS),
+            'goal': rng.choice(GOALS),
+            'dietary_restrictions': (
+                [rng.choice(DIETARY_RESTRICTIONS)] if rng.random() < 0.2 else []
+            )
+        })
+    
+    return profiles
+
+def generate_intake(food_names: List[str], seed: int = 0, max_meals: int = 4) -> List[str]:
+    """
+    무작위 섭취 상태 생성 (오늘 먹은 음식 목록)
+    
+    Args:
+        food_names: 카탈로그 음식명 목록
+        seed: 난수 시드
+        max_meals: 최대 식사 수 (0개부터 균등 선택)
+    
+    Returns:
+        기록할 음식명 목록
+    """
+    rng = random.Random(seed)
+    meal_count = rng.randint(0, max_meals)
+    return [rng.choice(food_names) for _ in range(meal_count)] if food_names else []
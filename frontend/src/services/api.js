@@ -118,9 +118,16 @@ export const nutritionService = {
   // 특정 음식의 영양 정보
   getFoodNutrition: (foodName) => api.get(`/nutrition/${encodeURIComponent(foodName)}`),
   
+  // 여러 음식의 영양 정보 일괄 조회
+  getBatchNutrition: (foodNames) => api.post('/nutrition/batch', { food_names: foodNames }),
+  
   // 사용 가능한 음식 목록
   getAvailableFoods: () => api.get('/nutrition/available'),
   
+  // 음식명 자동완성 (초성 검색 지원)
+  autocompleteFoods: (query, limit = 8) =>
+    api.get(`/nutrition/autocomplete?q=${encodeURIComponent(query)}&limit=${limit}`),
+  
   // 영양소 비교
   compareWithTargets: (nutritionData) => api.post('/nutrition/compare', { nutrition: nutritionData }),
 };
@@ -177,6 +184,22 @@ export const recommendationService = {
   // 식사 추천 조회
   getRecommendations: (limit = 3) => api.get(`/recommendations?limit=${limit}`),
   
+  // 한 끼 조합 추천 (주식 + 국/찌개 + 반찬)
+  getMealCombinations: (limit = 3, maxDishes = 4) =>
+    api.get(`/recommendations/combinations?limit=${limit}&max_dishes=${maxDishes}`),
+  
+  // 주간 식단 계획 (7일 x 3끼)
+  getMealPlan: (days = 7) => api.get(`/recommendations/meal-plan?days=${days}`),
+  
+  // 남은 필요량과 가장 가까운 음식 (radius를 주면 반경 검색)
+  getGapFillingFoods: (k = 5, { mealFraction, radius, exclude = [] } = {}) => {
+    const params = new URLSearchParams({ k });
+    if (mealFraction) params.append('meal_fraction', mealFraction);
+    if (radius) params.append('radius', radius);
+    if (exclude.length) params.append('exclude', exclude.join(','));
+    return api.get(`/recommendations/nearest?${params.toString()}`);
+  },
+  
   // 영양 분석 정보
   getNutritionalAnalysis: () => api.get('/recommendations/analysis'),
   
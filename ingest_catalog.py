@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+외부 식품 영양 데이터 일괄 수집 스크립트
+
+CSV/XLSX/JSON 파일을 읽어 컴파일된 카탈로그(data/nutrition_catalog.json)를 만듭니다.
+서비스는 시작/재로딩 시 이 카탈로그를 읽고, data/nutrition의 개별 JSON 파일이 있으면
+같은 음식명에 대해 개별 파일을 우선합니다.
+
+사용법:
+    python ingest_catalog.py 식품영양성분DB.csv
+    python ingest_catalog.py foods.xlsx extra.jsonl --workers 4 --chunk-size 5000
+    python ingest_catalog.py foods.csv --map "에너지(kJ)=e" --missing-as-zero
+"""
+
+import sys
+import logging
+import argparse
+from utils.catalog_ingest_utils import ingest_sources, DEFAULT_CHUNK_SIZE
+
+DEFAULT_OUTPUT = 'data/nutrition_catalog.json'
+
+def parse_column_overrides(values):
+    """--map 옵션 파싱 ('열 이름=원본 영양소 키')"""
+    overrides = {}
+    for value in values or []:
+        column, sep, key = value.rpartition('=')
+        if not sep or not column or not key:
+            raise argparse.ArgumentTypeError(f"잘못된 --map 형식입니다: {value} (예: '에너지(kJ)=e')")
+        overrides[column] = key
+    return overrides
+
+def main():
+    parser = argparse.ArgumentParser(description='외부 식품 영양 데이터 일괄 수집')
+    parser.add_argument('sources', nargs='+', help='입력 파일 (.csv, .xlsx, .json, .jsonl)')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help=f'출력 경로 (기본: {DEFAULT_OUTPUT})')
+    parser.add_argument('--workers', '-w', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='청크당 행 수')
+    parser.add_argument('--map', action='append', dest='column_map', metavar='COLUMN=KEY',
+                        help='열 이름을 원본 영양소 키(name, g, e, cal, sug, pro, fat, total_sfa, chol, na, total_tfa)에 매핑')
+    parser.add_argument('--missing-as-zero', action='store_true', help="결측값('-', 빈 값)을 0으로 처리")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+    
+    try:
+        overrides = parse_column_overrides(args.column_map)
+        stats = ingest_sources(
+            args.sources,
+            args.output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            overrides=overrides,
+            missing_as_zero=args.missing_as_zero
+        )
+    except Exception as e:
+        print(f"❌ 수집 실패: {str(e)}")
+        return 1
+    
+    print(f"✅ 컴파일된 카탈로그 저장: {stats['output']}")
+    print(f"   입력 {stats['sources']}개 파일, {stats['rows']:,}행 처리 ({stats['elapsed_seconds']}초, {stats['rows_per_second']:,}행/초)")
+    print(f"   채택 {stats['accepted']:,}행 -> 음식 {stats['foods']:,}개 (중복 {stats['duplicates']:,}개)")
+    print(f"   거부 {stats['rejected']:,}행")
+    for reason, count in sorted(stats['reject_reasons'].items()):
+        print(f"     - {reason}: {count:,}")
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,12 +5,14 @@
 
 from app import app, db
 from models import *
+from flask_migrate import stamp
 
 def init_database():
     """데이터베이스 테이블 생성"""
     with app.app_context():
-        # 모든 테이블 생성
+        # 모든 테이블 생성 후 최신 마이그레이션으로 표시 (이후 스키마 변경은 flask db upgrade)
         db.create_all()
+        stamp()
         print("✅ 데이터베이스 테이블이 성공적으로 생성되었습니다.")
 
 def drop_database():
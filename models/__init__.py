@@ -1,8 +1,8 @@
 # 모델 패키지 초기화
 from .user_models import User, UserProfile, DietaryRestriction
-from .nutrition_models import DailyIntake, MealLog, RecommendationHistory
+from .nutrition_models import DailyIntake, IntakeRollup, MealLog, RecommendationHistory
 
 __all__ = [
     'User', 'UserProfile', 'DietaryRestriction',
-    'DailyIntake', 'MealLog', 'RecommendationHistory'
+    'DailyIntake', 'IntakeRollup', 'MealLog', 'RecommendationHistory'
 ]
\ No newline at end of file
@@ -7,7 +7,8 @@ class DailyIntake(db.Model):
     __tablename__ = 'daily_intakes'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    session_id = db.Column(db.String(64), nullable=True)  # 세션 기반 사용자 (MVP)
     date = db.Column(db.Date, nullable=False, default=date.today)
     
     # 9가지 핵심 영양소
@@ -20,22 +21,63 @@ class DailyIntake(db.Model):
     total_cholesterol = db.Column(db.Float, default=0.0)
     total_sodium = db.Column(db.Float, default=0.0)
     total_fiber = db.Column(db.Float, default=0.0)
+    meal_count = db.Column(db.Integer, default=0)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # 유니크 제약 조건: 사용자당 하루에 하나의 레코드만
-    __table_args__ = (db.UniqueConstraint('user_id', 'date', name='unique_user_date'),)
+    # 유니크 제약 조건: 사용자(세션)당 하루에 하나의 레코드만 (일괄 UPSERT 충돌 키)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='unique_user_date'),
+        db.UniqueConstraint('session_id', 'date', name='unique_session_date'),
+    )
 
     def __repr__(self):
         return f'<DailyIntake user_id={self.user_id} date={self.date}>'
 
+class IntakeRollup(db.Model):
+    """주/월 단위 섭취량 집계 모델 (일일 섭취량이 바뀔 때 해당 기간만 다시 집계)"""
+    __tablename__ = 'intake_rollups'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    session_id = db.Column(db.String(64), nullable=True)  # 세션 기반 사용자 (MVP)
+    period = db.Column(db.String(10), nullable=False)  # 'week' (월요일 시작), 'month'
+    period_start = db.Column(db.Date, nullable=False)
+    
+    days_logged = db.Column(db.Integer, default=0)  # 기록이 있는 날 수
+    meal_count = db.Column(db.Integer, default=0)
+    
+    # 기간 합계 (9가지 핵심 영양소)
+    total_calories = db.Column(db.Float, default=0.0)
+    total_carbs = db.Column(db.Float, default=0.0)
+    total_sugars = db.Column(db.Float, default=0.0)
+    total_protein = db.Column(db.Float, default=0.0)
+    total_fat = db.Column(db.Float, default=0.0)
+    total_saturated_fat = db.Column(db.Float, default=0.0)
+    total_cholesterol = db.Column(db.Float, default=0.0)
+    total_sodium = db.Column(db.Float, default=0.0)
+    total_fiber = db.Column(db.Float, default=0.0)
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 사용자(세션)당 기간별 하나의 레코드 (일괄 UPSERT 충돌 키)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'period', 'period_start', name='unique_user_period'),
+        db.UniqueConstraint('session_id', 'period', 'period_start', name='unique_session_period'),
+    )
+
+    def __repr__(self):
+        return f'<IntakeRollup {self.period} {self.period_start}>'
+
 class MealLog(db.Model):
     """개별 식사 기록 모델"""
     __tablename__ = 'meal_logs'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    session_id = db.Column(db.String(64), nullable=True)  # 세션 기반 사용자 (MVP)
+    meal_id = db.Column(db.Integer, nullable=True)  # 날짜별 식사 번호 (세션 기록의 id)
     
     # 음식 정보
     food_name = db.Column(db.String(100), nullable=False)
@@ -47,6 +89,11 @@ class MealLog(db.Model):
     # 시간 정보
     logged_at = db.Column(db.DateTime, default=datetime.utcnow)
     date = db.Column(db.Date, nullable=False, default=date.today)
+    
+    __table_args__ = (
+        db.Index('idx_meal_logs_user_date', 'user_id', 'date'),
+        db.UniqueConstraint('session_id', 'date', 'meal_id', name='unique_session_date_meal'),
+    )
 
     def __repr__(self):
         return f'<MealLog {self.food_name} at {self.logged_at}>'
@@ -56,7 +103,8 @@ class RecommendationHistory(db.Model):
     __tablename__ = 'recommendation_history'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    session_id = db.Column(db.String(64), nullable=True)  # 세션 기반 사용자 (MVP)
     
     # 추천 정보
     recommended_foods = db.Column(JSON, nullable=False)  # 추천된 음식 목록
@@ -64,6 +112,11 @@ class RecommendationHistory(db.Model):
     user_feedback = db.Column(db.String(20), nullable=True)  # 'liked', 'disliked', 'neutral'
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('idx_recommendation_history_user_created', 'user_id', 'created_at'),
+        db.Index('idx_recommendation_history_session_created', 'session_id', 'created_at'),
+    )
 
     def __repr__(self):
         return f'<RecommendationHistory user_id={self.user_id} at {self.created_at}>'
\ No newline at end of file
@@ -15,6 +15,7 @@ class User(db.Model):
     profile = db.relationship('UserProfile', backref='user', uselist=False, cascade='all, delete-orphan')
     dietary_restrictions = db.relationship('DietaryRestriction', backref='user', cascade='all, delete-orphan')
     daily_intakes = db.relationship('DailyIntake', backref='user', cascade='all, delete-orphan')
+    intake_rollups = db.relationship('IntakeRollup', backref='user', cascade='all, delete-orphan')
     meal_logs = db.relationship('MealLog', backref='user', cascade='all, delete-orphan')
     recommendation_history = db.relationship('RecommendationHistory', backref='user', cascade='all, delete-orphan')
 
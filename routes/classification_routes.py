@@ -6,10 +6,34 @@ from flask import Blueprint, request, jsonify, session
 from werkzeug.utils import secure_filename
 from services.pytorch_service import get_pytorch_service
 from utils.image_utils import ImageValidator, get_image_upload_guidelines
+from utils.http_cache_utils import (
+    conditional_json_response, make_etag, PrecomputedResponseCache, STATIC_MAX_AGE
+)
+from utils.classification_utils import get_classification_help as build_classification_help
+from utils.upload_utils import get_upload_best_practices
 import logging
 
 classification_bp = Blueprint('classification', __name__)
 
+# 정적 안내 응답 (코드에 고정된 문구라 모델/서비스 상태와 무관, 프로세스당 한 번만 생성)
+static_responses = PrecomputedResponseCache()
+static_responses.register(
+    'classification/help',
+    lambda: {'success': True, 'help': build_classification_help()}
+)
+static_responses.register(
+    'upload/guidelines',
+    lambda: {'success': True, 'guidelines': get_image_upload_guidelines()}
+)
+static_responses.register('upload/best_practices', get_upload_best_practices)
+
+def precompute_static_responses():
+    """앱 시작 시 정적 안내 응답 사전 계산 (실패해도 첫 요청 때 다시 시도)"""
+    try:
+        static_responses.warm()
+    except Exception as e:
+        logging.warning(f"정적 응답 사전 계산 실패, 첫 요청 시 다시 시도합니다: {str(e)}")
+
 @classification_bp.route('/classify', methods=['POST'])
 def classify_food():
     """음식 이미지 분류 (SavedModel 사용)"""
@@ -119,14 +143,19 @@ def get_supported_foods():
     """지원되는 음식 목록 조회"""
     try:
         ml_service = get_pytorch_service()
-        supported_foods = ml_service.get_supported_foods()
+        model_ready = ml_service.is_model_ready()
+        etag = make_etag('foods/supported', ml_service.get_model_version(), model_ready)
         
-        return jsonify({
-            'success': True,
-            'supported_foods': supported_foods,
-            'total_count': len(supported_foods),
-            'model_ready': ml_service.is_model_ready()
-        }), 200
+        def build_payload():
+            supported_foods = ml_service.get_supported_foods()
+            return {
+                'success': True,
+                'supported_foods': supported_foods,
+                'total_count': len(supported_foods),
+                'model_ready': model_ready
+            }
+        
+        return conditional_json_response(etag, build_payload, max_age=STATIC_MAX_AGE)
         
     except Exception as e:
         logging.error(f"지원 음식 목록 조회 중 오류 발생: {str(e)}")
@@ -136,12 +165,7 @@ def get_supported_foods():
 def get_upload_guidelines():
     """이미지 업로드 가이드라인 조회"""
     try:
-        guidelines = get_image_upload_guidelines()
-        
-        return jsonify({
-            'success': True,
-            'guidelines': guidelines
-        }), 200
+        return static_responses.response('upload/guidelines')
         
     except Exception as e:
         logging.error(f"업로드 가이드라인 조회 중 오류 발생: {str(e)}")
@@ -170,14 +194,7 @@ def get_model_status():
 def get_classification_help():
     """분류 도움말 조회"""
     try:
-        from utils.classification_utils import get_classification_help
-        
-        help_info = get_classification_help()
-        
-        return jsonify({
-            'success': True,
-            'help': help_info
-        }), 200
+        return static_responses.response('classification/help')
         
     except Exception as e:
         logging.error(f"분류 도움말 조회 중 오류 발생: {str(e)}")
@@ -262,7 +279,7 @@ def manual_food_selection():
             'selected_food': food_name,
             'selection_method': 'manual',
             'confidence': 100.0,  # 수동 선택이므로 100%
-            'nutrition_data': nutrition_data,
+            'nutrition_data': nutrition_data.to_dict(),
             'message': f'{food_name}이(가) 수동으로 선택되었습니다.'
         }
         
@@ -327,26 +344,18 @@ def search_foods():
         if not query:
             return jsonify({'error': '검색어가 필요합니다.'}), 400
         
-        # 지원되는 음식 목록에서 검색
-        ml_service = get_pytorch_service()
-        supported_foods = ml_service.get_supported_foods()
-        
-        # 간단한 부분 문자열 매칭
-        matching_foods = [
-            food for food in supported_foods 
-            if query.lower() in food.lower()
-        ]
-        
-        # 정확히 일치하는 것을 먼저 정렬
-        exact_matches = [food for food in matching_foods if query.lower() == food.lower()]
-        partial_matches = [food for food in matching_foods if food not in exact_matches]
+        limit = request.args.get('limit', 10, type=int)
         
-        results = exact_matches + partial_matches
+        # 영양 카탈로그 전체에서 검색 (접두사/초성/부분 문자열/오타 교정 순위)
+        from services.food_search_service import get_food_search_service
+        matches = get_food_search_service().search(query, limit)
+        results = [match['name'] for match in matches]
         
         return jsonify({
             'success': True,
             'query': query,
-            'results': results[:10],  # 최대 10개 결과
+            'results': results,
+            'matches': matches,
             'total_count': len(results)
         }), 200
         
@@ -398,9 +407,8 @@ def get_reupload_guidance():
         # 이전 실패 분석
         failure_analysis = ReuploadHelper.analyze_previous_failures(session)
         
-        # 모범 사례
-        from utils.upload_utils import get_upload_best_practices
-        best_practices = get_upload_best_practices()
+        # 모범 사례 (사전 계산된 데이터 재사용)
+        best_practices = static_responses.get_payload('upload/best_practices')
         
         return jsonify({
             'success': True,
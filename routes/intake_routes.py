@@ -4,9 +4,11 @@
 
 from flask import Blueprint, request, jsonify
 from services.intake_service import SessionIntakeService
+from services.intake_trend_service import IntakeTrendService
 from services.nutrition_data_service import get_nutrition_data_service
 from services.profile_service import SessionProfileService
-from services.nutrition_service import NutritionCalculatorService
+from services.analysis_context import get_analysis_context
+from services.recommendation_service import MenuRecommendationEngine
 from utils.nutrition_utils import get_nutrition_display_names, format_nutrition_value
 import logging
 
@@ -28,10 +30,14 @@ def log_meal():
         
         food_name = data['food_name'].strip()
         confidence_score = data.get('confidence_score')
+        portion = data.get('portion', 1)
         
         if not food_name:
             return jsonify({'error': '유효한 음식명이 필요합니다.'}), 400
         
+        if isinstance(portion, bool) or not isinstance(portion, (int, float)) or not 0 < portion <= 10:
+            return jsonify({'error': '1인분 배수는 0보다 크고 10 이하인 숫자여야 합니다.'}), 400
+        
         logging.info(f"식사 기록 시도: {food_name}, 신뢰도: {confidence_score}")
         
         # 영양 데이터 조회
@@ -49,7 +55,8 @@ def log_meal():
         meal_log = SessionIntakeService.log_meal(
             food_name=food_name,
             nutrition_data=nutrition_data['nutrition'],
-            confidence_score=confidence_score
+            confidence_score=confidence_score,
+            portion=portion
         )
         
         logging.info(f"식사 기록 완료: ID {meal_log['id']}")
@@ -63,31 +70,14 @@ def log_meal():
         
         if profile and 'nutrition_targets' in profile:
             try:
-                calculator = NutritionCalculatorService()
-                
-                # 백분율 계산
-                percentages = calculator.calculate_nutrition_percentage(
-                    current_totals,
-                    profile['nutrition_targets']
-                )
-                
-                # 남은 허용량 계산
-                remaining = calculator.get_remaining_allowance(
-                    current_totals,
-                    profile['nutrition_targets']
-                )
-                
-                # 부족분과 과잉분 식별
-                deficient, excess = calculator.identify_nutritional_gaps(
-                    current_totals,
-                    profile['nutrition_targets']
-                )
+                # 기록 직후의 섭취량 기준 분석 (요청 단위 분석 컨텍스트)
+                context = get_analysis_context()
                 
                 analysis = {
-                    'percentages': percentages,
-                    'remaining_allowance': remaining,
-                    'deficient_nutrients': deficient,
-                    'excess_nutrients': excess
+                    'percentages': context.percentages,
+                    'remaining_allowance': context.remaining,
+                    'deficient_nutrients': context.deficient,
+                    'excess_nutrients': context.excess
                 }
                 
                 logging.info("영양 분석 완료")
@@ -95,6 +85,9 @@ def log_meal():
             except Exception as analysis_error:
                 logging.error(f"영양 분석 중 오류: {str(analysis_error)}")
                 # 분석 실패해도 식사 기록은 성공으로 처리
+            
+            # 기록 직후 추천 조회에 대비해 바뀐 상태의 추천 후보를 백그라운드에서 계산
+            MenuRecommendationEngine().schedule_precompute()
         
         return jsonify({
             'success': True,
@@ -190,38 +183,20 @@ def get_progress():
                 }
             }), 200
 
-        # 분석 수행
-        calculator = NutritionCalculatorService()
-
-        percentages = calculator.calculate_nutrition_percentage(
-            current_totals,
-            profile['nutrition_targets']
-        )
-
-        remaining = calculator.get_remaining_allowance(
-            current_totals,
-            profile['nutrition_targets']
-        )
-
-        deficient, excess = calculator.identify_nutritional_gaps(
-            current_totals,
-            profile['nutrition_targets']
-        )
-
-        # 영양 점수 계산
-        from utils.nutrition_utils import calculate_nutrition_score
-        nutrition_score = calculate_nutrition_score(current_totals, profile['nutrition_targets'])
+        # 분석 수행 (요청 단위 분석 컨텍스트)
+        context = get_analysis_context()
 
         return jsonify({
             'success': True,
             'progress': {
                 'current_totals': current_totals,
                 'targets': profile['nutrition_targets'],
-                'percentages': percentages,
-                'remaining_allowance': remaining,
-                'deficient_nutrients': deficient,
-                'excess_nutrients': excess,
-                'nutrition_score': nutrition_score,
+                'percentages': context.percentages,
+                'remaining_allowance': context.remaining,
+                'deficient_nutrients': context.deficient,
+                'excess_nutrients': context.excess,
+                'nutrition_score': context.nutrition_score,
+                'state_version': context.version,
                 'summary': summary,
                 'requires_profile': False
             }
@@ -259,6 +234,11 @@ def delete_meal(meal_id):
             # 업데이트된 총 섭취량 반환
             current_totals = SessionIntakeService.get_current_totals()
             
+            # 바뀐 상태의 추천 후보를 백그라운드에서 미리 계산
+            profile = SessionProfileService.get_profile()
+            if profile and 'nutrition_targets' in profile:
+                MenuRecommendationEngine().schedule_precompute()
+            
             return jsonify({
                 'success': True,
                 'message': '식사 기록이 삭제되었습니다.',
@@ -301,4 +281,24 @@ def get_intake_summary():
         
     except Exception as e:
         logging.error(f"섭취량 요약 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+@intake_bp.route('/intake/trends', methods=['GET'])
+def get_intake_trends():
+    """장기 섭취 추이 조회 (일별 총량, 7/30일 이동 평균, 영양소별 목표 준수율, 주/월 집계)"""
+    try:
+        days = request.args.get('days', 30, type=int)
+        granularity = request.args.get('granularity', 'day')
+        
+        trends = IntakeTrendService.get_trends(days, granularity)
+        
+        return jsonify({
+            'success': True,
+            'trends': trends
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"섭취 추이 조회 중 오류 발생: {str(e)}")
         return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
\ No newline at end of file
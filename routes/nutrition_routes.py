@@ -6,80 +6,195 @@ from flask import Blueprint, request, jsonify
 from services.nutrition_data_service import get_nutrition_data_service
 from services.profile_service import SessionProfileService
 from services.nutrition_service import NutritionCalculatorService
+from services.food_search_service import get_food_search_service
 from utils.nutrition_utils import get_nutrition_display_names, format_nutrition_value
+from utils.http_cache_utils import (
+    conditional_json_response, make_etag, get_catalog_version, get_profile_version
+)
 import logging
 
 nutrition_bp = Blueprint('nutrition', __name__)
 
+# 일괄 조회 최대 음식 수
+MAX_BATCH_FOODS = 100
+
+def _format_nutrition(nutrition: dict, percentage_info: dict = None,
+                      display_names: dict = None) -> dict:
+    """표시용 영양 정보 포맷팅"""
+    display_names = display_names or get_nutrition_display_names()
+    formatted_nutrition = {}
+    
+    for nutrient, value in nutrition.items():
+        formatted_nutrition[nutrient] = {
+            'value': value,
+            'formatted': format_nutrition_value(nutrient, value),
+            'display_name': display_names.get(nutrient, nutrient),
+            'percentage': percentage_info.get(nutrient) if percentage_info else None
+        }
+    
+    return formatted_nutrition
+
 @nutrition_bp.route('/nutrition/<food_name>', methods=['GET'])
 def get_food_nutrition(food_name):
     """특정 음식의 영양 정보 조회"""
     try:
-        nutrition_service = get_nutrition_data_service()
-        nutrition_data = nutrition_service.get_nutrition_data(food_name)
+        # 사용자 프로필이 있다면 목표 대비 백분율 계산
+        profile = SessionProfileService.get_profile()
+        has_targets = bool(profile and 'nutrition_targets' in profile)
         
-        if not nutrition_data:
-            # 대체 데이터 제공
-            nutrition_data = nutrition_service.get_fallback_nutrition_data(food_name)
+        # 카탈로그 세대와 프로필 목표가 같으면 응답도 같음
+        etag = make_etag(
+            'nutrition', food_name, get_catalog_version(), get_profile_version(profile)
+        )
         
-        # 사용자 프로필이 있다면 목표 대비 백분율 계산
+        def build_payload():
+            nutrition_service = get_nutrition_data_service()
+            nutrition_data = nutrition_service.get_nutrition_data(food_name)
+            
+            if not nutrition_data:
+                # 대체 데이터 제공
+                nutrition_data = nutrition_service.get_fallback_nutrition_data(food_name)
+            
+            percentage_info = None
+            
+            if has_targets:
+                calculator = NutritionCalculatorService()
+                percentages = calculator.calculate_nutrition_percentage(
+                    nutrition_data['nutrition'],
+                    profile['nutrition_targets']
+                )
+                percentage_info = percentages
+            
+            # 표시용 데이터 포맷팅
+            formatted_nutrition = _format_nutrition(nutrition_data['nutrition'], percentage_info)
+            
+            response_data = {
+                'success': True,
+                'food_name': nutrition_data['name'],
+                'serving_size': nutrition_data['serving_size'],
+                'nutrition': formatted_nutrition,
+                'is_fallback': nutrition_data.get('is_fallback', False)
+            }
+            
+            if percentage_info:
+                response_data['has_user_targets'] = True
+            
+            return response_data
+        
+        # 프로필 유무와 관계없이 세션별 응답 (프로필 생성 후 같은 URL에 섭취 비율이 추가됨)
+        return conditional_json_response(etag, build_payload, private=True)
+        
+    except Exception as e:
+        logging.error(f"영양 정보 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+@nutrition_bp.route('/nutrition/batch', methods=['POST'])
+def get_batch_nutrition():
+    """여러 음식의 영양 정보 일괄 조회"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('food_names'), list):
+            return jsonify({'error': '음식명 목록(food_names)이 필요합니다.'}), 400
+        
+        food_names = [
+            name.strip() for name in data['food_names']
+            if isinstance(name, str) and name.strip()
+        ]
+        
+        if not food_names:
+            return jsonify({'error': '유효한 음식명이 필요합니다.'}), 400
+        
+        if len(food_names) > MAX_BATCH_FOODS:
+            return jsonify({
+                'error': f'한 번에 최대 {MAX_BATCH_FOODS}개까지 조회할 수 있습니다.'
+            }), 400
+        
+        nutrition_service = get_nutrition_data_service()
+        records = [
+            nutrition_service.get_nutrition_data(name)
+            or nutrition_service.get_fallback_nutrition_data(name)
+            for name in food_names
+        ]
+        
+        # 프로필과 목표는 한 번만 조회하고 백분율은 전체 음식에 대해 한 번에 계산
         profile = SessionProfileService.get_profile()
-        percentage_info = None
+        percentage_list = [None] * len(records)
+        has_user_targets = bool(profile and 'nutrition_targets' in profile)
         
-        if profile and 'nutrition_targets' in profile:
+        if has_user_targets:
             calculator = NutritionCalculatorService()
-            percentages = calculator.calculate_nutrition_percentage(
-                nutrition_data['nutrition'],
+            percentage_list = calculator.calculate_nutrition_percentage_batch(
+                [record['nutrition'] for record in records],
                 profile['nutrition_targets']
             )
-            percentage_info = percentages
         
-        # 표시용 데이터 포맷팅
         display_names = get_nutrition_display_names()
-        formatted_nutrition = {}
-        
-        for nutrient, value in nutrition_data['nutrition'].items():
-            formatted_nutrition[nutrient] = {
-                'value': value,
-                'formatted': format_nutrition_value(nutrient, value),
-                'display_name': display_names.get(nutrient, nutrient),
-                'percentage': percentage_info.get(nutrient) if percentage_info else None
-            }
-        
-        response_data = {
-            'success': True,
-            'food_name': nutrition_data['name'],
-            'serving_size': nutrition_data['serving_size'],
-            'nutrition': formatted_nutrition,
-            'is_fallback': nutrition_data.get('is_fallback', False)
-        }
+        results = []
         
-        if percentage_info:
-            response_data['has_user_targets'] = True
+        for requested_name, record, percentage_info in zip(food_names, records, percentage_list):
+            results.append({
+                'requested_name': requested_name,
+                'food_name': record['name'],
+                'serving_size': record['serving_size'],
+                'nutrition': _format_nutrition(record['nutrition'], percentage_info, display_names),
+                'is_fallback': record.get('is_fallback', False)
+            })
         
-        return jsonify(response_data), 200
+        return jsonify({
+            'success': True,
+            'results': results,
+            'total_count': len(results),
+            'has_user_targets': has_user_targets
+        }), 200
         
     except Exception as e:
-        logging.error(f"영양 정보 조회 중 오류 발생: {str(e)}")
+        logging.error(f"영양 정보 일괄 조회 중 오류 발생: {str(e)}")
         return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
 
 @nutrition_bp.route('/nutrition/available', methods=['GET'])
 def get_available_foods():
     """사용 가능한 음식 목록 조회"""
     try:
-        nutrition_service = get_nutrition_data_service()
-        available_foods = nutrition_service.get_available_foods()
+        etag = make_etag('nutrition/available', get_catalog_version())
         
-        return jsonify({
-            'success': True,
-            'available_foods': sorted(available_foods),
-            'total_count': len(available_foods)
-        }), 200
+        def build_payload():
+            nutrition_service = get_nutrition_data_service()
+            available_foods = nutrition_service.get_available_foods()
+            return {
+                'success': True,
+                'available_foods': sorted(available_foods),
+                'total_count': len(available_foods)
+            }
+        
+        return conditional_json_response(etag, build_payload)
         
     except Exception as e:
         logging.error(f"사용 가능한 음식 목록 조회 중 오류 발생: {str(e)}")
         return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
 
+@nutrition_bp.route('/nutrition/autocomplete', methods=['GET'])
+def autocomplete_foods():
+    """음식명 자동완성 (접두사, 초성, 입력 중인 글자, 오타 교정)"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', 8, type=int)
+        
+        if not query:
+            return jsonify({'success': True, 'query': query, 'suggestions': []}), 200
+        
+        etag = make_etag('nutrition/autocomplete', get_catalog_version(), query, limit)
+        
+        return conditional_json_response(etag, lambda: {
+            'success': True,
+            'query': query,
+            'suggestions': get_food_search_service().search(query, limit)
+        })
+        
+    except Exception as e:
+        logging.error(f"음식명 자동완성 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
 @nutrition_bp.route('/nutrition/reload', methods=['POST'])
 def reload_nutrition_data():
     """영양 데이터 다시 로딩 (관리자용)"""
@@ -113,7 +228,8 @@ def get_cache_info():
         
         return jsonify({
             'success': True,
-            'cache_info': cache_info
+            'cache_info': cache_info,
+            'miss_statistics': nutrition_service.get_miss_statistics()
         }), 200
         
     except Exception as e:
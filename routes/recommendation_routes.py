@@ -3,9 +3,17 @@
 """
 
 from flask import Blueprint, request, jsonify, session
-from services.recommendation_service import MenuRecommendationEngine, NutritionalGapAnalyzer
+from services.recommendation_service import MenuRecommendationEngine, NutritionalGapAnalyzer, DEFAULT_MEAL_FRACTION
+from services.meal_combination_service import MealCombinationRecommender
+from services.meal_plan_service import WeeklyMealPlanner
+from services.recommendation_cache_service import get_recommendation_cache
+from services.recommendation_precompute_service import get_recommendation_precomputer
+from services.intake_persistence_service import get_intake_persistence
 from services.profile_service import SessionProfileService
+from services.preference_service import SessionPreferenceService
 from utils.nutrition_utils import get_nutrition_display_names, format_nutrition_value
+from utils.http_cache_utils import conditional_json_response, make_etag
+import json
 import logging
 from datetime import datetime
 
@@ -61,6 +69,7 @@ def get_meal_recommendations():
             formatted_recommendations.append({
                 'food_name': rec['food_name'],
                 'score': round(rec['score'], 1),
+                'preference_bonus': round(rec['preference_bonus'], 1),
                 'reasoning': rec['reasoning'],
                 'benefits': rec['benefits'],
                 'nutrition': formatted_nutrition,
@@ -121,6 +130,138 @@ def get_nutritional_analysis():
         logging.error(f"영양 분석 조회 중 오류 발생: {str(e)}")
         return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
 
+@recommendation_bp.route('/recommendations/combinations', methods=['GET'])
+def get_meal_combinations():
+    """한 끼 조합 추천 조회 (주식 + 국/찌개 + 반찬 2-4가지)"""
+    try:
+        # 사용자 프로필 확인
+        profile = SessionProfileService.get_profile()
+        if not profile:
+            return jsonify({
+                'error': '프로필이 설정되지 않았습니다.',
+                'suggestion': 'setup_profile_required'
+            }), 400
+        
+        # 조합 개수와 조합당 최대 음식 수 파라미터
+        max_combinations = min(int(request.args.get('limit', 3)), 5)  # 최대 5개로 제한
+        max_dishes = int(request.args.get('max_dishes', MealCombinationRecommender.MAX_DISHES))
+        
+        result = MealCombinationRecommender().generate_combinations(max_combinations, max_dishes)
+        
+        if not result['combinations']:
+            return jsonify({
+                'success': True,
+                'combinations': [],
+                'message': '현재 추천할 수 있는 조합이 없습니다.',
+                'suggestion': 'try_single_recommendations',
+                'search': result['search']
+            }), 200
+        
+        return jsonify({
+            'success': True,
+            'combinations': result['combinations'],
+            'search': result['search'],
+            'generated_at': datetime.now().isoformat()
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"한 끼 조합 추천 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+@recommendation_bp.route('/recommendations/nearest', methods=['GET'])
+def get_gap_filling_foods():
+    """남은 필요량과 영양소 구성이 가장 가까운 음식 조회 (k-NN / 반경 검색)"""
+    try:
+        # 사용자 프로필 확인
+        profile = SessionProfileService.get_profile()
+        if not profile:
+            return jsonify({
+                'error': '프로필이 설정되지 않았습니다.',
+                'suggestion': 'setup_profile_required'
+            }), 400
+        
+        k = min(int(request.args.get('k', 5)), 50)  # 최대 50개로 제한
+        meal_fraction = float(request.args.get('meal_fraction', DEFAULT_MEAL_FRACTION))
+        radius = request.args.get('radius', type=float)
+        exclude_foods = [name.strip() for name in request.args.get('exclude', '').split(',') if name.strip()]
+        
+        if not 0 < meal_fraction <= 1:
+            return jsonify({'error': 'meal_fraction은 0보다 크고 1 이하여야 합니다.'}), 400
+        
+        foods = MenuRecommendationEngine().find_gap_filling_foods(
+            k, meal_fraction, radius, exclude_foods
+        )
+        
+        return jsonify({
+            'success': True,
+            'foods': [
+                {
+                    'food_name': food['food_name'],
+                    'distance': food['distance'],
+                    'nutrition': dict(food['nutrition_data']['nutrition']) if food['nutrition_data'] else {},
+                    'serving_size': food['nutrition_data']['serving_size'] if food['nutrition_data'] else None
+                }
+                for food in foods
+            ],
+            'query': {
+                'k': k,
+                'meal_fraction': meal_fraction,
+                'radius': radius,
+                'excluded': exclude_foods
+            }
+        }), 200
+        
+    except ValueError:
+        return jsonify({'error': '잘못된 요청 파라미터입니다.'}), 400
+    except Exception as e:
+        logging.error(f"최근접 음식 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+@recommendation_bp.route('/recommendations/meal-plan', methods=['GET'])
+def get_meal_plan():
+    """주간 식단 계획 조회 (7일 x 3끼, 프로필/카탈로그가 바뀔 때까지 캐시)"""
+    try:
+        # 사용자 프로필 확인
+        profile = SessionProfileService.get_profile()
+        if not profile:
+            return jsonify({
+                'error': '프로필이 설정되지 않았습니다.',
+                'suggestion': 'setup_profile_required'
+            }), 400
+        
+        days = int(request.args.get('days', WeeklyMealPlanner.PLAN_DAYS))
+        plan = WeeklyMealPlanner().get_plan(days)
+        
+        return jsonify({
+            'success': True,
+            'plan': plan['days'],
+            'summary': plan['summary'],
+            'search': plan['search'],
+            'cached': plan['cached']
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logging.error(f"식단 계획 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+@recommendation_bp.route('/recommendations/cache/stats', methods=['GET'])
+def get_recommendation_cache_stats():
+    """양자화 상태 추천 캐시 통계 조회 (적중률, 항목 수, 식사 기록 후 사전 계산)"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache_stats': get_recommendation_cache().get_stats(),
+            'precompute_stats': get_recommendation_precomputer().get_stats()
+        }), 200
+        
+    except Exception as e:
+        logging.error(f"추천 캐시 통계 조회 중 오류 발생: {str(e)}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
 @recommendation_bp.route('/recommendations/feedback', methods=['POST'])
 def submit_recommendation_feedback():
     """추천 피드백 제출"""
@@ -139,15 +280,18 @@ def submit_recommendation_feedback():
         feedback_type = data['feedback_type']  # 'liked', 'disliked', 'tried', 'not_interested'
         comment = data.get('comment', '')
         
+        if not isinstance(food_name, str) or not food_name.strip():
+            return jsonify({'error': '음식명이 필요합니다.'}), 400
+        food_name = food_name.strip()
+        
         # 유효한 피드백 타입 확인
-        valid_feedback_types = ['liked', 'disliked', 'tried', 'not_interested']
+        valid_feedback_types = list(SessionPreferenceService.FEEDBACK_TYPES)
         if feedback_type not in valid_feedback_types:
             return jsonify({
                 'error': '유효하지 않은 피드백 타입입니다.',
                 'valid_types': valid_feedback_types
             }), 400
         
-        # 피드백 저장
         feedback_data = {
             'food_name': food_name,
             'feedback_type': feedback_type,
@@ -155,7 +299,8 @@ def submit_recommendation_feedback():
             'timestamp': datetime.now().isoformat()
         }
         
-        _save_feedback(feedback_data)
+        # 선호도 모델 갱신 (피드백 원문은 세션에 보관하지 않음)
+        preference = SessionPreferenceService.record_feedback(food_name, feedback_type)
         
         # 피드백에 따른 응답 메시지
         response_messages = {
@@ -168,7 +313,8 @@ def submit_recommendation_feedback():
         return jsonify({
             'success': True,
             'message': response_messages.get(feedback_type, '피드백이 저장되었습니다.'),
-            'feedback_saved': feedback_data
+            'feedback_saved': feedback_data,
+            'preference': preference
         }), 200
         
     except Exception as e:
@@ -201,18 +347,26 @@ def get_dietary_guidelines():
         profile = SessionProfileService.get_profile()
         
         if not profile:
-            # 일반적인 지침
-            guidelines = _get_general_dietary_guidelines()
-        else:
-            # 개인 맞춤형 지침
-            analyzer = NutritionalGapAnalyzer()
-            analysis = analyzer.get_detailed_analysis()
-            guidelines = _get_personalized_guidelines(analysis, profile)
+            # 일반적인 지침 (프로필 생성 후 같은 URL이 맞춤 지침이 되므로 세션별 응답으로 재검증)
+            return conditional_json_response(
+                make_etag('recommendations/guidelines'),
+                lambda: {'success': True, 'guidelines': _get_general_dietary_guidelines()},
+                private=True
+            )
         
-        return jsonify({
+        # 개인 맞춤형 지침 (내용 기반 ETag로 변경이 없으면 본문 전송 생략)
+        analyzer = NutritionalGapAnalyzer()
+        analysis = analyzer.get_detailed_analysis()
+        payload = {
             'success': True,
-            'guidelines': guidelines
-        }), 200
+            'guidelines': _get_personalized_guidelines(analysis, profile)
+        }
+        etag = make_etag(
+            'recommendations/guidelines',
+            json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        )
+        
+        return conditional_json_response(etag, lambda: payload, private=True)
         
     except Exception as e:
         logging.error(f"식단 지침 조회 중 오류 발생: {str(e)}")
@@ -239,19 +393,13 @@ def _save_recommendation_history(recommendations: list, analysis: dict):
         session['recommendation_history'] = session['recommendation_history'][:20]
     
     session.modified = True
-
-def _save_feedback(feedback_data: dict):
-    """피드백 저장 (세션 기반)"""
-    if 'recommendation_feedback' not in session:
-        session['recommendation_feedback'] = []
-    
-    session['recommendation_feedback'].insert(0, feedback_data)
     
-    # 최대 50개까지만 보관
-    if len(session['recommendation_feedback']) > 50:
-        session['recommendation_feedback'] = session['recommendation_feedback'][:50]
-    
-    session.modified = True
+    # 세션에는 최근 20개만 남기고, 전체 이력은 백그라운드에서 DB에 일괄 저장
+    get_intake_persistence().record_recommendations(
+        SessionProfileService.get_session_id(),
+        [{'food_name': rec['food_name'], 'score': rec['score']} for rec in recommendations],
+        json.dumps(history_entry['nutritional_context'], ensure_ascii=False)
+    )
 
 def _get_recommendation_history(limit: int) -> list:
     """추천 히스토리 조회"""
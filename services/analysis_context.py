@@ -0,0 +1,90 @@
+"""
+요청 단위 영양 분석 컨텍스트
+
+세션 영양 상태(증분 유지)에서 섭취량 합계, 목표, 부족/과잉분, 백분율, 남은 허용량,
+영양 점수를 읽어 flask.g에 보관하고, 추천 엔진과 라우트가 같은 결과를 읽습니다.
+상태 버전이 바뀌면(같은 요청 안에서 식사를 기록한 경우 등) 다시 읽습니다.
+"""
+
+from flask import g
+from typing import Dict, Optional
+from services.nutrition_service import NutritionCalculatorService
+from services.intake_service import SessionIntakeService
+from services.profile_service import SessionProfileService
+from services.nutrition_state_service import SessionNutritionStateService
+from utils.nutrition_utils import calculate_nutrition_score
+
+ANALYSIS_CONTEXT_KEY = '_nutrition_analysis_context'
+
+class NutritionAnalysisContext:
+    """현재 섭취 상태에 대한 영양 분석 결과 (요청 동안 공유, 수정 금지)"""
+    
+    def __init__(self, profile: Dict, current_intake: Dict, state: Optional[Dict] = None):
+        self.profile = profile
+        self.targets = profile['nutrition_targets']
+        self.current_intake = current_intake
+        
+        if state is not None:
+            # 세션 영양 상태에 이미 계산된 값 사용
+            self.version = state['version']
+            self.deficient = state['deficient_nutrients']
+            self.excess = state['excess_nutrients']
+            self.percentages = state['percentages']
+            self.remaining = state['remaining_allowance']
+            self.nutrition_score = state['nutrition_score']
+        else:
+            # 세션 상태와 다른 프로필로 분석하는 경우 직접 계산
+            calculator = NutritionCalculatorService()
+            self.version = None
+            self.deficient, self.excess = calculator.identify_nutritional_gaps(
+                current_intake, self.targets
+            )
+            self.percentages = calculator.calculate_nutrition_percentage(
+                current_intake, self.targets
+            )
+            self.remaining = calculator.get_remaining_allowance(
+                current_intake, self.targets
+            )
+            self.nutrition_score = calculate_nutrition_score(current_intake, self.targets)
+        
+        # 상세 분석 결과 (NutritionalGapAnalyzer가 처음 요청할 때 채움)
+        self.detailed_analysis = None
+    
+    @classmethod
+    def from_session(cls, user_profile: Dict = None) -> 'NutritionAnalysisContext':
+        """
+        세션의 프로필과 오늘 섭취량으로 분석 컨텍스트 생성
+        
+        Args:
+            user_profile: 사용자 프로필 (None이면 세션 프로필과 영양 상태 사용)
+        
+        Returns:
+            분석 컨텍스트
+        """
+        if user_profile is not None:
+            if 'nutrition_targets' not in user_profile:
+                raise ValueError("사용자 프로필이 설정되지 않았습니다.")
+            return cls(user_profile, SessionIntakeService.get_current_totals())
+        
+        user_profile = SessionProfileService.get_profile()
+        state = SessionNutritionStateService.get_state()
+        if not user_profile or 'nutrition_targets' not in user_profile or not state['has_targets']:
+            raise ValueError("사용자 프로필이 설정되지 않았습니다.")
+        
+        return cls(user_profile, SessionIntakeService.get_current_totals(), state)
+
+def get_analysis_context() -> NutritionAnalysisContext:
+    """
+    현재 요청의 분석 컨텍스트 조회 (요청당 한 번만 계산)
+    
+    Returns:
+        분석 컨텍스트
+    
+    Raises:
+        ValueError: 프로필이 설정되지 않은 경우
+    """
+    context = g.get(ANALYSIS_CONTEXT_KEY)
+    if context is None or context.version != SessionNutritionStateService.get_version():
+        context = NutritionAnalysisContext.from_session()
+        setattr(g, ANALYSIS_CONTEXT_KEY, context)
+    return context
@@ -0,0 +1,375 @@
+"""
+음식 검색 서비스 (접두사 트라이 + n-gram 역색인 + 초성/자모 검색)
+
+영양 카탈로그 전체 음식명을 색인합니다. 카탈로그 세대 번호가 바뀌면 다음 검색 시
+색인을 다시 만듭니다.
+"""
+
+import threading
+import logging
+import time
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from utils.hangul_utils import normalize_search_text, get_choseong, decompose_jamo, is_choseong_query
+
+class TextIndex:
+    """
+    문자열 목록 색인
+    
+    문자열 번호는 순위 순서(짧은 이름 우선, 같으면 가나다순)로 부여하므로,
+    후보를 번호 순서대로 확인하다가 필요한 개수를 채우면 바로 멈출 수 있습니다.
+    짧은 접두사(트라이 깊이 이하)는 노드마다 상위 후보를 미리 저장하고,
+    긴 접두사와 부분 문자열은 n-gram 역색인으로 찾습니다.
+    """
+    
+    TRIE_DEPTH = 3  # 트라이로 색인할 최대 접두사 길이
+    TRIE_TOP_K = 20  # 트라이 노드별 보관 후보 수
+    
+    def __init__(self, keys: List[str], unigrams: bool = True):
+        """
+        Args:
+            keys: 순위 순서로 정렬된 색인 문자열 목록
+            unigrams: 1-gram 색인 여부 (자모처럼 문자 종류가 적으면 목록이 너무 길어 제외)
+        """
+        self.keys = keys
+        self.trie = {}  # 문자 -> [자식 노드, 상위 후보 번호 목록, 전체 개수]
+        
+        postings = {}
+        for key_id, key in enumerate(keys):
+            self._add_to_trie(key_id, key)
+            
+            grams = {key[i:i + 2] for i in range(len(key) - 1)}
+            if unigrams:
+                grams.update(key)
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [key_id]
+                else:
+                    posting.append(key_id)
+        
+        # n-gram -> 문자열 번호 배열 (오름차순 = 순위 순서)
+        self.postings = {gram: array('I', posting) for gram, posting in postings.items()}
+    
+    def _add_to_trie(self, key_id: int, key: str):
+        children = self.trie
+        for char in key[:self.TRIE_DEPTH]:
+            node = children.get(char)
+            if node is None:
+                node = children[char] = [{}, [], 0]
+            if len(node[1]) < self.TRIE_TOP_K:
+                node[1].append(key_id)
+            node[2] += 1
+            children = node[0]
+    
+    def _candidates(self, query: str) -> array:
+        """검색어의 n-gram 중 가장 짧은 역색인 목록 (순위 순서)"""
+        grams = [query[i:i + 2] for i in range(len(query) - 1)] or [query]
+        shortest = None
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return array('I')
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        return shortest
+    
+    def prefix(self, query: str, limit: int) -> List[int]:
+        """
+        접두사 일치 검색
+        
+        Args:
+            query: 정규화된 검색어
+            limit: 최대 결과 수
+        
+        Returns:
+            순위 순서의 문자열 번호 목록
+        """
+        if not query:
+            return []
+        
+        if len(query) <= self.TRIE_DEPTH:
+            children = self.trie
+            node = None
+            for char in query:
+                node = children.get(char)
+                if node is None:
+                    return []
+                children = node[0]
+            # 1-gram 색인이 없는 한 글자 검색어는 트라이 후보만 사용
+            if limit <= len(node[1]) or node[2] == len(node[1]) or query not in self.postings:
+                return node[1][:limit]
+        
+        results = []
+        for key_id in self._candidates(query):
+            if self.keys[key_id].startswith(query):
+                results.append(key_id)
+                if len(results) >= limit:
+                    break
+        return results
+    
+    def contains(self, query: str, limit: int) -> List[int]:
+        """부분 문자열 일치 검색 (순위 순서)"""
+        if not query:
+            return []
+        
+        results = []
+        for key_id in self._candidates(query):
+            if query in self.keys[key_id]:
+                results.append(key_id)
+                if len(results) >= limit:
+                    break
+        return results
+
+def _prefix_edit_distance(query: str, target: str, max_distance: int) -> int:
+    """
+    검색어와 대상 문자열 앞부분 사이의 최소 편집 거리
+    
+    입력 중인 검색어도 비교할 수 있도록, 대상의 모든 접두사 중 가장 가까운 것과의
+    거리를 반환합니다. max_distance를 넘으면 max_distance + 1을 반환합니다.
+    
+    Args:
+        query: 검색어 (자모 문자열)
+        target: 대상 문자열 (자모 문자열)
+        max_distance: 허용 최대 거리
+    """
+    target = target[:len(query) + max_distance]
+    previous = list(range(len(target) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != target_char)
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous)
+
+class FoodSearchIndex:
+    """음식명 검색 색인 (원문/초성/자모 색인 묶음)"""
+    
+    JAMO_PREFIX_SCAN = 200  # 자모 접두사 검색에서 확인할 최대 후보 수
+    FUZZY_SCAN = 300  # 자모 2-gram 역색인별 확인할 최대 항목 수
+    FUZZY_CANDIDATES = 15  # 편집 거리를 계산할 최대 후보 수
+    
+    def __init__(self, food_names: Iterable[str]):
+        normalized = {}
+        for name in food_names:
+            key = normalize_search_text(name)
+            if key and key not in normalized:
+                normalized[key] = name
+        
+        # 순위 순서: 짧은 이름 우선, 같으면 가나다순
+        keys = sorted(normalized, key=lambda key: (len(key), key))
+        self.names = [normalized[key] for key in keys]
+        self.name_index = TextIndex(keys)
+        self.choseong_index = TextIndex([get_choseong(key) for key in keys])
+        self.jamo_index = TextIndex([decompose_jamo(key) for key in keys], unigrams=False)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """
+        순위가 매겨진 상위 검색 결과
+        
+        일치 유형 순서: 완전 일치 > 접두사 > 초성 > 입력 중인 글자(자모 접두사)
+        > 부분 문자열 > 자모 유사 일치. 같은 유형에서는 짧은 이름이 먼저 옵니다.
+        
+        Args:
+            query: 검색어
+            limit: 최대 결과 수
+        
+        Returns:
+            [{'name': 음식명, 'match': 일치 유형}] 목록
+        """
+        key = normalize_search_text(query)
+        if not key or limit <= 0:
+            return []
+        
+        results = []
+        seen = set()
+        
+        def collect(match: str, key_ids: Iterable[int]):
+            for key_id in key_ids:
+                if key_id not in seen and len(results) < limit:
+                    seen.add(key_id)
+                    results.append({'name': self.names[key_id], 'match': match})
+        
+        prefix_ids = self.name_index.prefix(key, limit)
+        collect('exact', [key_id for key_id in prefix_ids if self.name_index.keys[key_id] == key])
+        collect('prefix', prefix_ids)
+        
+        if len(results) < limit and is_choseong_query(key):
+            collect('choseong', self.choseong_index.prefix(key, limit))
+            collect('choseong', self.choseong_index.contains(key, limit))
+        
+        jamo_key = decompose_jamo(key)
+        if len(results) < limit:
+            collect('prefix', self._jamo_prefix(key, jamo_key, limit))
+        if len(results) < limit:
+            collect('contains', self.name_index.contains(key, limit))
+        
+        # 오타 교정은 다른 일치 결과가 전혀 없을 때만 시도
+        if not results and len(jamo_key) >= 3:
+            collect('fuzzy', self._fuzzy(jamo_key, limit, seen))
+        
+        return results
+    
+    def _jamo_prefix(self, key: str, jamo_key: str, limit: int) -> List[int]:
+        """
+        입력 중인 마지막 글자를 자모 단위로 비교하는 접두사 검색 (예: '감잩' -> 감자탕)
+        
+        마지막 글자 앞까지는 완성된 글자이므로 원문 접두사로 후보를 좁힌 뒤 확인합니다.
+        """
+        stem = key[:-1]
+        if not stem:
+            return self.jamo_index.prefix(jamo_key, limit)
+        
+        jamo_keys = self.jamo_index.keys
+        results = []
+        for key_id in self.name_index.prefix(stem, self.JAMO_PREFIX_SCAN):
+            if jamo_keys[key_id].startswith(jamo_key):
+                results.append(key_id)
+                if len(results) >= limit:
+                    break
+        return results
+    
+    def _fuzzy(self, jamo_key: str, limit: int, exclude: set) -> List[int]:
+        """
+        자모 단위 유사 검색 (오타 1~2개 허용)
+        
+        드문 자모 2-gram을 공유하는 후보만 추린 뒤 편집 거리를 계산합니다.
+        """
+        grams = [jamo_key[i:i + 2] for i in range(len(jamo_key) - 1)]
+        postings = sorted(
+            (self.jamo_index.postings[gram] for gram in set(grams) if gram in self.jamo_index.postings),
+            key=len
+        )
+        
+        # 역색인이 순위 순서이므로 앞부분만 세어도 짧은 이름 후보는 빠지지 않음
+        overlap = Counter()
+        for posting in postings[:3]:
+            overlap.update(posting[:self.FUZZY_SCAN])
+        for key_id in exclude:
+            overlap.pop(key_id, None)
+        
+        # 공유 2-gram이 많은 후보부터, 같으면 순위 순서로
+        buckets = {}
+        for key_id, count in overlap.items():
+            buckets.setdefault(count, []).append(key_id)
+        candidates = []
+        for count in sorted(buckets, reverse=True):
+            candidates.extend(sorted(buckets[count])[:self.FUZZY_CANDIDATES - len(candidates)])
+            if len(candidates) >= self.FUZZY_CANDIDATES:
+                break
+        
+        max_distance = 1 if len(jamo_key) <= 6 else 2
+        scored = []
+        for key_id in candidates:
+            distance = _prefix_edit_distance(jamo_key, self.jamo_index.keys[key_id], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, key_id))
+        
+        return [key_id for _, key_id in sorted(scored)[:limit]]
+
+class FoodSearchService:
+    """음식 검색 서비스"""
+    
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 50
+    
+    def __init__(self):
+        self.index: Optional[FoodSearchIndex] = None
+        self.generation = None  # 색인을 만든 카탈로그 세대 번호
+        self._lock = threading.Lock()
+        self._rebuild_thread = None
+    
+    def _get_index(self) -> FoodSearchIndex:
+        """
+        현재 카탈로그 세대의 색인 반환
+        
+        처음에는 바로 만들고, 이후 카탈로그가 바뀌면 백그라운드에서 다시 만드는 동안
+        기존 색인으로 응답합니다.
+        """
+        from services.nutrition_data_service import get_nutrition_data_service
+        nutrition_service = get_nutrition_data_service()
+        
+        index = self.index
+        if index is not None:
+            if self.generation != nutrition_service.generation:
+                self._start_rebuild(nutrition_service)
+            return index
+        
+        # 시작 시 미리 생성 중이면 완료를 기다림
+        rebuild_thread = self._rebuild_thread
+        if rebuild_thread is not None and rebuild_thread.is_alive():
+            rebuild_thread.join()
+        
+        with self._lock:
+            if self.index is None:
+                self._rebuild(nutrition_service)
+            return self.index
+    
+    def _start_rebuild(self, nutrition_service):
+        """백그라운드 색인 재생성 시작 (이미 진행 중이면 무시)"""
+        with self._lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild, args=(nutrition_service,),
+                name='food-search-index', daemon=True
+            )
+            self._rebuild_thread.start()
+    
+    def _rebuild(self, nutrition_service):
+        """카탈로그 스냅샷으로 색인 생성 후 교체"""
+        started = time.perf_counter()
+        generation = nutrition_service.generation
+        try:
+            index = FoodSearchIndex(nutrition_service.get_available_foods())
+        except Exception as e:
+            logging.error(f"음식 검색 색인 생성 중 오류 발생: {str(e)}")
+            if self.index is None:
+                raise
+            return
+        
+        self.index = index
+        self.generation = generation
+        logging.info(
+            f"음식 검색 색인 생성: {len(index)}개, 세대 {generation}, "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+    
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """
+        음식 검색
+        
+        Args:
+            query: 검색어 (음식명 일부, 초성, 입력 중인 글자 모두 가능)
+            limit: 최대 결과 수 (최대 MAX_LIMIT)
+        
+        Returns:
+            [{'name': 음식명, 'match': 일치 유형}] 목록
+        """
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        return self._get_index().search(query, limit)
+    
+    def warm_up(self):
+        """앱 시작 시 백그라운드에서 색인 미리 생성"""
+        from services.nutrition_data_service import get_nutrition_data_service
+        self._start_rebuild(get_nutrition_data_service())
+
+# 전역 검색 서비스 인스턴스
+_food_search_service = None
+
+def get_food_search_service() -> FoodSearchService:
+    """음식 검색 서비스 싱글톤 인스턴스 반환"""
+    global _food_search_service
+    if _food_search_service is None:
+        _food_search_service = FoodSearchService()
+    return _food_search_service
@@ -0,0 +1,573 @@
+"""
+섭취 기록 DB 영속화 (write-behind 버퍼)
+
+식사 기록/삭제, 일일 총 섭취량, 추천 이력은 세션에 먼저 반영되고, 요청 스레드는
+DB에 쓸 행만 만들어 큐에 넣은 뒤 바로 반환합니다. 단일 백그라운드 스레드가 같은 키의
+변경을 마지막 값으로 합쳐 두었다가 일정 시간(기본 250ms)이 지나거나 행 수가 일정
+개수를 넘으면 한 트랜잭션의 일괄 INSERT/UPSERT로 기록합니다. 같은 트랜잭션에서
+바뀐 날짜가 속한 주/월 집계(intake_rollups)만 다시 계산합니다.
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 세션 총 섭취량 키 -> daily_intakes 열 이름
+DAILY_TOTAL_COLUMNS = {
+    'calories': 'total_calories',
+    'carbohydrates': 'total_carbs',
+    'sugars': 'total_sugars',
+    'protein': 'total_protein',
+    'fat': 'total_fat',
+    'saturated_fat': 'total_saturated_fat',
+    'cholesterol': 'total_cholesterol',
+    'sodium': 'total_sodium',
+    'fiber': 'total_fiber'
+}
+
+# 일일 총량에서 다시 집계하는 기간 단위 (intake_rollups.period)
+ROLLUP_PERIODS = ('week', 'month')
+
+# 테이블별 UPSERT 충돌 기준 열 (같은 열 조합의 유니크 제약이 있어야 함)
+UPSERT_KEYS = {
+    'meal_logs': ('session_id', 'date', 'meal_id'),
+    'daily_intakes': ('session_id', 'date'),
+    'intake_rollups': ('session_id', 'period', 'period_start')
+}
+
+_STOP = object()
+
+def get_period_bounds(period: str, day: date) -> Tuple[date, date]:
+    """
+    날짜가 속한 집계 기간 (주는 월요일 시작)
+    
+    Args:
+        period: 'week' 또는 'month'
+        day: 날짜
+    
+    Returns:
+        (시작일, 종료일) 튜플 (종료일 포함)
+    """
+    if period == 'week':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    
+    start = day.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+class _PendingWrites:
+    """아직 기록하지 않은 변경 (같은 키는 마지막 값만 유지)"""
+    
+    def __init__(self):
+        self.resets = set()          # (세션 ID, 날짜): 그날 기록 전체 삭제
+        self.meals = OrderedDict()   # (세션 ID, 날짜, 식사 번호) -> 행 (None이면 삭제)
+        self.daily = OrderedDict()   # (세션 ID, 날짜) -> 일일 총량 행
+        self.history = []            # 추천 이력 행 (추가만)
+    
+    def __len__(self) -> int:
+        return len(self.resets) + len(self.meals) + len(self.daily) + len(self.history)
+    
+    def add(self, item: Dict):
+        """변경 하나를 병합"""
+        kind = item['kind']
+        if kind == 'meal':
+            key = (item['session_id'], item['date'], item['meal_id'])
+            self.meals.pop(key, None)
+            self.meals[key] = item['row']
+        elif kind == 'daily':
+            key = (item['session_id'], item['date'])
+            self.daily.pop(key, None)
+            self.daily[key] = item['row']
+        elif kind == 'reset':
+            key = (item['session_id'], item['date'])
+            # 리셋 이전의 변경은 리셋이 모두 지우므로 버림 (리셋은 다른 변경보다 먼저 기록)
+            for meal_key in [k for k in self.meals if k[:2] == key]:
+                del self.meals[meal_key]
+            self.daily.pop(key, None)
+            self.resets.add(key)
+        elif kind == 'history':
+            self.history.append(item['row'])
+    
+    def clear(self):
+        """기록 완료 후 비움"""
+        self.resets.clear()
+        self.meals.clear()
+        self.daily.clear()
+        self.history.clear()
+
+class IntakePersistenceBuffer:
+    """섭취 기록 write-behind 버퍼 (일괄 UPSERT)"""
+    
+    ENABLED = os.getenv('INTAKE_PERSISTENCE_ENABLED', 'true').lower() == 'true'
+    # 첫 변경 이후 기록까지 기다리는 시간
+    FLUSH_INTERVAL_MS = float(os.getenv('INTAKE_PERSISTENCE_FLUSH_MS', '250'))
+    # 모인 행이 이 수 이상이면 시간을 기다리지 않고 기록
+    BATCH_ROWS = int(os.getenv('INTAKE_PERSISTENCE_BATCH_ROWS', '500'))
+    # 기록하지 못한 행의 상한 (DB 장애 시 메모리 보호, 초과분은 폐기)
+    MAX_PENDING_ROWS = int(os.getenv('INTAKE_PERSISTENCE_MAX_PENDING', '20000'))
+    # 기록 실패 시 재시도 대기 시간 범위 (초)
+    BASE_BACKOFF = 0.5
+    MAX_BACKOFF = 30.0
+    
+    def __init__(self, flush_interval_ms: float = None, batch_rows: int = None):
+        """
+        Args:
+            flush_interval_ms: 기록 주기 (None이면 기본값)
+            batch_rows: 즉시 기록하는 행 수 (None이면 기본값)
+        """
+        self.flush_interval = (flush_interval_ms or self.FLUSH_INTERVAL_MS) / 1000.0
+        self.batch_rows = batch_rows or self.BATCH_ROWS
+        
+        self._queue = queue.Queue(maxsize=self.MAX_PENDING_ROWS)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._engine = None
+        self._metadata = None
+        self._schema_ready = False
+        self._schema_error = None
+        self._stats = {'queued': 0, 'dropped': 0, 'flushes': 0, 'rows_written': 0, 'failed_attempts': 0}
+    
+    def record_meal(self, session_id: str, date_key: str, meal: Dict) -> bool:
+        """
+        식사 기록 저장 예약
+        
+        Args:
+            session_id: 세션 ID
+            date_key: 날짜 (YYYY-MM-DD)
+            meal: 세션에 저장한 식사 로그
+        
+        Returns:
+            큐 등록 성공 여부
+        """
+        intake_date = date.fromisoformat(date_key)
+        row = {
+            'session_id': session_id,
+            'meal_id': meal['id'],
+            'date': intake_date,
+            'food_name': meal['food_name'][:100],
+            'confidence_score': meal.get('confidence_score'),
+            'nutrition_data': dict(meal['nutrition_data']),
+            'logged_at': datetime.fromisoformat(meal['logged_at'])
+        }
+        return self._submit({
+            'kind': 'meal', 'session_id': session_id, 'date': intake_date,
+            'meal_id': meal['id'], 'row': row
+        })
+    
+    def delete_meal(self, session_id: str, date_key: str, meal_id: int) -> bool:
+        """식사 기록 삭제 예약"""
+        return self._submit({
+            'kind': 'meal', 'session_id': session_id, 'date': date.fromisoformat(date_key),
+            'meal_id': meal_id, 'row': None
+        })
+    
+    def record_daily_totals(self, session_id: str, date_key: str, totals: Dict, meal_count: int) -> bool:
+        """
+        일일 총 섭취량 저장 예약 (해당 주/월 집계도 함께 갱신)
+        
+        Args:
+            session_id: 세션 ID
+            date_key: 날짜 (YYYY-MM-DD)
+            totals: 세션의 총 영양소 (영양소 -> 값)
+            meal_count: 그날 식사 수
+        
+        Returns:
+            큐 등록 성공 여부
+        """
+        intake_date = date.fromisoformat(date_key)
+        now = datetime.utcnow()
+        row = {
+            'session_id': session_id, 'date': intake_date, 'meal_count': meal_count,
+            'created_at': now, 'updated_at': now
+        }
+        for nutrient, column in DAILY_TOTAL_COLUMNS.items():
+            value = totals.get(nutrient, 0.0)
+            row[column] = float(value) if isinstance(value, (int, float)) else 0.0
+        
+        return self._submit({'kind': 'daily', 'session_id': session_id, 'date': intake_date, 'row': row})
+    
+    def reset_day(self, session_id: str, date_key: str) -> bool:
+        """하루치 식사 기록과 총 섭취량 삭제 예약"""
+        return self._submit({'kind': 'reset', 'session_id': session_id, 'date': date.fromisoformat(date_key)})
+    
+    def record_recommendations(self, session_id: str, recommended_foods: List[Dict],
+                               nutritional_reasoning: Optional[str] = None) -> bool:
+        """
+        추천 이력 저장 예약
+        
+        Args:
+            session_id: 세션 ID
+            recommended_foods: 추천 음식 목록
+            nutritional_reasoning: 추천 근거 (영양 상태 요약)
+        
+        Returns:
+            큐 등록 성공 여부
+        """
+        return self._submit({'kind': 'history', 'row': {
+            'session_id': session_id,
+            'recommended_foods': recommended_foods,
+            'nutritional_reasoning': nutritional_reasoning,
+            'created_at': datetime.utcnow()
+        }})
+    
+    def prepare_schema(self, db) -> bool:
+        """
+        영속화 테이블 준비 및 스키마 확인 (앱 시작 시 호출)
+        
+        없는 테이블은 만들지만 기존 테이블의 열/제약은 바꾸지 못하므로, 이전 스키마로
+        만든 DB이면 기록을 끄고 마이그레이션 안내를 남깁니다 (기록마다 실패 후 무한
+        재시도하지 않도록).
+        
+        Args:
+            db: Flask-SQLAlchemy 인스턴스
+        
+        Returns:
+            기록 가능 여부
+        """
+        with self._lock:
+            if self._engine is None:
+                self._engine = db.engine
+                self._metadata = db.metadata
+        
+        try:
+            self._check_schema()
+        except Exception as e:
+            # 다른 워커가 동시에 테이블을 만드는 중일 수 있으므로 첫 기록 때 다시 확인
+            logging.warning(f"섭취 기록 테이블 확인 실패, 첫 기록 시 다시 확인합니다: {str(e)}")
+            return False
+        return self._schema_error is None
+    
+    def stop(self, timeout: float = 5.0):
+        """남은 변경을 기록하고 워커 종료"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logging.warning("섭취 기록 큐가 가득 차 종료 신호를 보내지 못했습니다.")
+            return
+        thread.join(timeout)
+    
+    def get_stats(self) -> Dict:
+        """버퍼 통계 반환"""
+        return {
+            'enabled': self.ENABLED,
+            'schema_error': self._schema_error,
+            'pending': self._queue.qsize(),
+            'worker_alive': bool(self._thread and self._thread.is_alive()),
+            **self._stats
+        }
+    
+    def _submit(self, item: Dict) -> bool:
+        """변경 등록 (논블로킹, 요청 스레드에서 호출)"""
+        if not self.ENABLED or self._schema_error:
+            return False
+        
+        try:
+            self._ensure_worker()
+        except Exception as e:
+            logging.error(f"섭취 기록 영속화 워커 시작 실패: {str(e)}")
+            return False
+        
+        try:
+            self._queue.put_nowait(item)
+            self._stats['queued'] += 1
+            return True
+        except queue.Full:
+            self._stats['dropped'] += 1
+            logging.warning(f"섭취 기록 큐가 가득 차 변경을 폐기합니다: {item['kind']}")
+            return False
+    
+    def _ensure_worker(self):
+        """워커 스레드 지연 시작 (요청 컨텍스트에서 DB 엔진을 잡아 둠, fork된 워커마다 새로 시작)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            if self._engine is None:
+                from app import db
+                self._engine = db.engine
+                self._metadata = db.metadata
+            
+            self._thread = threading.Thread(
+                target=self._run, name='intake-persistence-writer', daemon=True
+            )
+            self._thread.start()
+    
+    def _run(self):
+        """큐를 비우며 주기/행 수 단위로 일괄 기록"""
+        pending = _PendingWrites()
+        next_flush_at: Optional[float] = None
+        backoff = 0.0
+        
+        while True:
+            timeout = None
+            if next_flush_at is not None:
+                timeout = max(0.0, next_flush_at - time.monotonic())
+            
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if item is _STOP:
+                # 이미 큐에 들어온 변경까지 모아 마지막으로 기록
+                self._drain(pending)
+                if pending:
+                    self._flush(pending)
+                return
+            
+            if item is not None:
+                if len(pending) >= self.MAX_PENDING_ROWS:
+                    self._stats['dropped'] += 1
+                else:
+                    pending.add(item)
+                if next_flush_at is None:
+                    next_flush_at = time.monotonic() + self.flush_interval
+            
+            if not pending:
+                continue
+            
+            due = time.monotonic() >= next_flush_at
+            if due or (len(pending) >= self.batch_rows and backoff == 0.0):
+                if self._flush(pending):
+                    backoff = 0.0
+                    next_flush_at = None
+                else:
+                    backoff = min(max(backoff * 2, self.BASE_BACKOFF), self.MAX_BACKOFF)
+                    next_flush_at = time.monotonic() + backoff
+                    logging.warning(f"섭취 기록 저장 실패, {backoff:.1f}초 후 재시도합니다.")
+    
+    def _drain(self, pending: _PendingWrites):
+        """큐에 남은 변경을 모두 병합"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                pending.add(item)
+    
+    def _check_schema(self):
+        """
+        필요한 열과 UPSERT 유니크 제약 확인 후 없는 테이블 생성 (한 번만)
+        
+        이미 있는 테이블이 이전 스키마이면 아무것도 만들지 않고(마이그레이션과 충돌 방지)
+        _schema_error에 안내를 남기며, 이후 변경은 받지 않습니다.
+        """
+        if self._schema_ready:
+            return
+        
+        from sqlalchemy import inspect
+        from models.nutrition_models import DailyIntake, IntakeRollup, MealLog, RecommendationHistory
+        
+        inspector = inspect(self._engine)
+        existing_tables = set(inspector.get_table_names())
+        problems = []
+        for model in (MealLog, DailyIntake, IntakeRollup, RecommendationHistory):
+            table = model.__table__
+            if table.name not in existing_tables:
+                continue
+            
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            problems.extend(
+                f'{table.name}.{column.name}' for column in table.columns if column.name not in existing
+            )
+            
+            key = UPSERT_KEYS.get(table.name)
+            if key:
+                unique_sets = {frozenset(u['column_names']) for u in inspector.get_unique_constraints(table.name)}
+                unique_sets |= {frozenset(i['column_names']) for i in inspector.get_indexes(table.name) if i['unique']}
+                if frozenset(key) not in unique_sets:
+                    problems.append(f"{table.name} UNIQUE({', '.join(key)})")
+        
+        if problems:
+            self._schema_error = f"DB 스키마가 최신이 아닙니다 (없음: {', '.join(problems)})"
+            logging.error(
+                f"{self._schema_error}. 'flask db upgrade'로 마이그레이션하기 전까지 "
+                "섭취 기록 DB 저장을 중지합니다."
+            )
+        else:
+            self._metadata.create_all(self._engine, checkfirst=True)
+        self._schema_ready = True
+    
+    def _flush(self, pending: _PendingWrites) -> bool:
+        """모인 변경을 한 트랜잭션으로 기록 (성공 시 비움)"""
+        from models.nutrition_models import DailyIntake, IntakeRollup, MealLog, RecommendationHistory
+        meal_table = MealLog.__table__
+        daily_table = DailyIntake.__table__
+        rollup_table = IntakeRollup.__table__
+        history_table = RecommendationHistory.__table__
+        
+        rows = len(pending)
+        try:
+            self._check_schema()
+            if self._schema_error:
+                # 재시도해도 성공할 수 없으므로 폐기
+                self._stats['dropped'] += rows
+                pending.clear()
+                return True
+            
+            with self._engine.begin() as conn:
+                # 리셋 -> 삭제 -> UPSERT 순서 (리셋 이전 변경은 병합 단계에서 제거됨)
+                for session_id, intake_date in pending.resets:
+                    conn.execute(meal_table.delete().where(
+                        meal_table.c.session_id == session_id, meal_table.c.date == intake_date
+                    ))
+                    conn.execute(daily_table.delete().where(
+                        daily_table.c.session_id == session_id, daily_table.c.date == intake_date
+                    ))
+                
+                deleted = [key for key, row in pending.meals.items() if row is None]
+                if deleted:
+                    conn.execute(
+                        meal_table.delete().where(
+                            meal_table.c.session_id == _bind('session_id'),
+                            meal_table.c.date == _bind('date'),
+                            meal_table.c.meal_id == _bind('meal_id')
+                        ),
+                        [{'b_session_id': s, 'b_date': d, 'b_meal_id': m} for s, d, m in deleted]
+                    )
+                
+                meal_rows = [row for row in pending.meals.values() if row is not None]
+                if meal_rows:
+                    _upsert(conn, meal_table, meal_rows, UPSERT_KEYS[meal_table.name],
+                            ('food_name', 'confidence_score', 'nutrition_data', 'logged_at'))
+                
+                if pending.daily:
+                    _upsert(conn, daily_table, list(pending.daily.values()), UPSERT_KEYS[daily_table.name],
+                            tuple(DAILY_TOTAL_COLUMNS.values()) + ('meal_count', 'updated_at'))
+                
+                # 바뀐 날짜가 속한 주/월만 그 기간의 일일 총량(최대 31행)으로 다시 집계
+                changed_days = set(pending.daily) | pending.resets
+                if changed_days:
+                    _refresh_rollups(conn, daily_table, rollup_table, changed_days)
+                
+                if pending.history:
+                    conn.execute(history_table.insert(), pending.history)
+        except Exception as e:
+            self._stats['failed_attempts'] += 1
+            logging.error(f"섭취 기록 일괄 저장 실패: {str(e)}")
+            return False
+        
+        self._stats['flushes'] += 1
+        self._stats['rows_written'] += rows
+        pending.clear()
+        return True
+
+def _refresh_rollups(conn, daily_table, rollup_table, changed_days: Set[Tuple[str, date]]):
+    """
+    바뀐 날짜가 속한 주/월 집계 갱신 (기록이 모두 지워진 기간은 삭제)
+    
+    Args:
+        conn: 트랜잭션 연결
+        daily_table: daily_intakes 테이블
+        rollup_table: intake_rollups 테이블
+        changed_days: (세션 ID, 날짜) 집합
+    """
+    from sqlalchemy import func, select
+    
+    total_columns = list(DAILY_TOTAL_COLUMNS.values())
+    periods = {
+        (session_id, period) + get_period_bounds(period, day)
+        for session_id, day in changed_days for period in ROLLUP_PERIODS
+    }
+    
+    now = datetime.utcnow()
+    rows, emptied = [], []
+    for session_id, period, start, end in periods:
+        aggregate = conn.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(daily_table.c.meal_count), 0),
+                *[func.coalesce(func.sum(daily_table.c[column]), 0.0) for column in total_columns]
+            ).where(
+                daily_table.c.session_id == session_id,
+                daily_table.c.date.between(start, end)
+            )
+        ).one()
+        
+        if not aggregate[0]:
+            emptied.append({'b_session_id': session_id, 'b_period': period, 'b_period_start': start})
+            continue
+        
+        row = {
+            'session_id': session_id, 'period': period, 'period_start': start,
+            'days_logged': aggregate[0], 'meal_count': aggregate[1], 'updated_at': now
+        }
+        row.update(zip(total_columns, aggregate[2:]))
+        rows.append(row)
+    
+    if emptied:
+        conn.execute(
+            rollup_table.delete().where(
+                rollup_table.c.session_id == _bind('session_id'),
+                rollup_table.c.period == _bind('period'),
+                rollup_table.c.period_start == _bind('period_start')
+            ),
+            emptied
+        )
+    if rows:
+        _upsert(conn, rollup_table, rows, UPSERT_KEYS[rollup_table.name],
+                ('days_logged', 'meal_count', 'updated_at', *total_columns))
+
+def _bind(column: str):
+    """executemany용 바인드 파라미터 (열 이름과 겹치지 않도록 접두사)"""
+    from sqlalchemy import bindparam
+    return bindparam(f'b_{column}')
+
+def _upsert(conn, table, rows: List[Dict], conflict_columns: Iterable[str], update_columns: Iterable[str]):
+    """
+    일괄 UPSERT (SQLite/PostgreSQL은 INSERT ... ON CONFLICT, 그 외는 행 단위 UPDATE 후 INSERT)
+    
+    Args:
+        conn: 트랜잭션 연결
+        table: 대상 테이블
+        rows: 기록할 행
+        conflict_columns: 유니크 제약 열
+        update_columns: 충돌 시 갱신할 열
+    """
+    dialect = conn.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: statement.excluded[column] for column in update_columns}
+        )
+        conn.execute(statement, rows)
+        return
+    
+    for row in rows:
+        condition = [table.c[column] == row[column] for column in conflict_columns]
+        updated = conn.execute(
+            table.update().where(*condition).values({column: row[column] for column in update_columns})
+        ).rowcount
+        if not updated:
+            conn.execute(table.insert().values(row))
+
+_persistence_buffer = None
+_persistence_buffer_lock = threading.Lock()
+
+def get_intake_persistence() -> IntakePersistenceBuffer:
+    """섭취 기록 영속화 버퍼 싱글톤 반환 (프로세스 종료 시 남은 변경 기록)"""
+    global _persistence_buffer
+    if _persistence_buffer is None:
+        with _persistence_buffer_lock:
+            if _persistence_buffer is None:
+                _persistence_buffer = IntakePersistenceBuffer()
+                atexit.register(_persistence_buffer.stop)
+    return _persistence_buffer
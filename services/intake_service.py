@@ -3,9 +3,20 @@
 """
 
 from flask import session
+from bisect import bisect_left
+from itertools import islice
+from collections.abc import Mapping
 from typing import Dict, List, Optional
 from datetime import datetime, date
+from utils.nutrition_utils import NUTRIENT_KEYS
 import json
+import time
+
+# 세션에 저장하는 식사 행: [식사 번호, 음식(공유 카탈로그 ID), 1인분 배수, 기록 시각(epoch 초), 신뢰도]
+# 카탈로그 음식의 1인분 영양소는 그날 처음 기록할 때 날짜별 'foods'(ID -> [음식명, 영양소])에 한 번만 저장
+# (이후 카탈로그가 바뀌어도 기록 당시 값으로 조회/차감). 카탈로그에 없는 음식(대체 데이터 등)이나
+# 그날 저장한 음식명/값과 다른 음식은 음식명을 저장하고 1인분 영양소(NUTRIENT_KEYS 순서)를 덧붙임
+MEAL_ID, MEAL_FOOD, MEAL_PORTION, MEAL_LOGGED_AT, MEAL_CONFIDENCE, MEAL_NUTRITION = range(6)
 
 class SessionIntakeService:
     """세션 기반 섭취량 추적 서비스"""
@@ -39,6 +50,8 @@ class SessionIntakeService:
                     'fiber': 0.0
                 },
                 'meals': [],
+                'foods': {},
+                'next_meal_id': 1,
                 'created_at': datetime.now().isoformat(),
                 'updated_at': datetime.now().isoformat()
             }
@@ -48,14 +61,19 @@ class SessionIntakeService:
         logging.info(f"일일 섭취량 초기화 완료: {today_key}, 현재 식사 수: {len(session['daily_intake'][today_key]['meals'])}")
     
     @staticmethod
-    def log_meal(food_name: str, nutrition_data: Dict, confidence_score: float = None) -> Dict:
+    def log_meal(food_name: str, nutrition_data: Mapping, confidence_score: float = None,
+                 portion: float = 1.0) -> Dict:
         """
         식사 기록
         
+        세션에는 카탈로그 음식 ID, 1인분 배수, 기록 시각만 저장하고 1인분 영양 정보는
+        날짜별 음식 표에 한 번만 저장합니다.
+        
         Args:
             food_name: 음식명
-            nutrition_data: 영양 데이터
+            nutrition_data: 1인분 영양 데이터
             confidence_score: ML 모델 신뢰도 (선택사항)
+            portion: 1인분 배수 (기본 1인분)
             
         Returns:
             기록된 식사 정보
@@ -64,44 +82,50 @@ class SessionIntakeService:
             if not food_name or not isinstance(food_name, str):
                 raise ValueError("유효한 음식명이 필요합니다.")
             
-            if not nutrition_data or not isinstance(nutrition_data, dict):
+            if not nutrition_data or not isinstance(nutrition_data, Mapping):
                 raise ValueError("유효한 영양 데이터가 필요합니다.")
             
+            if isinstance(portion, bool) or not isinstance(portion, (int, float)) or portion <= 0:
+                raise ValueError("1인분 배수는 0보다 큰 숫자여야 합니다.")
+            
             SessionIntakeService.initialize_daily_intake()
             today_key = SessionIntakeService.get_today_key()
+            daily_data = session['daily_intake'][today_key]
             
-            # 현재 식사 개수 확인
-            current_meals = session['daily_intake'][today_key]['meals']
-            meal_id = len(current_meals) + 1
-            
-            # 식사 로그 생성
-            meal_log = {
-                'id': meal_id,
-                'food_name': food_name.strip(),
-                'nutrition_data': nutrition_data.copy(),
-                'confidence_score': confidence_score,
-                'logged_at': datetime.now().isoformat()
-            }
-            
-            # 식사 목록에 추가
-            session['daily_intake'][today_key]['meals'].append(meal_log)
+            # 식사 번호는 추가 순서대로 증가 (삭제 후에도 재사용하지 않음)
+            meal_id = SessionIntakeService._next_meal_id(daily_data)
+            row = SessionIntakeService._encode_meal(
+                daily_data, meal_id, food_name.strip(), nutrition_data, portion, confidence_score
+            )
+            daily_data['meals'].append(row)
             
             # 총 영양소 누적
-            total_nutrition = session['daily_intake'][today_key]['total_nutrition']
+            total_nutrition = daily_data['total_nutrition']
             
             for nutrient, value in nutrition_data.items():
                 if nutrient in total_nutrition and isinstance(value, (int, float)):
-                    total_nutrition[nutrient] += value
+                    total_nutrition[nutrient] += value * portion
                 elif nutrient not in total_nutrition:
                     # 새로운 영양소가 있다면 추가
-                    total_nutrition[nutrient] = value if isinstance(value, (int, float)) else 0
+                    total_nutrition[nutrient] = value * portion if isinstance(value, (int, float)) else 0
             
             # 업데이트 시간 갱신
-            session['daily_intake'][today_key]['updated_at'] = datetime.now().isoformat()
+            daily_data['updated_at'] = datetime.now().isoformat()
             
             # 세션 수정 플래그 설정
             session.modified = True
             
+            # 세션 영양 상태에 바뀐 영양소만 반영
+            from services.nutrition_state_service import SessionNutritionStateService
+            SessionNutritionStateService.apply_intake_change(nutrition_data.keys())
+            
+            meal_log = SessionIntakeService._decode_meal(row, daily_data)
+            
+            # DB 기록은 백그라운드에서 일괄 저장 (요청은 기다리지 않음)
+            persistence, session_id = SessionIntakeService._get_persistence()
+            persistence.record_meal(session_id, today_key, meal_log)
+            persistence.record_daily_totals(session_id, today_key, total_nutrition, len(daily_data['meals']))
+            
             return meal_log
             
         except Exception as e:
@@ -120,13 +144,17 @@ class SessionIntakeService:
         Returns:
             일일 섭취량 데이터 또는 None
         """
-        if target_date is None:
-            target_date = SessionIntakeService.get_today_key()
-        
-        if 'daily_intake' not in session:
+        daily_data = SessionIntakeService._get_day(target_date)
+        if daily_data is None:
             return None
         
-        return session['daily_intake'].get(target_date)
+        return {
+            'date': daily_data['date'],
+            'total_nutrition': daily_data['total_nutrition'].copy(),
+            'meals': [SessionIntakeService._decode_meal(row, daily_data) for row in daily_data['meals']],
+            'created_at': daily_data.get('created_at'),
+            'updated_at': daily_data.get('updated_at')
+        }
     
     @staticmethod
     def get_current_totals() -> Dict:
@@ -147,15 +175,17 @@ class SessionIntakeService:
         Returns:
             식사 기록 리스트
         """
-        today_key = SessionIntakeService.get_today_key()
-        daily_data = SessionIntakeService.get_daily_intake(today_key)
+        daily_data = SessionIntakeService._get_day()
         
         if not daily_data or 'meals' not in daily_data:
             return []
         
-        # 최신순으로 정렬하여 반환
+        # 추가 순서로 저장되어 있으므로 뒤에서부터 limit개만 복원 (최신순)
         meals = daily_data['meals']
-        return sorted(meals, key=lambda x: x['logged_at'], reverse=True)[:limit]
+        return [
+            SessionIntakeService._decode_meal(row, daily_data)
+            for row in islice(reversed(meals), max(limit, 0))
+        ]
     
     @staticmethod
     def delete_meal(meal_id: int) -> bool:
@@ -169,21 +199,19 @@ class SessionIntakeService:
             삭제 성공 여부
         """
         today_key = SessionIntakeService.get_today_key()
-        daily_data = SessionIntakeService.get_daily_intake(today_key)
+        daily_data = SessionIntakeService._get_day(today_key)
         
         if not daily_data or 'meals' not in daily_data:
             return False
         
-        # 해당 ID의 식사 찾기
-        meal_to_delete = None
-        for i, meal in enumerate(daily_data['meals']):
-            if meal['id'] == meal_id:
-                meal_to_delete = daily_data['meals'].pop(i)
-                break
-        
-        if not meal_to_delete:
+        # 해당 ID의 식사 찾기 (번호 순으로 추가되므로 이진 탐색)
+        index = SessionIntakeService._find_meal_index(daily_data['meals'], meal_id)
+        if index < 0:
             return False
         
+        # 기록 당시 값으로 복원되므로 누적했던 양만큼 차감
+        meal_to_delete = SessionIntakeService._decode_meal(daily_data['meals'].pop(index), daily_data)
+        
         # 총 영양소에서 해당 식사 영양소 차감
         total_nutrition = daily_data['total_nutrition']
         meal_nutrition = meal_to_delete['nutrition_data']
@@ -196,6 +224,14 @@ class SessionIntakeService:
         daily_data['updated_at'] = datetime.now().isoformat()
         session.modified = True
         
+        # 세션 영양 상태에 바뀐 영양소만 반영
+        from services.nutrition_state_service import SessionNutritionStateService
+        SessionNutritionStateService.apply_intake_change(meal_nutrition.keys())
+        
+        persistence, session_id = SessionIntakeService._get_persistence()
+        persistence.delete_meal(session_id, today_key, meal_id)
+        persistence.record_daily_totals(session_id, today_key, total_nutrition, len(daily_data['meals']))
+        
         return True
     
     @staticmethod
@@ -212,12 +248,19 @@ class SessionIntakeService:
         if 'daily_intake' in session and target_date in session['daily_intake']:
             del session['daily_intake'][target_date]
             session.modified = True
+            
+            # 세션 영양 상태 재계산
+            from services.nutrition_state_service import SessionNutritionStateService
+            SessionNutritionStateService.rebuild()
+            
+            persistence, session_id = SessionIntakeService._get_persistence()
+            persistence.reset_day(session_id, target_date)
     
     @staticmethod
     def get_intake_summary() -> Dict:
         """섭취량 요약 정보 반환"""
         today_key = SessionIntakeService.get_today_key()
-        daily_data = SessionIntakeService.get_daily_intake(today_key)
+        daily_data = SessionIntakeService._get_day(today_key)
         
         if not daily_data:
             return {
@@ -231,8 +274,8 @@ class SessionIntakeService:
         last_meal_time = None
         
         if meals:
-            # 가장 최근 식사 시간
-            last_meal_time = max(meal['logged_at'] for meal in meals)
+            # 가장 최근 식사 시간 (추가 순서상 마지막 식사)
+            last_meal_time = SessionIntakeService._decode_meal(meals[-1], daily_data)['logged_at']
         
         return {
             'date': today_key,
@@ -243,6 +286,128 @@ class SessionIntakeService:
             'updated_at': daily_data.get('updated_at')
         }
     
+    @staticmethod
+    def _get_day(target_date: str = None) -> Optional[Dict]:
+        """세션에 저장된 날짜별 기록 원본 (식사는 압축 행), None이면 오늘"""
+        if target_date is None:
+            target_date = SessionIntakeService.get_today_key()
+        
+        if 'daily_intake' not in session:
+            return None
+        
+        return session['daily_intake'].get(target_date)
+    
+    @staticmethod
+    def _get_days() -> Dict[str, Dict]:
+        """세션에 남아 있는 날짜별 기록 원본 (날짜 키 -> 기록, 읽기 전용으로 사용)"""
+        return session.get('daily_intake', {})
+    
+    @staticmethod
+    def _next_meal_id(daily_data: Dict) -> int:
+        """다음 식사 번호 발급 (이전 형식 기록은 기존 최대 번호 다음부터)"""
+        meal_id = daily_data.get('next_meal_id')
+        if meal_id is None:
+            meal_id = max((SessionIntakeService._meal_row_id(row) for row in daily_data['meals']), default=0) + 1
+        daily_data['next_meal_id'] = meal_id + 1
+        return meal_id
+    
+    @staticmethod
+    def _meal_row_id(row) -> int:
+        """식사 행의 번호 (이전 형식 딕셔너리 포함)"""
+        return row['id'] if isinstance(row, dict) else row[MEAL_ID]
+    
+    @staticmethod
+    def _find_meal_index(meals: List, meal_id: int) -> int:
+        """
+        식사 번호로 목록 위치 찾기
+        
+        Args:
+            meals: 추가 순서(= 번호 순서)로 저장된 식사 행
+            meal_id: 식사 번호
+            
+        Returns:
+            목록 위치 (없으면 -1)
+        """
+        index = bisect_left(meals, meal_id, key=SessionIntakeService._meal_row_id)
+        if index < len(meals) and SessionIntakeService._meal_row_id(meals[index]) == meal_id:
+            return index
+        
+        # 번호 순서가 보장되지 않는 이전 형식 기록
+        for index, row in enumerate(meals):
+            if SessionIntakeService._meal_row_id(row) == meal_id:
+                return index
+        return -1
+    
+    @staticmethod
+    def _encode_meal(daily_data: Dict, meal_id: int, food_name: str, nutrition_data: Mapping,
+                     portion: float, confidence_score: Optional[float]) -> List:
+        """
+        식사를 세션 저장용 압축 행으로 변환
+        
+        카탈로그 음식은 ID만 저장하고 1인분 영양소는 날짜별 음식 표에 한 번만 보관합니다.
+        카탈로그에 없거나 그날 보관한 음식명/값과 다르면 음식명과 1인분 영양소를 행에 함께 저장합니다.
+        """
+        from services.nutrition_data_service import get_nutrition_data_service
+        food_ids, _ = get_nutrition_data_service().get_food_ids()
+        
+        portion = int(portion) if float(portion).is_integer() else portion
+        food_id = food_ids.get(food_name)
+        values = [nutrition_data.get(nutrient, 0.0) for nutrient in NUTRIENT_KEYS]
+        values = [value if isinstance(value, (int, float)) else 0.0 for value in values]
+        
+        row = [meal_id, food_id, portion, int(time.time()), confidence_score]
+        if food_id is not None:
+            saved = daily_data.setdefault('foods', {}).setdefault(str(food_id), [food_name, values])
+            if saved[0] == food_name and saved[1] == values:
+                return row
+        
+        row[MEAL_FOOD] = food_name
+        row.append(values)
+        return row
+    
+    @staticmethod
+    def _decode_meal(row, daily_data: Mapping) -> Dict:
+        """
+        압축 행을 식사 정보로 복원 (영양 정보는 기록 당시 1인분 x 배수)
+        
+        Args:
+            row: 식사 행
+            daily_data: 행이 속한 날짜 기록 (음식 표 조회용)
+        
+        Returns:
+            {'id', 'food_name', 'nutrition_data', 'portion', 'confidence_score', 'logged_at'}
+        """
+        if isinstance(row, dict):
+            return row  # 이전 형식 기록
+        
+        portion = row[MEAL_PORTION]
+        if len(row) > MEAL_NUTRITION:
+            food_name = row[MEAL_FOOD]
+            values = row[MEAL_NUTRITION]
+        else:
+            # ID만 저장한 행은 _encode_meal이 같은 날짜의 음식 표에 항목을 남긴 경우뿐
+            food_name, values = daily_data['foods'][str(row[MEAL_FOOD])]
+        nutrition = dict(zip(NUTRIENT_KEYS, values))
+        
+        if portion != 1:
+            nutrition = {nutrient: value * portion for nutrient, value in nutrition.items()}
+        
+        return {
+            'id': row[MEAL_ID],
+            'food_name': food_name,
+            'nutrition_data': nutrition,
+            'portion': portion,
+            'confidence_score': row[MEAL_CONFIDENCE],
+            'logged_at': datetime.fromtimestamp(row[MEAL_LOGGED_AT]).isoformat()
+        }
+    
+    @staticmethod
+    def _get_persistence():
+        """DB 영속화 버퍼와 세션 ID"""
+        from services.intake_persistence_service import get_intake_persistence
+        from services.profile_service import SessionProfileService
+        return get_intake_persistence(), SessionProfileService.get_session_id()
+    
     @staticmethod
     def _get_empty_nutrition() -> Dict:
         """빈 영양소 딕셔너리 반환"""
@@ -0,0 +1,264 @@
+"""
+장기 섭취 추이 조회 (일/주/월 집계 테이블 기반)
+
+일별 총량은 daily_intakes, 주/월 합계는 intake_rollups에서 읽으므로 1년 범위도
+수백 행만 조회합니다. 두 테이블은 식사 기록 시 write-behind 버퍼가 갱신하며,
+아직 기록되지 않았을 수 있는 세션의 날짜는 세션의 최신 총량으로 대체합니다.
+테이블을 읽을 수 없으면(아직 생성 전, 영속화 비활성화 등) 세션 기록만으로 계산합니다.
+"""
+
+import logging
+import numpy as np
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from services.intake_service import SessionIntakeService
+from services.profile_service import SessionProfileService
+from services.intake_persistence_service import DAILY_TOTAL_COLUMNS, get_intake_persistence, get_period_bounds
+from services.meal_combination_service import LIMIT_NUTRIENTS
+from utils.nutrition_utils import NUTRIENT_KEYS
+
+class IntakeTrendService:
+    """세션 기반 장기 섭취 추이 서비스"""
+    
+    MAX_DAYS = 366
+    GRANULARITIES = ('day', 'week', 'month')
+    # 이동 평균 기간 (일, 기록이 있는 날의 평균)
+    ROLLING_WINDOWS = (7, 30)
+    # 목표 준수 판정 허용 오차 (상한 영양소는 목표 이하이면 준수)
+    ADHERENCE_TOLERANCE = 0.2
+    
+    @staticmethod
+    def get_trends(days: int = 30, granularity: str = 'day') -> Dict:
+        """
+        섭취 추이 조회
+        
+        Args:
+            days: 오늘까지 조회할 일수 (1 ~ MAX_DAYS)
+            granularity: 기간 단위 ('day', 'week', 'month')
+        
+        Returns:
+            {'range', 'granularity', 'daily' 또는 'periods', 'adherence'} 딕셔너리
+        """
+        if not isinstance(days, int) or not 1 <= days <= IntakeTrendService.MAX_DAYS:
+            raise ValueError(f"조회 일수는 1에서 {IntakeTrendService.MAX_DAYS} 사이여야 합니다.")
+        if granularity not in IntakeTrendService.GRANULARITIES:
+            raise ValueError(f"지원하지 않는 기간 단위입니다: {granularity}")
+        
+        session_id = SessionProfileService.get_session_id()
+        end = date.today()
+        start = end - timedelta(days=days - 1)
+        
+        # 첫날의 이동 평균까지 계산하도록 가장 긴 이동 평균 기간만큼 앞부터 조회
+        # (주/월은 집계 테이블 대신 일별 총량으로 합산할 수 있도록 첫 기간 시작일부터)
+        history_start = start - timedelta(days=max(IntakeTrendService.ROLLING_WINDOWS) - 1)
+        if granularity != 'day':
+            history_start = min(history_start, get_period_bounds(granularity, start)[0])
+        dates, matrix, meal_counts = IntakeTrendService._load_daily_matrix(session_id, history_start, end)
+        logged = meal_counts > 0
+        offset = (start - history_start).days
+        
+        result = {
+            'range': {'start': start.isoformat(), 'end': end.isoformat(), 'days': days},
+            'granularity': granularity,
+            'adherence': IntakeTrendService._calculate_adherence(matrix[offset:-1], logged[offset:-1])
+        }
+        
+        if granularity == 'day':
+            result['daily'] = IntakeTrendService._build_daily_series(dates, matrix, meal_counts, offset)
+        else:
+            periods = None
+            if get_intake_persistence().ENABLED:
+                periods = IntakeTrendService._load_periods(session_id, granularity, start, end)
+            if periods is None:
+                # 집계 테이블이 갱신되지 않거나 읽을 수 없으면 일별 총량(세션 포함)으로 합산
+                periods = IntakeTrendService._aggregate_periods(dates, matrix, meal_counts, granularity, start)
+            result['periods'] = periods
+        
+        return result
+    
+    @staticmethod
+    def _load_daily_matrix(session_id: str, start: date, end: date):
+        """
+        기간의 일별 총량 행렬 (기록이 없는 날은 0)
+        
+        Returns:
+            (날짜 목록, 총량 행렬[날짜 x NUTRIENT_KEYS], 날짜별 식사 수) 튜플
+        """
+        from app import db
+        from models.nutrition_models import DailyIntake
+        from sqlalchemy.exc import SQLAlchemyError
+        
+        total_columns = [getattr(DailyIntake, DAILY_TOTAL_COLUMNS[nutrient]) for nutrient in NUTRIENT_KEYS]
+        try:
+            rows = db.session.execute(
+                db.select(DailyIntake.date, DailyIntake.meal_count, *total_columns).where(
+                    DailyIntake.session_id == session_id,
+                    DailyIntake.date.between(start, end)
+                )
+            ).all()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.warning(f"일별 섭취 기록을 조회할 수 없어 세션 기록만 사용합니다: {str(e)}")
+            rows = []
+        
+        day_count = (end - start).days + 1
+        dates = [start + timedelta(days=index) for index in range(day_count)]
+        matrix = np.zeros((day_count, len(NUTRIENT_KEYS)), dtype=float)
+        meal_counts = np.zeros(day_count, dtype=int)
+        
+        for row in rows:
+            index = (row[0] - start).days
+            matrix[index] = [value or 0.0 for value in row[2:]]
+            meal_counts[index] = row[1] or 0
+        
+        # 세션에 남아 있는 날짜는 아직 DB에 반영되지 않았을 수 있으므로 세션 값 사용
+        # (오늘은 세션이 기준이므로 세션에 식사가 없으면 0)
+        matrix[-1] = 0.0
+        meal_counts[-1] = 0
+        for date_key, daily_data in SessionIntakeService._get_days().items():
+            try:
+                index = (date.fromisoformat(date_key) - start).days
+            except ValueError:
+                continue
+            if not 0 <= index < day_count or not daily_data.get('meals'):
+                continue
+            
+            totals = daily_data['total_nutrition']
+            matrix[index] = [totals.get(nutrient, 0.0) for nutrient in NUTRIENT_KEYS]
+            meal_counts[index] = len(daily_data['meals'])
+        
+        return dates, matrix, meal_counts
+    
+    @staticmethod
+    def _build_daily_series(dates: List[date], matrix: np.ndarray, meal_counts: np.ndarray,
+                            offset: int) -> List[Dict]:
+        """기록이 있는 날의 총량과 이동 평균 (누적합으로 창마다 한 번에 계산)"""
+        logged = meal_counts > 0
+        total_sums = np.vstack([np.zeros(len(NUTRIENT_KEYS)), np.cumsum(matrix, axis=0)])
+        day_sums = np.concatenate([[0], np.cumsum(logged)])
+        
+        series = []
+        for index in range(offset, len(dates)):
+            if not logged[index]:
+                continue
+            
+            rolling = {}
+            for window in IntakeTrendService.ROLLING_WINDOWS:
+                first = max(0, index + 1 - window)
+                logged_days = day_sums[index + 1] - day_sums[first]
+                averages = (total_sums[index + 1] - total_sums[first]) / logged_days
+                rolling[f'{window}d'] = IntakeTrendService._to_nutrient_dict(averages)
+            
+            series.append({
+                'date': dates[index].isoformat(),
+                'meal_count': int(meal_counts[index]),
+                'totals': IntakeTrendService._to_nutrient_dict(matrix[index]),
+                'rolling_averages': rolling
+            })
+        
+        return series
+    
+    @staticmethod
+    def _load_periods(session_id: str, period: str, start: date, end: date) -> Optional[List[Dict]]:
+        """주/월 집계 조회 (조회 시작일이 속한 기간부터, 집계 테이블을 읽을 수 없으면 None)"""
+        from app import db
+        from models.nutrition_models import IntakeRollup
+        from sqlalchemy.exc import SQLAlchemyError
+        
+        total_columns = [getattr(IntakeRollup, DAILY_TOTAL_COLUMNS[nutrient]) for nutrient in NUTRIENT_KEYS]
+        try:
+            rows = db.session.execute(
+                db.select(IntakeRollup.period_start, IntakeRollup.days_logged, IntakeRollup.meal_count,
+                          *total_columns).where(
+                    IntakeRollup.session_id == session_id,
+                    IntakeRollup.period == period,
+                    IntakeRollup.period_start.between(get_period_bounds(period, start)[0], end)
+                ).order_by(IntakeRollup.period_start)
+            ).all()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.warning(f"기간별 집계를 조회할 수 없어 일별 총량으로 계산합니다: {str(e)}")
+            return None
+        
+        return [
+            IntakeTrendService._build_period(
+                period, row[0], row[1] or 0, row[2] or 0,
+                np.array([value or 0.0 for value in row[3:]], dtype=float)
+            )
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _aggregate_periods(dates: List[date], matrix: np.ndarray, meal_counts: np.ndarray,
+                           period: str, start: date) -> List[Dict]:
+        """일별 총량 행렬로 주/월 집계 계산 (행렬은 첫 기간 시작일부터 포함)"""
+        first_start = get_period_bounds(period, start)[0]
+        groups = {}
+        for index, day in enumerate(dates):
+            if day < first_start or not meal_counts[index]:
+                continue
+            groups.setdefault(get_period_bounds(period, day)[0], []).append(index)
+        
+        return [
+            IntakeTrendService._build_period(
+                period, period_start, len(rows), int(meal_counts[rows].sum()), matrix[rows].sum(axis=0)
+            )
+            for period_start, rows in sorted(groups.items())
+        ]
+    
+    @staticmethod
+    def _build_period(period: str, period_start: date, days_logged: int, meal_count: int,
+                      totals: np.ndarray) -> Dict:
+        """기간 하나의 응답 항목"""
+        return {
+            'period_start': period_start.isoformat(),
+            'period_end': get_period_bounds(period, period_start)[1].isoformat(),
+            'days_logged': days_logged,
+            'meal_count': meal_count,
+            'totals': IntakeTrendService._to_nutrient_dict(totals),
+            'daily_averages': IntakeTrendService._to_nutrient_dict(totals / max(days_logged, 1))
+        }
+    
+    @staticmethod
+    def _calculate_adherence(matrix: np.ndarray, logged: np.ndarray) -> Optional[Dict]:
+        """
+        영양소별 목표 준수율 (기록이 있는 지난 날 기준, 진행 중인 오늘은 제외)
+        
+        Returns:
+            {'days_evaluated', 'nutrients': 영양소 -> {'target', 'average', 'average_percentage',
+            'days_on_target', 'adherence_rate'}} (프로필 목표가 없으면 None)
+        """
+        profile = SessionProfileService.get_profile()
+        if not profile or 'nutrition_targets' not in profile:
+            return None
+        
+        targets = profile['nutrition_targets']
+        intake = matrix[logged]
+        days_evaluated = len(intake)
+        
+        adherence = {}
+        for column, nutrient in enumerate(NUTRIENT_KEYS):
+            target = targets.get(nutrient)
+            if not isinstance(target, (int, float)) or target <= 0:
+                continue
+            
+            ratios = intake[:, column] / target
+            if nutrient in LIMIT_NUTRIENTS:
+                on_target = ratios <= 1.0
+            else:
+                on_target = np.abs(ratios - 1.0) <= IntakeTrendService.ADHERENCE_TOLERANCE
+            
+            adherence[nutrient] = {
+                'target': target,
+                'average': round(float(intake[:, column].mean()), 1) if days_evaluated else None,
+                'average_percentage': round(float(ratios.mean()) * 100, 1) if days_evaluated else None,
+                'days_on_target': int(on_target.sum()),
+                'adherence_rate': round(float(on_target.mean()), 3) if days_evaluated else None
+            }
+        
+        return {'days_evaluated': days_evaluated, 'nutrients': adherence}
+    
+    @staticmethod
+    def _to_nutrient_dict(values: np.ndarray) -> Dict[str, float]:
+        """NUTRIENT_KEYS 순서 벡터를 영양소 딕셔너리로 변환"""
+        return {nutrient: round(float(value), 1) for nutrient, value in zip(NUTRIENT_KEYS, values)}
@@ -0,0 +1,290 @@
+"""
+한 끼 조합 추천 서비스 (밥 + 국/찌개 + 반찬)
+
+남은 허용량을 가장 잘 채우면서 과잉 기준을 넘지 않는 2-4가지 음식 조합을
+빔 탐색과 분기 한정(branch-and-bound)으로 찾습니다. 한 단계의 확장과 상한 계산은
+NumPy 행렬 연산으로 처리하고, 시간 예산을 넘으면 그때까지 찾은 결과를 반환합니다.
+"""
+
+import os
+import time
+import logging
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from services.nutrition_service import NutritionCalculatorService
+from services.nutrition_data_service import get_nutrition_data_service
+from services.intake_service import SessionIntakeService
+from services.profile_service import SessionProfileService
+from services.analysis_context import get_analysis_context
+from utils.nutrition_utils import NUTRIENT_KEYS
+from utils.meal_category_utils import (
+    MEAL_CATEGORIES, MEAL_CATEGORY_NAMES, STAPLE, SOUP, SIDE, OTHER, get_meal_category
+)
+
+# 채울 대상이 아니라 상한만 지키는 영양소
+LIMIT_NUTRIENTS = ('sugars', 'saturated_fat', 'cholesterol', 'sodium')
+
+# 과잉 기준 (identify_nutritional_gaps와 같이 목표의 10% 초과를 과잉으로 봄)
+EXCESS_TOLERANCE = 0.1
+
+_category_codes = None  # (음식명 목록, 음식별 분류 번호 배열)
+_category_lock = threading.Lock()
+
+def get_category_codes(food_names: List[str]) -> np.ndarray:
+    """음식별 분류 번호 (MEAL_CATEGORIES 순서, 영양소 행렬과 같은 세대 동안 재사용)"""
+    global _category_codes
+    
+    cached = _category_codes
+    if cached is not None and cached[0] is food_names:
+        return cached[1]
+    
+    with _category_lock:
+        if _category_codes is None or _category_codes[0] is not food_names:
+            code_of = {category: code for code, category in enumerate(MEAL_CATEGORIES)}
+            codes = np.array([code_of[get_meal_category(name)] for name in food_names], dtype=np.int8)
+            codes.setflags(write=False)
+            _category_codes = (food_names, codes)
+        return _category_codes[1]
+
+class MealCombinationRecommender:
+    """한 끼 조합 추천기"""
+    
+    # 분류별 최대 개수 (주식은 반드시 1개)
+    CATEGORY_LIMITS = {STAPLE: 1, SOUP: 1, SIDE: 2, OTHER: 1}
+    REQUIRED_CATEGORY = STAPLE
+    
+    MIN_DISHES = 2
+    MAX_DISHES = 4
+    
+    POOL_SIZE = 200    # 분류별 후보 수 (단품 채움 점수 상위)
+    BEAM_WIDTH = 64    # 단계별로 확장할 부분 조합 수
+    TIME_BUDGET_MS = float(os.getenv('MEAL_COMBINATION_TIME_BUDGET_MS', '150'))
+    
+    def __init__(self):
+        self.nutrition_calculator = NutritionCalculatorService()
+        self.nutrition_data_service = get_nutrition_data_service()
+    
+    def generate_combinations(self, max_combinations: int = 3,
+                              max_dishes: int = MAX_DISHES,
+                              time_budget_ms: Optional[float] = None) -> Dict:
+        """
+        한 끼 조합 추천 생성
+        
+        Args:
+            max_combinations: 최대 조합 수
+            max_dishes: 조합당 최대 음식 수 (2-4)
+            time_budget_ms: 탐색 시간 예산 (None이면 기본값)
+        
+        Returns:
+            {'combinations': 조합 목록, 'search': 탐색 통계}
+        """
+        context = get_analysis_context()
+        food_names, nutrient_matrix, food_index = self.nutrition_data_service.get_nutrient_matrix()
+        
+        targets = np.array([context.targets.get(n, 0) for n in NUTRIENT_KEYS], dtype=float)
+        current = np.array([context.current_intake.get(n, 0) for n in NUTRIENT_KEYS], dtype=float)
+        
+        # 채울 부족분과 과잉 기준까지 남은 양
+        fill_mask = (targets > 0) & ~np.isin(NUTRIENT_KEYS, LIMIT_NUTRIENTS)
+        deficit = np.where(fill_mask, np.maximum(targets - current, 0), 0)
+        fill_count = int((deficit > 0).sum())
+        limits = np.where(targets > 0, targets * (1 + EXCESS_TOLERANCE) - current, np.inf)
+        
+        search = {
+            'candidates': 0, 'expanded': 0, 'elapsed_ms': 0.0,
+            'beam_limited': False, 'time_budget_exceeded': False
+        }
+        if not food_names or fill_count == 0 or max_combinations <= 0:
+            return {'combinations': [], 'search': search}
+        
+        # 채움 점수 = 부족분별 충족률 평균 (0-100)
+        weights = np.divide(100.0 / fill_count, deficit, out=np.zeros_like(deficit), where=deficit > 0)
+        
+        pool = self._build_candidate_pool(food_names, nutrient_matrix, food_index,
+                                          deficit, weights, limits)
+        search['candidates'] = len(pool[0])
+        
+        budget = self.TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+        max_dishes = max(self.MIN_DISHES, min(max_dishes, self.MAX_DISHES))
+        best = self._search(pool, deficit, weights, limits, max_combinations,
+                            max_dishes, budget, search)
+        
+        combinations = [
+            self._format_combination([food_names[row] for row in pool[0][items]], fill, context)
+            for fill, items in best
+        ]
+        return {'combinations': combinations, 'search': search}
+    
+    def _build_candidate_pool(self, food_names: List[str], nutrient_matrix: np.ndarray,
+                              food_index: Dict[str, int], deficit: np.ndarray,
+                              weights: np.ndarray, limits: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        분류별 후보 선정 (단독으로 과잉 기준을 넘는 음식, 식이 제한 음식, 최근 먹은 음식 제외)
+        
+        Returns:
+            (카탈로그 행 번호, 영양소 행렬, 분류 번호) 튜플, 분류 순서(주식 먼저)로 정렬
+        """
+        codes = get_category_codes(food_names)
+        
+        # 식이 제한 음식 제외 (태그 비트셋 AND 한 번)
+        available = (nutrient_matrix <= limits).all(axis=1)
+        available &= ~self.nutrition_data_service.get_restricted_food_mask(
+            food_names, SessionProfileService.get_restriction_mask()
+        )
+        for food_name in self._get_recent_eaten_foods():
+            row = food_index.get(food_name)
+            if row is not None:
+                available[row] = False
+        
+        single_fill = (np.minimum(nutrient_matrix, deficit) * weights).sum(axis=1)
+        
+        rows = []
+        for code in range(len(MEAL_CATEGORIES)):
+            category_rows = np.flatnonzero(available & (codes == code))
+            if len(category_rows) > self.POOL_SIZE:
+                # 단품 채움 점수 상위 (동점이면 카탈로그 순서)
+                order = np.lexsort((category_rows, -single_fill[category_rows]))
+                category_rows = np.sort(category_rows[order[:self.POOL_SIZE]])
+            rows.append(category_rows)
+        
+        pool_rows = np.concatenate(rows)
+        return pool_rows, nutrient_matrix[pool_rows], codes[pool_rows]
+    
+    def _search(self, pool: Tuple[np.ndarray, np.ndarray, np.ndarray], deficit: np.ndarray,
+                weights: np.ndarray, limits: np.ndarray, k: int, max_dishes: int,
+                budget_ms: float, search: Dict) -> List[Tuple[float, np.ndarray]]:
+        """
+        빔 탐색 + 분기 한정으로 상위 k개 조합 탐색
+        
+        조합은 후보 순서(주식 -> 국/찌개 -> 반찬 -> 기타)대로만 늘려 같은 조합을 한 번만
+        만듭니다. 부분 조합의 상한(남은 자리를 영양소별 최대값으로 채운 경우의 점수)이
+        현재 k번째 점수 이하이면 더 확장하지 않습니다.
+        
+        Returns:
+            (채움 점수, 후보 번호 배열) 목록 (점수 내림차순)
+        """
+        started = time.perf_counter()
+        _, pool_matrix, pool_codes = pool
+        caps = np.array([self.CATEGORY_LIMITS[c] for c in MEAL_CATEGORIES], dtype=np.int8)
+        max_values = pool_matrix.max(axis=0) if len(pool_matrix) else np.zeros_like(deficit)
+        
+        # 시작: 주식 하나씩 (상한 기준 상위 BEAM_WIDTH개)
+        staples = np.flatnonzero(pool_codes == MEAL_CATEGORIES.index(self.REQUIRED_CATEGORY))
+        if len(staples) > self.BEAM_WIDTH:
+            staple_sums = pool_matrix[staples]
+            fills = (np.minimum(staple_sums, deficit) * weights).sum(axis=1)
+            bounds = (np.minimum(staple_sums + (max_dishes - 1) * max_values, deficit) * weights).sum(axis=1)
+            staples = np.sort(staples[self._beam_order(bounds, fills)])
+            search['beam_limited'] = True
+        items = staples[:, None]
+        sums = pool_matrix[staples]
+        counts = np.zeros((len(staples), len(MEAL_CATEGORIES)), dtype=np.int8)
+        counts[:, MEAL_CATEGORIES.index(self.REQUIRED_CATEGORY)] = 1
+        
+        best: List[Tuple[float, np.ndarray]] = []
+        positions = np.arange(len(pool_codes))
+        
+        for size in range(2, max_dishes + 1):
+            if len(items) == 0:
+                break
+            if (time.perf_counter() - started) * 1000 > budget_ms:
+                search['time_budget_exceeded'] = True
+                break
+            
+            # 모든 부분 조합 x 모든 후보를 한 번에 확장 (B x P)
+            new_sums = sums[:, None, :] + pool_matrix[None, :, :]
+            valid = positions[None, :] > items[:, -1:]
+            valid &= counts[:, pool_codes] < caps[pool_codes]
+            valid &= (new_sums <= limits).all(axis=2)
+            fills = (np.minimum(new_sums, deficit) * weights).sum(axis=2)
+            search['expanded'] += int(valid.sum())
+            
+            # 완성 조합 중 상위 k개 갱신
+            best = self._merge_best(best, items, fills, valid, k)
+            
+            if size == max_dishes:
+                break
+            
+            # 다음 단계 부분 조합: 상한이 k번째 점수보다 높은 것 중 상위 BEAM_WIDTH개
+            kth_fill = best[-1][0] if len(best) >= k else -np.inf
+            bounds = (np.minimum(new_sums + (max_dishes - size) * max_values, deficit) * weights).sum(axis=2)
+            expandable = valid & (bounds > kth_fill)
+            parents, candidates = np.nonzero(expandable)
+            if len(parents) > self.BEAM_WIDTH:
+                keep = self._beam_order(bounds[parents, candidates], fills[parents, candidates])
+                parents, candidates = parents[keep], candidates[keep]
+                search['beam_limited'] = True
+            
+            items = np.concatenate([items[parents], candidates[:, None]], axis=1)
+            sums = new_sums[parents, candidates]
+            counts = counts[parents].copy()
+            np.add.at(counts, (np.arange(len(candidates)), pool_codes[candidates]), 1)
+        
+        search['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return best
+    
+    def _beam_order(self, bounds: np.ndarray, fills: np.ndarray) -> np.ndarray:
+        """상한이 높은 순(동점이면 현재 점수 순)으로 BEAM_WIDTH개 선택"""
+        return np.lexsort((-fills, -bounds))[:self.BEAM_WIDTH]
+    
+    @staticmethod
+    def _merge_best(best: List[Tuple[float, np.ndarray]], items: np.ndarray,
+                    fills: np.ndarray, valid: np.ndarray, k: int) -> List[Tuple[float, np.ndarray]]:
+        """이번 단계의 완성 조합을 기존 상위 k개와 합침 (점수 내림차순, 동점이면 후보 순서)"""
+        parents, candidates = np.nonzero(valid)
+        if len(parents) == 0:
+            return best
+        
+        level_fills = fills[parents, candidates]
+        if len(level_fills) > k:
+            top = np.argpartition(-level_fills, k - 1)[:k]
+            parents, candidates, level_fills = parents[top], candidates[top], level_fills[top]
+        
+        merged = best + [
+            (float(fill), np.append(items[parent], candidate))
+            for fill, parent, candidate in zip(level_fills, parents, candidates)
+        ]
+        merged.sort(key=lambda entry: (-entry[0], entry[1].tolist()))
+        return merged[:k]
+    
+    def _format_combination(self, food_names: List[str], fill: float, context) -> Dict:
+        """조합 결과 포맷팅 (합계 영양소와 섭취 후 예상 백분율 포함)"""
+        foods = []
+        total_nutrition = {nutrient: 0.0 for nutrient in NUTRIENT_KEYS}
+        
+        for food_name in food_names:
+            nutrition_data = self.nutrition_data_service.get_nutrition_data(food_name)
+            category = get_meal_category(food_name)
+            foods.append({
+                'food_name': food_name,
+                'category': category,
+                'category_name': MEAL_CATEGORY_NAMES[category],
+                'serving_size': nutrition_data['serving_size'] if nutrition_data else None
+            })
+            if nutrition_data:
+                for nutrient in NUTRIENT_KEYS:
+                    total_nutrition[nutrient] += nutrition_data['nutrition'].get(nutrient, 0)
+        
+        projected_intake = {
+            nutrient: context.current_intake.get(nutrient, 0) + value
+            for nutrient, value in total_nutrition.items()
+        }
+        
+        return {
+            'foods': foods,
+            'score': round(fill, 1),
+            'total_nutrition': {nutrient: round(value, 1) for nutrient, value in total_nutrition.items()},
+            'projected_percentages': self.nutrition_calculator.calculate_nutrition_percentage(
+                projected_intake, context.targets
+            )
+        }
+    
+    def _get_recent_eaten_foods(self) -> List[str]:
+        """최근 먹은 음식 목록 (조합 후보에서 제외)"""
+        try:
+            meals = SessionIntakeService.get_meal_history(limit=20)
+            return [meal['food_name'] for meal in meals if meal.get('food_name')]
+        except Exception as e:
+            logging.error(f"최근 식사 기록 조회 중 오류: {str(e)}")
+            return []
@@ -0,0 +1,432 @@
+"""
+주간 식단 계획 서비스 (7일 x 3끼)
+
+하루 목표량을 허용 오차 안에서 맞추고, 같은 음식을 N끼 안에 반복하지 않으며,
+식이 제한을 지키는 식단을 만듭니다. 한 끼 추천 점수로 분류별 후보를 고른 뒤
+끼니별 탐욕적 배치로 초기 식단을 만들고, 음식 교체/추가/제거 국소 탐색으로
+개선합니다. 후보 평가는 모두 후보 전체에 대한 NumPy 행렬 연산입니다.
+결과는 프로필(목표, 식이 제한)과 카탈로그 세대를 키로 캐시합니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from services.nutrition_service import NutritionCalculatorService
+from services.nutrition_data_service import get_nutrition_data_service
+from services.profile_service import SessionProfileService
+from services.recommendation_service import MenuRecommendationEngine
+from services.recommendation_cache_service import RecommendationResultCache
+from services.meal_combination_service import LIMIT_NUTRIENTS, get_category_codes
+from utils.nutrition_utils import NUTRIENT_KEYS, calculate_nutrition_score
+from utils.meal_category_utils import (
+    MEAL_CATEGORIES, MEAL_CATEGORY_NAMES, STAPLE, SOUP, SIDE, OTHER
+)
+
+# 하루 끼니와 칼로리 배분
+MEAL_SLOTS = ('breakfast', 'lunch', 'dinner')
+MEAL_SLOT_NAMES = {'breakfast': '아침', 'lunch': '점심', 'dinner': '저녁'}
+MEAL_CALORIE_SHARES = (0.3, 0.35, 0.35)
+
+class _PlanObjective:
+    """식단 평가 함수 (하루 목표 대비 편차 + 끼니별 칼로리 배분)"""
+    
+    def __init__(self, targets: np.ndarray, tolerance: float, nutrient_weights: Dict[str, float],
+                 out_of_tolerance_weight: float, meal_balance_weight: float):
+        active = targets > 0
+        self.tolerance = tolerance
+        self.inv_targets = np.divide(1.0, targets, out=np.zeros_like(targets), where=active)
+        self.is_limit = np.isin(NUTRIENT_KEYS, LIMIT_NUTRIENTS)
+        self.weights = np.array([nutrient_weights.get(n, 1.0) for n in NUTRIENT_KEYS]) * active
+        self.out_of_tolerance_weight = out_of_tolerance_weight
+        self.meal_balance_weight = meal_balance_weight
+        
+        calories = targets[NUTRIENT_KEYS.index('calories')]
+        self.inv_meal_calories = np.array([
+            1.0 / (calories * share) if calories > 0 else 0.0 for share in MEAL_CALORIE_SHARES
+        ])
+    
+    def deviations(self, totals: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        """목표 대비 상대 편차 (상한 영양소는 초과분만, 목표가 없는 영양소는 0)"""
+        ratio = totals * (self.inv_targets / scale)
+        deviation = np.where(self.is_limit, np.maximum(ratio - 1, 0), np.abs(ratio - 1))
+        return deviation * (self.weights > 0)
+    
+    def day_cost(self, totals: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        """하루(또는 scale만큼 진행된 하루) 합계의 비용 (허용 오차 밖은 크게 벌점)"""
+        deviation = self.deviations(totals, scale)
+        over = np.maximum(deviation - self.tolerance, 0)
+        return (np.square(deviation) + self.out_of_tolerance_weight * np.square(over)) @ self.weights
+    
+    def meal_cost(self, calories, meal: int):
+        """끼니 칼로리 배분 비용"""
+        return self.meal_balance_weight * np.square(calories * self.inv_meal_calories[meal] - 1)
+
+class WeeklyMealPlanner:
+    """주간 식단 계획기"""
+    
+    PLAN_DAYS = 7
+    MAX_DISHES_PER_MEAL = 3
+    
+    # 한 끼 분류별 최대 개수
+    CATEGORY_LIMITS = {STAPLE: 1, SOUP: 1, SIDE: 2, OTHER: 1}
+    
+    POOL_SIZE = 400    # 분류별 후보 수 (한 끼 추천 점수 상위)
+    MAX_SWEEPS = 20    # 국소 탐색 최대 반복 횟수
+    
+    TOLERANCE = float(os.getenv('MEAL_PLAN_TOLERANCE', '0.15'))
+    VARIETY_WINDOW = int(os.getenv('MEAL_PLAN_VARIETY_WINDOW', '6'))
+    TIME_BUDGET_MS = float(os.getenv('MEAL_PLAN_TIME_BUDGET_MS', '300'))
+    
+    # 평가 가중치
+    NUTRIENT_WEIGHTS = {'calories': 2.0}
+    OUT_OF_TOLERANCE_WEIGHT = 10.0
+    MEAL_BALANCE_WEIGHT = 0.2
+    
+    # 개선으로 인정하는 최소 비용 감소
+    EPSILON = 1e-9
+    
+    def __init__(self):
+        self.nutrition_calculator = NutritionCalculatorService()
+        self.nutrition_data_service = get_nutrition_data_service()
+    
+    def get_plan(self, days: int = PLAN_DAYS) -> Dict:
+        """
+        현재 프로필의 식단 계획 조회 (프로필과 카탈로그가 같으면 캐시 사용)
+        
+        Args:
+            days: 계획 일수 (1-7)
+        
+        Returns:
+            generate_plan()과 같은 형식 + 'cached' 여부
+        
+        Raises:
+            ValueError: 프로필이 설정되지 않은 경우
+        """
+        profile = SessionProfileService.get_profile()
+        if not profile or 'nutrition_targets' not in profile:
+            raise ValueError("사용자 프로필이 설정되지 않았습니다.")
+        
+        days = max(1, min(days, self.PLAN_DAYS))
+        targets = profile['nutrition_targets']
+        restriction_mask = SessionProfileService.get_restriction_mask()
+        
+        cache = get_meal_plan_cache()
+        generation = self.nutrition_data_service.generation
+        cache_key = hashlib.sha1(json.dumps([
+            sorted(targets.items()), restriction_mask, days,
+            self.VARIETY_WINDOW, self.TOLERANCE, self.MAX_DISHES_PER_MEAL
+        ]).encode('utf-8')).hexdigest()
+        
+        plan = cache.get(cache_key, generation)
+        if plan is not None:
+            return {**plan, 'cached': True}
+        
+        plan = self.generate_plan(targets, restriction_mask, days)
+        cache.put(cache_key, generation, plan)
+        return {**plan, 'cached': False}
+    
+    def generate_plan(self, targets: Dict[str, float], restriction_mask: int = 0,
+                      days: int = PLAN_DAYS, time_budget_ms: Optional[float] = None) -> Dict:
+        """
+        식단 계획 생성
+        
+        Args:
+            targets: 하루 목표 섭취량
+            restriction_mask: 식이 제한 제외 태그 마스크
+            days: 계획 일수
+            time_budget_ms: 탐색 시간 예산 (None이면 기본값)
+        
+        Returns:
+            {'days': 일별 식단, 'summary': 요약, 'search': 탐색 통계}
+        """
+        started = time.perf_counter()
+        budget = self.TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+        deadline = started + budget / 1000.0
+        
+        food_names, nutrient_matrix, _ = self.nutrition_data_service.get_nutrient_matrix()
+        target_vector = np.array([targets.get(n, 0) for n in NUTRIENT_KEYS], dtype=float)
+        
+        search = {
+            'candidates': 0, 'sweeps': 0, 'moves': 0,
+            'elapsed_ms': 0.0, 'time_budget_exceeded': False
+        }
+        pool_rows = self._build_candidate_pool(food_names, nutrient_matrix, targets, restriction_mask)
+        search['candidates'] = len(pool_rows)
+        
+        if len(pool_rows) == 0 or not (target_vector > 0).any():
+            return {'days': [], 'summary': self._summarize([], 0), 'search': search}
+        
+        # N끼 안에 반복하지 않으려면 후보가 충분해야 함 (부족하면 간격을 줄임)
+        window = max(1, min(self.VARIETY_WINDOW, (len(pool_rows) - 1) // self.MAX_DISHES_PER_MEAL + 1))
+        
+        objective = _PlanObjective(
+            target_vector, self.TOLERANCE, self.NUTRIENT_WEIGHTS,
+            self.OUT_OF_TOLERANCE_WEIGHT, self.MEAL_BALANCE_WEIGHT
+        )
+        codes = get_category_codes(food_names)
+        pool = (nutrient_matrix[pool_rows], codes[pool_rows])
+        
+        plan = self._build_initial_plan(pool, objective, days, window)
+        self._improve_plan(plan, pool, objective, days, window, deadline, search)
+        
+        search['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        formatted_days = [
+            self._format_day(day, plan, pool, pool_rows, food_names, objective, targets)
+            for day in range(days)
+        ]
+        return {
+            'days': formatted_days,
+            'summary': self._summarize(formatted_days, window),
+            'search': search
+        }
+    
+    def _build_candidate_pool(self, food_names: List[str], nutrient_matrix: np.ndarray,
+                              targets: Dict[str, float], restriction_mask: int) -> np.ndarray:
+        """
+        분류별 후보 선정 (빈 속에서 한 끼를 먹을 때의 추천 점수 상위, 식이 제한 음식 제외)
+        
+        Returns:
+            카탈로그 행 번호 배열 (오름차순)
+        """
+        if not food_names:
+            return np.array([], dtype=np.int64)
+        
+        # 한 끼 목표 기준 점수 (섭취량 0에서 시작)
+        meal_targets = {n: value / len(MEAL_SLOTS) for n, value in targets.items()}
+        empty_intake = {n: 0 for n in meal_targets}
+        deficient, excess = self.nutrition_calculator.identify_nutritional_gaps(empty_intake, meal_targets)
+        remaining = self.nutrition_calculator.get_remaining_allowance(empty_intake, meal_targets)
+        
+        scores = MenuRecommendationEngine()._calculate_recommendation_scores(
+            nutrient_matrix, deficient, excess, remaining, empty_intake, meal_targets,
+            calculate_nutrition_score(empty_intake, meal_targets)
+        )
+        
+        available = ~self.nutrition_data_service.get_restricted_food_mask(food_names, restriction_mask)
+        codes = get_category_codes(food_names)
+        
+        rows = []
+        for code in range(len(MEAL_CATEGORIES)):
+            category_rows = np.flatnonzero(available & (codes == code))
+            if len(category_rows) > self.POOL_SIZE:
+                # 점수 상위 (동점이면 카탈로그 순서)
+                order = np.lexsort((category_rows, -scores[category_rows]))
+                category_rows = category_rows[order[:self.POOL_SIZE]]
+            rows.append(category_rows)
+        
+        return np.sort(np.concatenate(rows))
+    
+    def _build_initial_plan(self, pool: Tuple[np.ndarray, np.ndarray], objective: _PlanObjective,
+                            days: int, window: int) -> List[List[int]]:
+        """
+        끼니 순서대로 탐욕적 배치 (그때까지의 하루 합계를 칼로리 배분만큼 진행된 목표와 비교)
+        
+        Returns:
+            끼니별 후보 번호 목록
+        """
+        pool_matrix, _ = pool
+        calories = pool_matrix[:, NUTRIENT_KEYS.index('calories')]
+        plan = [[] for _ in range(days * len(MEAL_SLOTS))]
+        
+        for day in range(days):
+            day_total = np.zeros(len(NUTRIENT_KEYS))
+            for meal in range(len(MEAL_SLOTS)):
+                slot = day * len(MEAL_SLOTS) + meal
+                scale = sum(MEAL_CALORIE_SHARES[:meal + 1])
+                meal_calories = 0.0
+                
+                while len(plan[slot]) < self.MAX_DISHES_PER_MEAL:
+                    allowed = self._allowed_candidates(plan, slot, plan[slot], pool, window)
+                    if not allowed.any():
+                        break
+                    
+                    costs = (objective.day_cost(day_total + pool_matrix, scale)
+                             + objective.meal_cost(meal_calories + calories, meal))
+                    costs[~allowed] = np.inf
+                    best = int(np.argmin(costs))
+                    
+                    current = (objective.day_cost(day_total, scale)
+                               + objective.meal_cost(meal_calories, meal))
+                    if plan[slot] and costs[best] >= current - self.EPSILON:
+                        break
+                    
+                    plan[slot].append(best)
+                    day_total = day_total + pool_matrix[best]
+                    meal_calories += calories[best]
+        
+        return plan
+    
+    def _improve_plan(self, plan: List[List[int]], pool: Tuple[np.ndarray, np.ndarray],
+                      objective: _PlanObjective, days: int, window: int,
+                      deadline: float, search: Dict):
+        """
+        국소 탐색: 끼니마다 음식 교체/제거/추가 중 하루 비용을 가장 많이 줄이는 이동 적용
+        
+        개선이 없거나 최대 반복 횟수, 시간 예산에 도달하면 멈춥니다.
+        """
+        pool_matrix, _ = pool
+        calories = pool_matrix[:, NUTRIENT_KEYS.index('calories')]
+        day_totals = np.zeros((days, len(NUTRIENT_KEYS)))
+        for slot, dishes in enumerate(plan):
+            day_totals[slot // len(MEAL_SLOTS)] += pool_matrix[dishes].sum(axis=0)
+        
+        for _ in range(self.MAX_SWEEPS):
+            search['sweeps'] += 1
+            improved = False
+            
+            for slot, dishes in enumerate(plan):
+                if time.perf_counter() > deadline:
+                    search['time_budget_exceeded'] = True
+                    return
+                
+                day, meal = divmod(slot, len(MEAL_SLOTS))
+                meal_calories = float(calories[dishes].sum())
+                current = (objective.day_cost(day_totals[day])
+                           + objective.meal_cost(meal_calories, meal))
+                
+                best_cost, best_move = current - self.EPSILON, None
+                
+                # 교체/제거: 음식 하나를 빼고 다른 후보로 바꾸거나 빼기만 함
+                for position, old in enumerate(dishes):
+                    others = dishes[:position] + dishes[position + 1:]
+                    base_total = day_totals[day] - pool_matrix[old]
+                    base_calories = meal_calories - calories[old]
+                    
+                    allowed = self._allowed_candidates(plan, slot, others, pool, window, keep=old)
+                    allowed[old] = False
+                    if allowed.any():
+                        costs = (objective.day_cost(base_total + pool_matrix)
+                                 + objective.meal_cost(base_calories + calories, meal))
+                        costs[~allowed] = np.inf
+                        candidate = int(np.argmin(costs))
+                        if costs[candidate] < best_cost:
+                            best_cost, best_move = costs[candidate], ('replace', position, candidate)
+                    
+                    if others:
+                        cost = objective.day_cost(base_total) + objective.meal_cost(base_calories, meal)
+                        if cost < best_cost:
+                            best_cost, best_move = cost, ('remove', position, None)
+                
+                # 추가
+                if len(dishes) < self.MAX_DISHES_PER_MEAL:
+                    allowed = self._allowed_candidates(plan, slot, dishes, pool, window)
+                    if allowed.any():
+                        costs = (objective.day_cost(day_totals[day] + pool_matrix)
+                                 + objective.meal_cost(meal_calories + calories, meal))
+                        costs[~allowed] = np.inf
+                        candidate = int(np.argmin(costs))
+                        if costs[candidate] < best_cost:
+                            best_cost, best_move = costs[candidate], ('add', None, candidate)
+                
+                if best_move is None:
+                    continue
+                
+                move, position, candidate = best_move
+                if move in ('replace', 'remove'):
+                    day_totals[day] -= pool_matrix[dishes[position]]
+                    del dishes[position]
+                if move in ('replace', 'add'):
+                    dishes.append(candidate)
+                    day_totals[day] += pool_matrix[candidate]
+                
+                search['moves'] += 1
+                improved = True
+            
+            if not improved:
+                return
+    
+    def _allowed_candidates(self, plan: List[List[int]], slot: int, others: List[int],
+                            pool: Tuple[np.ndarray, np.ndarray], window: int,
+                            keep: Optional[int] = None) -> np.ndarray:
+        """
+        이 끼니에 넣을 수 있는 후보 마스크
+        
+        앞뒤 window-1끼 안에 나온 음식(이 끼니 포함)은 제외하고, 끼니의 다른 음식과
+        합쳐 분류별 최대 개수를 넘는 후보도 제외합니다.
+        
+        Args:
+            others: 이 끼니에 남아 있는 음식
+            keep: 바꾸려는 음식 (이 자리에만 있으므로 반복 검사에서 제외)
+        """
+        _, pool_codes = pool
+        banned = np.zeros(len(pool_codes), dtype=bool)
+        for other_slot in range(max(0, slot - window + 1), min(len(plan), slot + window)):
+            banned[plan[other_slot]] = True
+        if keep is not None:
+            banned[keep] = False
+        
+        counts = np.bincount(pool_codes[others], minlength=len(MEAL_CATEGORIES))
+        limits = np.array([self.CATEGORY_LIMITS[category] for category in MEAL_CATEGORIES])
+        return ~banned & (counts < limits)[pool_codes]
+    
+    def _format_day(self, day: int, plan: List[List[int]], pool: Tuple[np.ndarray, np.ndarray],
+                    pool_rows: np.ndarray, food_names: List[str],
+                    objective: _PlanObjective, targets: Dict[str, float]) -> Dict:
+        """하루 식단 응답 형식으로 변환"""
+        pool_matrix, pool_codes = pool
+        meals = []
+        day_total = np.zeros(len(NUTRIENT_KEYS))
+        
+        for meal, meal_type in enumerate(MEAL_SLOTS):
+            dishes = sorted(plan[day * len(MEAL_SLOTS) + meal], key=lambda d: (pool_codes[d], d))
+            meal_total = pool_matrix[dishes].sum(axis=0)
+            day_total += meal_total
+            meals.append({
+                'meal_type': meal_type,
+                'meal_name': MEAL_SLOT_NAMES[meal_type],
+                'foods': [
+                    {
+                        'food_name': food_names[pool_rows[dish]],
+                        'category': MEAL_CATEGORIES[pool_codes[dish]],
+                        'category_name': MEAL_CATEGORY_NAMES[MEAL_CATEGORIES[pool_codes[dish]]]
+                    }
+                    for dish in dishes
+                ],
+                'total_nutrition': {
+                    nutrient: round(float(value), 1) for nutrient, value in zip(NUTRIENT_KEYS, meal_total)
+                }
+            })
+        
+        total_nutrition = {
+            nutrient: round(float(value), 1) for nutrient, value in zip(NUTRIENT_KEYS, day_total)
+        }
+        return {
+            'day': day + 1,
+            'meals': meals,
+            'total_nutrition': total_nutrition,
+            'percentages': self.nutrition_calculator.calculate_nutrition_percentage(
+                total_nutrition, targets
+            ),
+            'within_tolerance': bool((objective.deviations(day_total) <= objective.tolerance + 1e-9).all())
+        }
+    
+    def _summarize(self, formatted_days: List[Dict], window: int) -> Dict:
+        """식단 요약 (목표 달성 일수, 사용한 음식 수, 적용한 제약)"""
+        foods = {
+            food['food_name']
+            for day in formatted_days for meal in day['meals'] for food in meal['foods']
+        }
+        return {
+            'days_within_tolerance': sum(day['within_tolerance'] for day in formatted_days),
+            'unique_foods': len(foods),
+            'tolerance': self.TOLERANCE,
+            'variety_window': window
+        }
+
+_meal_plan_cache = None
+_meal_plan_cache_lock = threading.Lock()
+
+def get_meal_plan_cache() -> RecommendationResultCache:
+    """식단 계획 캐시 싱글톤 반환 (프로필 목표, 식이 제한, 카탈로그 세대 기준)"""
+    global _meal_plan_cache
+    if _meal_plan_cache is None:
+        with _meal_plan_cache_lock:
+            if _meal_plan_cache is None:
+                _meal_plan_cache = RecommendationResultCache(
+                    namespace='meal_plan', memory_entries=256, shared_entries=2000
+                )
+    return _meal_plan_cache
@@ -0,0 +1,154 @@
+"""
+영양소 벡터 최근접 이웃 검색 ("남은 필요량과 가장 가까운 음식")
+
+질의마다 영양소 가중치(우선순위, 목표 기준 정규화)가 바뀌므로 트리 색인 대신
+정확한 전체 스캔을 사용합니다. 가중 거리 ||x - q||² = Σw·x² - 2Σw·x·q + Σw·q² 에서
+x²는 카탈로그 세대별로 미리 계산해 두고, 질의는 행렬-벡터 곱 두 번으로 처리합니다.
+"""
+
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from services.nutrition_data_service import get_nutrition_data_service
+
+class NutrientNeighborIndex:
+    """영양소 벡터 최근접 이웃 색인 (카탈로그 한 세대분, 읽기 전용)"""
+    
+    # 근사 거리로 고른 뒤 정확한 거리로 다시 정렬할 여유 후보 수
+    RERANK_MARGIN = 8
+    
+    def __init__(self, food_names: List[str], nutrient_matrix: np.ndarray, food_index: Dict[str, int]):
+        self.food_names = food_names
+        self.food_index = food_index
+        self.matrix = nutrient_matrix
+        self.squared = np.square(nutrient_matrix)
+    
+    def __len__(self):
+        return len(self.food_names)
+    
+    def nearest(self, query: np.ndarray, weights: np.ndarray, k: int,
+                exclude: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        가중 거리 기준 k개 최근접 음식
+        
+        Args:
+            query: 질의 영양소 벡터 (열 순서: NUTRIENT_KEYS)
+            weights: 영양소별 가중치 (0이면 해당 영양소 무시)
+            k: 반환 개수
+            exclude: 제외할 음식 마스크 (True면 제외)
+        
+        Returns:
+            (행 번호, 거리) 목록 (거리 오름차순, 동점이면 카탈로그 순서)
+        """
+        if k <= 0 or len(self) == 0:
+            return []
+        
+        distances, _ = self._approximate_distances(query, weights, exclude)
+        candidate_count = min(k + self.RERANK_MARGIN, len(distances))
+        if candidate_count < len(distances):
+            rows = np.argpartition(distances, candidate_count - 1)[:candidate_count]
+        else:
+            rows = np.arange(len(distances))
+        rows = rows[np.isfinite(distances[rows])]
+        
+        return self._rank(rows, query, weights)[:k]
+    
+    def within_radius(self, query: np.ndarray, weights: np.ndarray, radius: float,
+                      exclude: Optional[np.ndarray] = None,
+                      limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        가중 거리가 radius 이하인 음식
+        
+        Args:
+            query: 질의 영양소 벡터
+            weights: 영양소별 가중치
+            radius: 최대 거리
+            exclude: 제외할 음식 마스크
+            limit: 최대 반환 개수 (None이면 전부)
+        
+        Returns:
+            (행 번호, 거리) 목록 (거리 오름차순)
+        """
+        if radius < 0 or len(self) == 0:
+            return []
+        
+        distances, scale = self._approximate_distances(query, weights, exclude)
+        # 근사 거리의 반올림 오차를 감안해 조금 넓게 고른 뒤 정확한 거리로 확인
+        rows = np.flatnonzero(distances <= radius * radius + 1e-9 * (1.0 + scale))
+        
+        results = [(row, distance) for row, distance in self._rank(rows, query, weights)
+                   if distance <= radius]
+        return results if limit is None else results[:limit]
+    
+    def exclusion_mask(self, food_names: Iterable[str] = (),
+                       restriction_mask: int = 0) -> Optional[np.ndarray]:
+        """
+        제외 음식명과 식이 제한으로 제외 마스크 생성
+        
+        Args:
+            food_names: 제외할 음식명
+            restriction_mask: 프로필 식이 제한의 제외 태그 마스크
+        
+        Returns:
+            제외할 음식 마스크 (제외할 음식이 없으면 None)
+        """
+        mask = None
+        if restriction_mask:
+            mask = get_nutrition_data_service().get_restricted_food_mask(
+                self.food_names, restriction_mask
+            )
+        
+        for food_name in food_names:
+            row = self.food_index.get(food_name)
+            if row is not None:
+                if mask is None:
+                    mask = np.zeros(len(self), dtype=bool)
+                mask[row] = True
+        
+        return mask
+    
+    def _approximate_distances(self, query: np.ndarray, weights: np.ndarray,
+                               exclude: Optional[np.ndarray]) -> Tuple[np.ndarray, float]:
+        """
+        전체 음식의 가중 거리 제곱 (제외 음식은 inf)
+        
+        Returns:
+            (거리 제곱 배열, 반올림 오차 기준 크기) 튜플
+        """
+        row_norms = self.squared @ weights
+        query_norm = float(np.dot(weights, np.square(query)))
+        
+        distances = row_norms - 2.0 * (self.matrix @ (weights * query))
+        distances += query_norm
+        np.maximum(distances, 0.0, out=distances)
+        
+        if exclude is not None:
+            distances[exclude] = np.inf
+        scale = query_norm + (float(row_norms.max()) if len(row_norms) else 0.0)
+        return distances, scale
+    
+    def _rank(self, rows: np.ndarray, query: np.ndarray, weights: np.ndarray) -> List[Tuple[int, float]]:
+        """선택한 행의 정확한 가중 거리 계산 후 정렬"""
+        if len(rows) == 0:
+            return []
+        
+        distances = np.sqrt(np.square(self.matrix[rows] - query) @ weights)
+        order = np.lexsort((rows, distances))
+        return [(int(rows[i]), float(distances[i])) for i in order]
+
+_neighbor_index = None
+_neighbor_index_lock = threading.Lock()
+
+def get_nutrient_neighbor_index() -> NutrientNeighborIndex:
+    """현재 카탈로그 세대의 최근접 이웃 색인 반환 (세대가 바뀌면 다시 만듦)"""
+    global _neighbor_index
+    
+    food_names, nutrient_matrix, food_index = get_nutrition_data_service().get_nutrient_matrix()
+    index = _neighbor_index
+    if index is not None and index.food_names is food_names:
+        return index
+    
+    with _neighbor_index_lock:
+        if _neighbor_index is None or _neighbor_index.food_names is not food_names:
+            _neighbor_index = NutrientNeighborIndex(food_names, nutrient_matrix, food_index)
+        return _neighbor_index
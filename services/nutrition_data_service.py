@@ -4,29 +4,176 @@
 
 import os
 import json
+import time
+import uuid
+import hashlib
+import sqlite3
 import logging
-from typing import Dict, Optional, List
-from utils.nutrition_utils import validate_nutrition_data, normalize_nutrition_data
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
+from utils.nutrition_utils import (
+    validate_nutrition_data, normalize_nutrition_data, NutritionRecord, NUTRIENT_KEYS
+)
+from utils.catalog_ingest_utils import load_compiled_catalog
+from utils.dietary_tag_utils import detect_dietary_tags
+from utils.error_handler import get_error_handler
+from services.shared_catalog_service import SharedCatalogStore
+
+# orjson이 설치되어 있으면 더 빠른 JSON 파서 사용 (선택 의존성)
+try:
+    import orjson
+    json_loads = orjson.loads
+    JSON_PARSER = 'orjson'
+except ImportError:
+    json_loads = json.loads
+    JSON_PARSER = 'json'
+
+# 로딩 단계별 소요 시간 집계 항목
+LOAD_PHASES = ('listdir', 'read', 'parse', 'validate', 'normalize')
 
 class NutritionDataService:
     """영양 데이터 관리 서비스"""
     
+    # 누락 음식 네거티브 캐시 설정
+    NEGATIVE_CACHE_TTL = float(os.getenv('NUTRITION_NEGATIVE_CACHE_TTL', '300'))  # 초
+    NEGATIVE_CACHE_MAX_ENTRIES = 1024
+    
+    # 파일 병렬 로딩 스레드 수 (기본: CPU 수 + 4, 최대 32)
+    LOADER_WORKERS = int(os.getenv('NUTRITION_LOADER_WORKERS', str(min(32, (os.cpu_count() or 1) + 4))))
+    
     def __init__(self, data_directory: str = 'data/nutrition'):
         """
         Args:
             data_directory: 영양 데이터 JSON 파일들이 저장된 디렉토리
         """
         self.data_directory = data_directory
+        # ingest_catalog.py로 만든 컴파일된 카탈로그 (있으면 개별 파일보다 먼저 로딩)
+        self.compiled_catalog_path = os.getenv(
+            'NUTRITION_COMPILED_CATALOG',
+            os.path.join(os.path.dirname(data_directory), 'nutrition_catalog.json')
+        )
         self.nutrition_cache = {}  # 메모리 캐시
+        self.negative_cache = {}  # 누락 음식명 -> (만료 시각, 대체 데이터)
+        self.miss_counts = {}  # 누락 음식명별 조회 횟수 (운영 모니터링용)
         self.last_loaded = None
+        self.generation = 0  # 공유 카탈로그 세대 번호
+        self.fingerprint = ''  # 카탈로그 지문 (저장소 ID + 데이터 디렉토리 지문, 세대와 함께 캐시 버전에 사용)
+        self._local_store_id = uuid.uuid4().hex  # 공유 저장소가 없을 때의 프로세스별 저장소 ID
+        self.last_load_statistics = None  # 마지막 파일 로딩 단계별 소요 시간
+        self._nutrient_matrix = None  # (세대 번호, 음식명 목록, 영양소 행렬, 음식명 -> 행 번호)
+        self._food_ids = None  # (세대 번호, 음식명 -> 고정 ID, 고정 ID -> 음식명)
+        self.catalog_store = self._open_catalog_store()
+        
+        # 초기 데이터 로딩 (같은 파일을 이미 다른 워커가 올려두었다면 공유 카탈로그 사용,
+        # 동시에 시작한 워커끼리는 먼저 게시한 워커의 카탈로그를 사용)
+        started = time.perf_counter()
+        if not self._load_current_shared_catalog():
+            self.reload_nutrition_data(skip_if_current=True)
+        logging.info(
+            f"영양 카탈로그 준비 완료: {len(self.nutrition_cache)}개, "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+    
+    def _open_catalog_store(self) -> Optional[SharedCatalogStore]:
+        """공유 카탈로그 저장소 열기 (실패 시 워커 로컬 캐시만 사용)"""
+        try:
+            return SharedCatalogStore()
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"공유 카탈로그를 사용할 수 없어 로컬 캐시만 사용합니다: {str(e)}")
+            return None
+    
+    def _get_directory_fingerprint(self) -> str:
+        """데이터 디렉토리 지문 (파일명/크기/수정시각 기반)"""
+        digest = hashlib.sha1()
+        
+        for filename in sorted(os.listdir(self.data_directory)):
+            if filename.endswith('.json'):
+                stat = os.stat(os.path.join(self.data_directory, filename))
+                digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+        
+        if os.path.exists(self.compiled_catalog_path):
+            stat = os.stat(self.compiled_catalog_path)
+            digest.update(f"compiled:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+        
+        return digest.hexdigest()
+    
+    def _load_current_shared_catalog(self) -> bool:
+        """
+        공유 카탈로그가 현재 데이터 디렉토리와 일치하면 파일을 다시 읽지 않고 사용
+        
+        Returns:
+            공유 카탈로그 사용 여부
+        """
+        if self.catalog_store is None or not os.path.exists(self.data_directory):
+            return False
+        
+        try:
+            if self.catalog_store.get_generation() == 0:
+                return False
+            if self.catalog_store.get_meta('fingerprint') != self._get_directory_fingerprint():
+                return False
+            
+            generation, records = self.catalog_store.load_all()
+        except (sqlite3.Error, OSError) as e:
+            logging.error(f"공유 카탈로그 조회 실패: {str(e)}")
+            return False
+        
+        self._apply_catalog(generation, records)
+        logging.info(f"공유 카탈로그 사용: {len(records)}개, 세대 {generation}")
+        return True
+    
+    def _apply_catalog(self, generation: int, records: Dict[str, NutritionRecord]):
+        """공유 카탈로그 스냅샷을 워커 메모리에 반영"""
+        self.nutrition_cache = records
+        self.generation = generation
+        
+        # 카탈로그가 바뀌므로 누락 캐시 무효화
+        self.negative_cache.clear()
+        
+        if self.catalog_store is not None:
+            store_id = self.catalog_store.get_meta('store_id') or ''
+            directory_fingerprint = self.catalog_store.get_meta('fingerprint') or ''
+        else:
+            store_id = self._local_store_id
+            directory_fingerprint = self._get_directory_fingerprint()
+        self.fingerprint = hashlib.sha1(f"{store_id}:{directory_fingerprint}".encode('utf-8')).hexdigest()[:16]
+        
+        last_loaded = self.catalog_store.get_meta('last_loaded') if self.catalog_store else None
+        self.last_loaded = datetime.fromtimestamp(float(last_loaded)) if last_loaded else datetime.now()
+    
+    def sync_with_shared_catalog(self) -> bool:
+        """
+        다른 워커의 재로딩/추가 반영 (요청마다 세대 번호만 확인)
+        
+        Returns:
+            카탈로그 갱신 여부
+        """
+        if self.catalog_store is None:
+            return False
+        
+        try:
+            generation = self.catalog_store.get_generation()
+            if generation == self.generation:
+                return False
+            
+            generation, records = self.catalog_store.load_all()
+        except sqlite3.Error as e:
+            logging.error(f"공유 카탈로그 동기화 실패: {str(e)}")
+            return False
         
-        # 초기 데이터 로딩
-        self.reload_nutrition_data()
+        self._apply_catalog(generation, records)
+        logging.info(f"공유 카탈로그 변경 반영: {len(records)}개, 세대 {generation}")
+        return True
     
-    def reload_nutrition_data(self) -> bool:
+    def reload_nutrition_data(self, skip_if_current: bool = False) -> bool:
         """
         영양 데이터 파일들을 다시 로딩
         
+        Args:
+            skip_if_current: 공유 카탈로그가 이미 같은 파일로 게시되어 있으면 교체하지 않음
+        
         Returns:
             로딩 성공 여부
         """
@@ -35,51 +182,147 @@ class NutritionDataService:
                 logging.warning(f"영양 데이터 디렉토리가 존재하지 않습니다: {self.data_directory}")
                 return False
             
+            started = time.perf_counter()
+            phase_times = dict.fromkeys(LOAD_PHASES, 0.0)
             loaded_count = 0
             error_count = 0
+            loaded_records = self._load_compiled_catalog()
+            
+            # 디렉토리 내 모든 JSON 파일 스캔 (같은 음식명은 개별 파일 우선)
+            listdir_started = time.perf_counter()
+            filenames = sorted(
+                filename for filename in os.listdir(self.data_directory)
+                if filename.endswith('.json')
+            )
+            phase_times['listdir'] = time.perf_counter() - listdir_started
+            
+            # 파일 읽기/파싱을 스레드 풀로 분산 (결과는 파일명 순서대로 반영)
+            workers = max(1, min(self.LOADER_WORKERS, len(filenames)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nutrition-loader') as executor:
+                results = list(executor.map(self._load_file_entry, filenames))
+            
+            for food_name, nutrition_data, timings in results:
+                for phase, elapsed in timings.items():
+                    phase_times[phase] += elapsed
+                
+                if nutrition_data:
+                    loaded_records[food_name] = nutrition_data
+                    loaded_count += 1
+                else:
+                    error_count += 1
+            
+            total_ms = (time.perf_counter() - started) * 1000
+            # read~normalize는 스레드별 소요 시간의 합계
+            self.last_load_statistics = {
+                'files': len(filenames),
+                'loaded': loaded_count,
+                'failed': error_count,
+                'workers': workers,
+                'json_parser': JSON_PARSER,
+                'total_ms': round(total_ms, 2),
+                'phase_ms': {phase: round(elapsed * 1000, 2) for phase, elapsed in phase_times.items()}
+            }
+            
+            phase_summary = ', '.join(
+                f"{phase} {elapsed * 1000:.1f}ms" for phase, elapsed in phase_times.items()
+            )
+            logging.info(
+                f"영양 데이터 로딩 완료: {loaded_count}개 성공, {error_count}개 실패 "
+                f"({total_ms:.1f}ms, 스레드 {workers}개, {JSON_PARSER}; {phase_summary})"
+            )
+            
+            self._publish_file_records(loaded_records, skip_if_current)
             
-            # 디렉토리 내 모든 JSON 파일 스캔
-            for filename in os.listdir(self.data_directory):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(self.data_directory, filename)
-                    food_name = os.path.splitext(filename)[0]  # 확장자 제거
-                    
-                    try:
-                        nutrition_data = self._load_single_file(file_path)
-                        if nutrition_data:
-                            self.nutrition_cache[food_name] = nutrition_data
-                            loaded_count += 1
-                        else:
-                            error_count += 1
-                            
-                    except Exception as e:
-                        logging.error(f"파일 로딩 실패 {filename}: {str(e)}")
-                        error_count += 1
-            
-            logging.info(f"영양 데이터 로딩 완료: {loaded_count}개 성공, {error_count}개 실패")
-            
-            from datetime import datetime
-            self.last_loaded = datetime.now()
-            
-            return loaded_count > 0
+            return len(loaded_records) > 0
             
         except Exception as e:
             logging.error(f"영양 데이터 로딩 중 오류 발생: {str(e)}")
             return False
     
-    def _load_single_file(self, file_path: str) -> Optional[Dict]:
+    def _load_compiled_catalog(self) -> Dict[str, NutritionRecord]:
+        """
+        컴파일된 카탈로그 로딩 (없거나 읽을 수 없으면 빈 카탈로그)
+        
+        Returns:
+            음식명 -> 영양 레코드
+        """
+        if not os.path.exists(self.compiled_catalog_path):
+            return {}
+        
+        try:
+            foods = load_compiled_catalog(self.compiled_catalog_path)
+        except (OSError, ValueError) as e:
+            logging.error(f"컴파일된 카탈로그 로딩 실패 {self.compiled_catalog_path}: {str(e)}")
+            return {}
+        
+        records = {name: NutritionRecord.from_dict(food) for name, food in foods.items()}
+        logging.info(f"컴파일된 카탈로그 로딩 완료: {len(records)}개")
+        return records
+    
+    def _publish_file_records(self, loaded_records: Dict[str, NutritionRecord],
+                              skip_if_current: bool = False):
+        """파일에서 읽은 카탈로그를 공유 저장소에 게시하고 모든 워커에 알림"""
+        if self.catalog_store is not None:
+            try:
+                # 교체하지 않은 경우에도 저장소의 현재 카탈로그를 반영
+                self.catalog_store.replace_file_records(
+                    loaded_records, self._get_directory_fingerprint(), skip_if_current
+                )
+                generation, records = self.catalog_store.load_all()
+                self._apply_catalog(generation, records)
+                return
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"공유 카탈로그 게시 실패, 로컬 캐시만 갱신합니다: {str(e)}")
+        
+        # 공유 저장소가 없으면 워커 로컬 캐시만 갱신 (런타임 추가 데이터 유지)
+        records = dict(self.nutrition_cache)
+        records.update(loaded_records)
+        self._apply_catalog(self.generation + 1, records)
+    
+    def _load_file_entry(self, filename: str) -> Tuple[str, Optional[NutritionRecord], Dict[str, float]]:
+        """
+        스레드 풀 작업: 단일 파일 로딩
+        
+        Args:
+            filename: 데이터 디렉토리 내 파일명
+            
+        Returns:
+            (음식명, 영양 레코드 또는 None, 단계별 소요 시간)
+        """
+        food_name = os.path.splitext(filename)[0]  # 확장자 제거
+        timings = {}
+        
+        try:
+            nutrition_data = self._load_single_file(os.path.join(self.data_directory, filename), timings)
+        except Exception as e:
+            logging.error(f"파일 로딩 실패 {filename}: {str(e)}")
+            nutrition_data = None
+        
+        return food_name, nutrition_data, timings
+    
+    def _load_single_file(self, file_path: str,
+                          timings: Optional[Dict[str, float]] = None) -> Optional[NutritionRecord]:
         """
         단일 JSON 파일 로딩
         
         Args:
             file_path: JSON 파일 경로
+            timings: 단계별 소요 시간(초)을 기록할 딕셔너리
             
         Returns:
-            정규화된 영양 데이터 또는 None
+            정규화된 영양 레코드 또는 None
         """
+        if timings is None:
+            timings = {}
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            checkpoint = time.perf_counter()
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            checkpoint = self._record_phase(timings, 'read', checkpoint)
+            
+            raw_data = json_loads(content)
+            checkpoint = self._record_phase(timings, 'parse', checkpoint)
             
             # JSON 구조 검증
             if 'data' not in raw_data or 'food_info' not in raw_data['data']:
@@ -95,8 +338,10 @@ class NutritionDataService:
             raw_nutrition = food_info['nutrition']
             
             # 영양 데이터 유효성 검증
-            if not validate_nutrition_data(raw_nutrition):
-                from utils.error_handler import get_error_handler
+            is_valid = validate_nutrition_data(raw_nutrition)
+            checkpoint = self._record_phase(timings, 'validate', checkpoint)
+            
+            if not is_valid:
                 error_handler = get_error_handler()
                 food_name = os.path.splitext(os.path.basename(file_path))[0]
                 result = error_handler.handle_validation_error(food_name, ["필수 영양소 필드 누락"])
@@ -105,46 +350,67 @@ class NutritionDataService:
             # 데이터 정규화
             normalized_nutrition = normalize_nutrition_data(raw_nutrition)
             
-            # 추가 메타데이터 포함
-            result = {
-                'name': food_info.get('name', ''),
-                'serving_size': raw_nutrition.get('g', 100),  # 1회 제공량 (g)
-                'nutrition': normalized_nutrition
-            }
-            
-            return result
+            # 추가 메타데이터 포함 (원재료/알레르기 정보가 있으면 태그에 반영)
+            record = NutritionRecord(
+                name=food_info.get('name', ''),
+                serving_size=raw_nutrition.get('g', 100),  # 1회 제공량 (g)
+                nutrition=normalized_nutrition,
+                dietary_tags=detect_dietary_tags(
+                    food_info.get('name') or os.path.splitext(os.path.basename(file_path))[0],
+                    food_info.get('ingredients'),
+                    food_info.get('allergens')
+                )
+            )
+            self._record_phase(timings, 'normalize', checkpoint)
+            return record
             
         except json.JSONDecodeError as e:
-            from utils.error_handler import get_error_handler
+            # orjson.JSONDecodeError도 json.JSONDecodeError의 하위 클래스
             error_handler = get_error_handler()
             result = error_handler.handle_parsing_error(file_path, e)
             return result['data'] if result else None
         except Exception as e:
-            from utils.error_handler import get_error_handler
             error_handler = get_error_handler()
             result = error_handler.handle_parsing_error(file_path, e)
             return result['data'] if result else None
     
-    def get_nutrition_data(self, food_name: str) -> Optional[Dict]:
+    @staticmethod
+    def _record_phase(timings: Dict[str, float], phase: str, since: float) -> float:
+        """단계 소요 시간 기록 후 현재 시각 반환"""
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + (now - since)
+        return now
+    
+    def get_nutrition_data(self, food_name: str) -> Optional[NutritionRecord]:
         """
         특정 음식의 영양 데이터 조회
         
+        반환되는 레코드는 불변 객체로 캐시와 공유되므로 복사하지 않습니다.
+        
         Args:
             food_name: 음식명
             
         Returns:
-            영양 데이터 또는 None
+            영양 레코드 또는 None
         """
         # 캐시에서 먼저 확인
-        if food_name in self.nutrition_cache:
-            return self.nutrition_cache[food_name].copy()
+        record = self.nutrition_cache.get(food_name)
+        if record is not None:
+            return record
+        
+        # 최근에 누락으로 확인된 음식은 카탈로그 전체 비교/파일 확인/알림 없이 대체 데이터 반환
+        # (카탈로그가 바뀌면 네거티브 캐시가 비워지므로 먼저 확인해도 안전)
+        negative_entry = self._get_negative_cache_entry(food_name)
+        if negative_entry is not None:
+            self._record_miss(food_name)
+            return negative_entry
         
         # 파일명 매칭 시도 (대소문자 무시, 공백 처리)
         normalized_name = food_name.strip()
         
         for cached_name, data in self.nutrition_cache.items():
             if cached_name.strip().lower() == normalized_name.lower():
-                return data.copy()
+                return data
         
         # 파일이 존재하는지 확인하고 동적 로딩 시도
         potential_filename = f"{food_name}.json"
@@ -154,15 +420,77 @@ class NutritionDataService:
             logging.info(f"동적 로딩 시도: {food_name}")
             nutrition_data = self._load_single_file(file_path)
             if nutrition_data:
-                self.nutrition_cache[food_name] = nutrition_data
-                return nutrition_data.copy()
+                self._store_record(food_name, nutrition_data, source='file')
+                return nutrition_data
         
         # 오류 처리기를 통해 누락 데이터 처리
-        from utils.error_handler import get_error_handler
         error_handler = get_error_handler()
         result = error_handler.handle_missing_data(food_name)
+        
+        self._record_miss(food_name)
+        self._store_negative_cache_entry(food_name, result['data'])
         return result['data']
     
+    def _get_negative_cache_entry(self, food_name: str) -> Optional[NutritionRecord]:
+        """
+        네거티브 캐시 조회 (만료된 항목은 제거)
+        
+        Args:
+            food_name: 음식명
+            
+        Returns:
+            캐시된 대체 데이터 또는 None
+        """
+        entry = self.negative_cache.get(food_name)
+        if entry is None:
+            return None
+        
+        expires_at, fallback_data = entry
+        if expires_at <= time.monotonic():
+            del self.negative_cache[food_name]
+            return None
+        
+        return fallback_data
+    
+    def _store_negative_cache_entry(self, food_name: str, fallback_data: NutritionRecord):
+        """네거티브 캐시에 누락 음식 등록 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+        if self.NEGATIVE_CACHE_TTL <= 0:
+            return
+        
+        self.negative_cache.pop(food_name, None)
+        while len(self.negative_cache) >= self.NEGATIVE_CACHE_MAX_ENTRIES:
+            del self.negative_cache[next(iter(self.negative_cache))]
+        
+        self.negative_cache[food_name] = (
+            time.monotonic() + self.NEGATIVE_CACHE_TTL,
+            fallback_data
+        )
+    
+    def _record_miss(self, food_name: str):
+        """누락 음식 조회 횟수 기록"""
+        if food_name not in self.miss_counts and len(self.miss_counts) >= self.NEGATIVE_CACHE_MAX_ENTRIES:
+            # 가장 적게 조회된 항목을 밀어내고 새 항목 기록
+            least_missed = min(self.miss_counts, key=self.miss_counts.get)
+            del self.miss_counts[least_missed]
+        
+        self.miss_counts[food_name] = self.miss_counts.get(food_name, 0) + 1
+    
+    def get_miss_statistics(self) -> Dict:
+        """
+        누락 음식 조회 통계 반환
+        
+        Returns:
+            음식명별 누락 횟수와 네거티브 캐시 상태
+        """
+        return {
+            'negative_cache_size': len(self.negative_cache),
+            'negative_cache_ttl': self.NEGATIVE_CACHE_TTL,
+            'total_misses': sum(self.miss_counts.values()),
+            'miss_counts': dict(
+                sorted(self.miss_counts.items(), key=lambda item: item[1], reverse=True)
+            )
+        }
+    
     def get_available_foods(self) -> List[str]:
         """
         사용 가능한 음식 목록 반환
@@ -172,6 +500,101 @@ class NutritionDataService:
         """
         return list(self.nutrition_cache.keys())
     
+    def get_nutrient_matrix(self) -> Tuple[List[str], np.ndarray, Dict[str, int]]:
+        """
+        카탈로그 전체 영양소 행렬 반환 (카탈로그 세대별로 한 번만 생성)
+        
+        Returns:
+            (음식명 목록, 영양소 행렬[음식 x NUTRIENT_KEYS], 음식명 -> 행 번호) 튜플
+            행렬은 여러 요청이 공유하므로 읽기 전용입니다.
+        """
+        cached = self._nutrient_matrix
+        if cached is not None and cached[0] == self.generation:
+            return cached[1], cached[2], cached[3]
+        
+        generation = self.generation
+        catalog = self.nutrition_cache  # 교체될 수 있으므로 스냅샷 사용
+        food_names = list(catalog.keys())
+        
+        matrix = np.zeros((len(food_names), len(NUTRIENT_KEYS)), dtype=float)
+        for row, record in enumerate(catalog.values()):
+            nutrition = record['nutrition']
+            matrix[row] = [nutrition.get(nutrient, 0) for nutrient in NUTRIENT_KEYS]
+        matrix.setflags(write=False)
+        
+        food_index = {food_name: row for row, food_name in enumerate(food_names)}
+        dietary_tags = self._build_dietary_tag_array(food_names, catalog)
+        self._nutrient_matrix = (generation, food_names, matrix, food_index, dietary_tags)
+        return food_names, matrix, food_index
+    
+    def get_food_ids(self) -> Tuple[Dict[str, int], Dict[int, str]]:
+        """
+        음식명 <-> 공유 카탈로그 고정 ID 매핑 (카탈로그 세대별로 한 번만 조회)
+        
+        ID는 음식명이 카탈로그에 남아 있는 한 재로딩/워커와 무관하게 유지되므로
+        세션에 음식명 대신 저장할 수 있습니다. 공유 카탈로그가 없으면 빈 매핑입니다.
+        
+        Returns:
+            (음식명 -> ID, ID -> 음식명) 튜플 (읽기 전용으로 사용)
+        """
+        cached = self._food_ids
+        if cached is not None and cached[0] == self.generation:
+            return cached[1], cached[2]
+        
+        generation = self.generation
+        food_ids = {}
+        if self.catalog_store is not None:
+            try:
+                food_ids = self.catalog_store.get_food_ids()
+            except sqlite3.Error as e:
+                logging.error(f"공유 카탈로그 ID 조회 실패: {str(e)}")
+                return {}, {}
+        
+        food_names = {food_id: name for name, food_id in food_ids.items()}
+        self._food_ids = (generation, food_ids, food_names)
+        return food_ids, food_names
+    
+    def get_dietary_tag_array(self, food_names: List[str]) -> np.ndarray:
+        """
+        카탈로그 전체 알레르기/식단 태그 비트셋 배열 (get_nutrient_matrix와 같은 행 순서)
+        
+        Args:
+            food_names: get_nutrient_matrix()가 반환한 음식명 목록
+            
+        Returns:
+            음식별 태그 비트셋 배열 (읽기 전용)
+        """
+        cached = self._nutrient_matrix
+        if cached is not None and cached[1] is food_names:
+            return cached[4]
+        
+        # 그 사이 카탈로그가 바뀐 경우 받은 음식명 목록 기준으로 생성
+        return self._build_dietary_tag_array(food_names, self.nutrition_cache)
+    
+    def get_restricted_food_mask(self, food_names: List[str], restriction_mask: int) -> np.ndarray:
+        """
+        식이 제한에 걸리는 음식 마스크 (태그 배열과 제한 마스크의 비트 AND 한 번)
+        
+        Args:
+            food_names: get_nutrient_matrix()가 반환한 음식명 목록
+            restriction_mask: compile_restriction_mask()로 만든 제외 태그 마스크
+            
+        Returns:
+            제외할 음식 마스크 (True면 제외)
+        """
+        dietary_tags = self.get_dietary_tag_array(food_names)
+        return (dietary_tags & np.uint64(restriction_mask)) != 0
+    
+    @staticmethod
+    def _build_dietary_tag_array(food_names: List[str], catalog: Dict[str, NutritionRecord]) -> np.ndarray:
+        """음식명 목록 순서의 태그 비트셋 배열 (카탈로그에 없는 음식은 0)"""
+        dietary_tags = np.fromiter(
+            (getattr(catalog.get(food_name), 'dietary_tags', 0) for food_name in food_names),
+            dtype=np.uint64, count=len(food_names)
+        )
+        dietary_tags.setflags(write=False)
+        return dietary_tags
+    
     def get_cache_info(self) -> Dict:
         """
         캐시 정보 반환
@@ -182,7 +605,11 @@ class NutritionDataService:
         return {
             'cached_foods_count': len(self.nutrition_cache),
             'last_loaded': self.last_loaded.isoformat() if self.last_loaded else None,
-            'data_directory': self.data_directory
+            'data_directory': self.data_directory,
+            'negative_cache_size': len(self.negative_cache),
+            'generation': self.generation,
+            'shared_catalog': self.catalog_store is not None,
+            'last_load_statistics': self.last_load_statistics
         }
     
     def add_nutrition_data(self, food_name: str, nutrition_data: Dict) -> bool:
@@ -204,8 +631,8 @@ class NutritionDataService:
             if not validate_nutrition_data(nutrition_data['nutrition']):
                 return False
             
-            # 캐시에 추가
-            self.nutrition_cache[food_name] = nutrition_data.copy()
+            # 캐시에 추가 (불변 레코드로 변환, 공유 카탈로그를 통해 모든 워커에 반영)
+            self._store_record(food_name, NutritionRecord.from_dict(nutrition_data), source='runtime')
             
             logging.info(f"영양 데이터 추가됨: {food_name}")
             return True
@@ -214,7 +641,37 @@ class NutritionDataService:
             logging.error(f"영양 데이터 추가 실패 {food_name}: {str(e)}")
             return False
     
-    def get_fallback_nutrition_data(self, food_name: str) -> Dict:
+    def _store_record(self, food_name: str, record: NutritionRecord, source: str):
+        """
+        단일 레코드를 공유 카탈로그와 워커 캐시에 저장
+        
+        Args:
+            food_name: 음식명
+            record: 영양 레코드
+            source: 데이터 출처 ('file' 또는 'runtime')
+        """
+        previous_generation = self.generation
+        generation = previous_generation + 1
+        
+        if self.catalog_store is not None:
+            try:
+                generation = self.catalog_store.upsert_record(food_name, record, source)
+            except sqlite3.Error as e:
+                logging.error(f"공유 카탈로그 저장 실패 {food_name}: {str(e)}")
+        
+        if generation != previous_generation + 1:
+            # 그 사이 다른 워커의 변경이 있었다면 전체 동기화
+            self.sync_with_shared_catalog()
+            return
+        
+        records = dict(self.nutrition_cache)
+        records[food_name] = record
+        self.nutrition_cache = records
+        self.generation = generation
+        self.negative_cache.pop(food_name, None)
+    
+    @staticmethod
+    def get_fallback_nutrition_data(food_name: str) -> NutritionRecord:
         """
         대체 영양 데이터 생성 (데이터가 없을 때)
         
@@ -226,10 +683,10 @@ class NutritionDataService:
         """
         logging.warning(f"대체 영양 데이터 사용: {food_name}")
         
-        return {
-            'name': food_name,
-            'serving_size': 100,
-            'nutrition': {
+        return NutritionRecord(
+            name=food_name,
+            serving_size=100,
+            nutrition={
                 'calories': 200.0,
                 'carbohydrates': 30.0,
                 'sugars': 5.0,
@@ -240,8 +697,8 @@ class NutritionDataService:
                 'sodium': 500.0,
                 'fiber': 3.0
             },
-            'is_fallback': True
-        }
+            is_fallback=True
+        )
 
 # 전역 인스턴스 (싱글톤 패턴)
 _nutrition_data_service = None
@@ -3,7 +3,8 @@
 """
 
 import math
-from typing import Dict, Tuple
+import numpy as np
+from typing import Dict, List, Mapping, Sequence, Tuple
 
 class NutritionCalculatorService:
     """영양소 계산 서비스"""
@@ -22,6 +23,9 @@ class NutritionCalculatorService:
         'gain': 300      # 체중 증량: +300kcal
     }
     
+    # 목표 대비 비율 구간별 균형 점수 (calculate_nutrition_score와 같은 기준)
+    BALANCE_BAND_SCORES = np.array([10, 40, 70, 100, 70, 40, 10], dtype=np.int64)
+    
     def calculate_bmr(self, age: int, height: float, weight: float, gender: str) -> float:
         """
         기초대사율(BMR) 계산 - Harris-Benedict 공식 사용
@@ -123,6 +127,71 @@ class NutritionCalculatorService:
         
         return percentages
     
+    def calculate_nutrition_percentage_batch(self, nutrition_list: Sequence[Mapping[str, float]],
+                                             targets: Dict[str, float]) -> List[Dict[str, float]]:
+        """
+        여러 음식의 목표 대비 백분율을 한 번에 계산 (calculate_nutrition_percentage의 벡터화 버전)
+        
+        Args:
+            nutrition_list: 음식별 영양소 딕셔너리 목록
+            targets: 목표 섭취량
+            
+        Returns:
+            음식별 백분율 딕셔너리 목록 (입력 순서 유지)
+        """
+        if not nutrition_list:
+            return []
+        
+        nutrients = list(targets.keys())
+        target_values = np.array([targets.get(n, 1) for n in nutrients], dtype=float)
+        values = np.array(
+            [[nutrition.get(n, 0) for n in nutrients] for nutrition in nutrition_list],
+            dtype=float
+        )
+        
+        # 0 이하 목표는 0%로 처리 (0으로 나누기 방지)
+        safe_targets = np.where(target_values > 0, target_values, 1.0)
+        percentages = np.where(target_values > 0, np.round(values / safe_targets * 100, 1), 0.0)
+        
+        return [dict(zip(nutrients, row)) for row in percentages.tolist()]
+    
+    def calculate_nutrition_score_batch(self, nutrition_matrix: np.ndarray,
+                                        targets: Dict[str, float]) -> np.ndarray:
+        """
+        여러 영양 상태의 균형 점수를 한 번에 계산 (calculate_nutrition_score의 벡터화 버전)
+        
+        Args:
+            nutrition_matrix: 행별 영양 상태 (열 순서는 targets의 키 순서)
+            targets: 목표 섭취량
+            
+        Returns:
+            행별 영양소 균형 점수 배열 (calculate_nutrition_score와 같은 값)
+        """
+        target_values = np.array(list(targets.values()), dtype=float)
+        valid = target_values > 0
+        nutrient_count = int(valid.sum())
+        
+        if nutrient_count == 0:
+            return np.zeros(len(nutrition_matrix))
+        
+        ratio = nutrition_matrix[:, valid] / target_values[valid]
+        
+        # 비율 구간: <0.3, [0.3,0.5), [0.5,0.8), [0.8,1.2], (1.2,1.5], (1.5,2.0], >2.0
+        band = np.zeros(ratio.shape, dtype=np.uint8)
+        for threshold in (0.3, 0.5, 0.8):
+            band += ratio >= threshold
+        for threshold in (1.2, 1.5, 2.0):
+            band += ratio > threshold
+        
+        # 최적 비율 (80-120%)에서 최고점
+        nutrient_scores = self.BALANCE_BAND_SCORES[band]
+        total_scores = nutrient_scores.sum(axis=1)
+        
+        # 합계 종류가 적으므로 합계별로 round()를 적용해 스칼라 버전과 같은 반올림 결과 보장
+        unique_totals, inverse = np.unique(total_scores, return_inverse=True)
+        rounded = np.array([round(int(total) / nutrient_count, 1) for total in unique_totals])
+        return rounded[inverse]
+    
     def get_remaining_allowance(self, current: Dict[str, float], 
                               targets: Dict[str, float]) -> Dict[str, float]:
         """
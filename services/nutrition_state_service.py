@@ -0,0 +1,143 @@
+"""
+세션별 영양 상태 (증분 유지)
+
+오늘의 목표 대비 백분율, 남은 허용량, 부족/과잉분, 영양 점수를 세션에 저장해 두고
+식사 기록/삭제 시에는 바뀐 영양소만 다시 계산합니다. 상태가 바뀔 때마다 버전이
+올라가므로 조회는 O(1)이고, 하위 캐시는 버전을 키로 사용할 수 있습니다.
+"""
+
+from flask import session
+from typing import Dict, Iterable
+from services.nutrition_service import NutritionCalculatorService
+from services.intake_service import SessionIntakeService
+from services.profile_service import SessionProfileService
+from utils.nutrition_utils import calculate_nutrient_balance_score
+
+class SessionNutritionStateService:
+    """세션 기반 영양 상태 관리"""
+    
+    STATE_KEY = 'nutrition_state'
+    
+    @staticmethod
+    def get_state() -> Dict:
+        """
+        현재 영양 상태 조회 (없거나 날짜가 바뀌었으면 다시 만듦)
+        
+        Returns:
+            영양 상태 (수정 금지)
+        """
+        state = session.get(SessionNutritionStateService.STATE_KEY)
+        if state is None or state.get('date') != SessionIntakeService.get_today_key():
+            state = SessionNutritionStateService.rebuild()
+        return state
+    
+    @staticmethod
+    def get_version() -> int:
+        """현재 영양 상태 버전"""
+        return SessionNutritionStateService.get_state()['version']
+    
+    @staticmethod
+    def rebuild() -> Dict:
+        """
+        프로필 목표와 오늘 섭취량으로 영양 상태 전체 재계산
+        
+        프로필 변경, 섭취량 리셋, 날짜 변경 시에 사용합니다.
+        
+        Returns:
+            새 영양 상태
+        """
+        previous = session.get(SessionNutritionStateService.STATE_KEY)
+        profile = SessionProfileService.get_profile()
+        targets = profile.get('nutrition_targets') if profile else None
+        
+        state = {
+            'date': SessionIntakeService.get_today_key(),
+            'version': (previous['version'] + 1) if previous else 1,
+            'has_targets': bool(targets),
+            'targets': dict(targets) if targets else {},
+            'percentages': {},
+            'remaining_allowance': {},
+            'deficient_nutrients': {},
+            'excess_nutrients': {},
+            'nutrient_scores': {},
+            'score_total': 0,
+            'nutrition_score': 0
+        }
+        
+        if targets:
+            current = SessionIntakeService.get_current_totals()
+            for nutrient in targets:
+                SessionNutritionStateService._update_nutrient(state, nutrient, current)
+            SessionNutritionStateService._update_score(state)
+        
+        session[SessionNutritionStateService.STATE_KEY] = state
+        session.modified = True
+        return state
+    
+    @staticmethod
+    def apply_intake_change(nutrients: Iterable[str]):
+        """
+        섭취량 변경 반영 (바뀐 영양소만 다시 계산)
+        
+        Args:
+            nutrients: 섭취량이 바뀐 영양소 목록
+        """
+        state = session.get(SessionNutritionStateService.STATE_KEY)
+        if state is None or state.get('date') != SessionIntakeService.get_today_key():
+            SessionNutritionStateService.rebuild()
+            return
+        
+        if state['has_targets']:
+            current = SessionIntakeService.get_current_totals()
+            changed = [nutrient for nutrient in nutrients if nutrient in state['targets']]
+            for nutrient in changed:
+                SessionNutritionStateService._update_nutrient(state, nutrient, current)
+            
+            if changed:
+                # 부족/과잉분은 목표 순서대로 유지 (전체 재계산 결과와 같은 순서)
+                for key in ('deficient_nutrients', 'excess_nutrients'):
+                    gaps = state[key]
+                    state[key] = {n: gaps[n] for n in state['targets'] if n in gaps}
+                SessionNutritionStateService._update_score(state)
+        
+        state['version'] += 1
+        session.modified = True
+    
+    @staticmethod
+    def _update_nutrient(state: Dict, nutrient: str, current: Dict):
+        """영양소 하나의 백분율, 남은 허용량, 부족/과잉분, 균형 점수 갱신"""
+        calculator = NutritionCalculatorService()
+        current_value = {nutrient: current.get(nutrient, 0)}
+        target = {nutrient: state['targets'][nutrient]}
+        
+        state['percentages'][nutrient] = calculator.calculate_nutrition_percentage(
+            current_value, target
+        )[nutrient]
+        state['remaining_allowance'][nutrient] = calculator.get_remaining_allowance(
+            current_value, target
+        )[nutrient]
+        
+        deficient, excess = calculator.identify_nutritional_gaps(current_value, target)
+        state['deficient_nutrients'].pop(nutrient, None)
+        state['excess_nutrients'].pop(nutrient, None)
+        if nutrient in deficient:
+            state['deficient_nutrients'][nutrient] = deficient[nutrient]
+        if nutrient in excess:
+            state['excess_nutrients'][nutrient] = excess[nutrient]
+        
+        # 균형 점수 합계는 바뀐 영양소의 점수 차이만 반영
+        previous_score = state['nutrient_scores'].pop(nutrient, 0)
+        if target[nutrient] > 0:
+            score = calculate_nutrient_balance_score(current_value[nutrient], target[nutrient])
+            state['nutrient_scores'][nutrient] = score
+            state['score_total'] += score - previous_score
+        else:
+            state['score_total'] -= previous_score
+    
+    @staticmethod
+    def _update_score(state: Dict):
+        """전체 영양 점수 갱신 (calculate_nutrition_score와 같은 값)"""
+        nutrient_count = len(state['nutrient_scores'])
+        state['nutrition_score'] = round(
+            state['score_total'] / nutrient_count if nutrient_count > 0 else 0, 1
+        )
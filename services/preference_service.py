@@ -0,0 +1,155 @@
+"""
+세션 기반 음식 선호도 모델 (추천 피드백 반영)
+
+피드백 원문을 쌓는 대신 음식별 선호도 정수와 한 끼 분류별 선호도 벡터만 세션에
+보관하고, 피드백 한 건마다 두 값을 O(1)로 갱신합니다. 추천 시에는 후보 행에 대한
+가산점 배열과 제외 마스크로 변환해 영양 점수 위에 더합니다.
+"""
+
+from flask import session
+from typing import Dict, Optional, Set, Tuple
+import numpy as np
+from services.meal_combination_service import get_category_codes
+from utils.meal_category_utils import MEAL_CATEGORIES, MEAL_CATEGORY_NAMES, get_meal_category
+
+class SessionPreferenceService:
+    """세션 기반 음식/분류 선호도 관리"""
+    
+    SESSION_KEY = 'preferences'
+    
+    FEEDBACK_TYPES = ('liked', 'disliked', 'tried', 'not_interested')
+    
+    # 피드백 유형별 (음식 선호도 변화, 분류 선호도 변화)
+    FEEDBACK_DELTAS = {
+        'liked': (2, 1),
+        'tried': (1, 0),
+        'disliked': (-3, -1),
+        'not_interested': (-2, 0)
+    }
+    
+    FOOD_AFFINITY_LIMIT = 4       # 음식 선호도 범위 (±)
+    CATEGORY_AFFINITY_LIMIT = 5   # 분류 선호도 범위 (±)
+    MAX_FOODS = 40                # 보관할 음식 수 (오래 갱신되지 않은 음식부터 정리)
+    
+    # 추천 점수 가산점 (선호도 1단위당)
+    FOOD_BONUS = 4.0
+    CATEGORY_BONUS = 2.0
+    
+    @staticmethod
+    def get_preferences() -> Optional[Dict]:
+        """
+        세션 선호도 조회
+        
+        Returns:
+            {'foods': {음식명: 선호도}, 'categories': [분류별 선호도]} 또는 None
+        """
+        return session.get(SessionPreferenceService.SESSION_KEY)
+    
+    @staticmethod
+    def record_feedback(food_name: str, feedback_type: str) -> Dict:
+        """
+        피드백 한 건 반영 (음식 선호도와 분류 선호도 갱신)
+        
+        Args:
+            food_name: 음식명
+            feedback_type: 'liked', 'disliked', 'tried', 'not_interested'
+        
+        Returns:
+            갱신된 음식/분류 선호도 요약
+        """
+        if feedback_type not in SessionPreferenceService.FEEDBACK_DELTAS:
+            raise ValueError(f"유효하지 않은 피드백 타입입니다: {feedback_type}")
+        
+        food_delta, category_delta = SessionPreferenceService.FEEDBACK_DELTAS[feedback_type]
+        preferences = session.get(SessionPreferenceService.SESSION_KEY) or {
+            'foods': {},
+            'categories': [0] * len(MEAL_CATEGORIES)
+        }
+        foods = preferences['foods']
+        
+        # 최근 갱신한 음식이 뒤로 가도록 다시 넣음 (정리 시 앞에서부터 제거)
+        food_limit = SessionPreferenceService.FOOD_AFFINITY_LIMIT
+        food_affinity = _clamp(foods.pop(food_name, 0) + food_delta, food_limit)
+        if food_affinity:
+            foods[food_name] = food_affinity
+        while len(foods) > SessionPreferenceService.MAX_FOODS:
+            foods.pop(next(iter(foods)))
+        
+        category = get_meal_category(food_name)
+        position = MEAL_CATEGORIES.index(category)
+        preferences['categories'][position] = _clamp(
+            preferences['categories'][position] + category_delta,
+            SessionPreferenceService.CATEGORY_AFFINITY_LIMIT
+        )
+        
+        session[SessionPreferenceService.SESSION_KEY] = preferences
+        # 이전 버전의 피드백 원문 목록 정리
+        session.pop('recommendation_feedback', None)
+        session.modified = True
+        
+        return {
+            'food_name': food_name,
+            'food_affinity': food_affinity,
+            'suppressed': food_affinity < 0,
+            'category': category,
+            'category_name': MEAL_CATEGORY_NAMES[category],
+            'category_affinity': preferences['categories'][position]
+        }
+    
+    @staticmethod
+    def get_suppressed_foods() -> Set[str]:
+        """추천에서 제외할 음식 (싫어요/관심 없음으로 선호도가 음수인 음식)"""
+        preferences = SessionPreferenceService.get_preferences()
+        if not preferences:
+            return set()
+        return {food_name for food_name, affinity in preferences['foods'].items() if affinity < 0}
+    
+    @staticmethod
+    def get_rerank_terms(food_names: list, food_index: Dict[str, int],
+                         rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        추천 점수 재정렬 항 계산
+        
+        Args:
+            food_names: 영양소 행렬의 음식명 목록
+            food_index: 음식명 -> 행 번호
+            rows: 계산할 행 번호 (None이면 카탈로그 전체)
+        
+        Returns:
+            (가산점 배열, 제외 마스크) 튜플 (rows 순서)
+        """
+        size = len(food_names) if rows is None else len(rows)
+        bonus = np.zeros(size)
+        suppressed = np.zeros(size, dtype=bool)
+        
+        preferences = SessionPreferenceService.get_preferences()
+        if not preferences or size == 0:
+            return bonus, suppressed
+        
+        # 분류 선호도: 분류 번호로 한 번에 조회
+        category_affinity = np.asarray(preferences['categories'], dtype=float)
+        if category_affinity.any():
+            codes = get_category_codes(food_names)
+            if rows is not None:
+                codes = codes[rows]
+            bonus += SessionPreferenceService.CATEGORY_BONUS * category_affinity[codes]
+        
+        # 음식 선호도: 보관된 음식 수만큼만 확인
+        positions = None if rows is None else {int(row): i for i, row in enumerate(rows)}
+        for food_name, affinity in preferences['foods'].items():
+            position = food_index.get(food_name)
+            if position is not None and positions is not None:
+                position = positions.get(position)
+            if position is None:
+                continue
+            
+            if affinity < 0:
+                suppressed[position] = True
+            else:
+                bonus[position] += SessionPreferenceService.FOOD_BONUS * affinity
+        
+        return bonus, suppressed
+
+def _clamp(value: int, limit: int) -> int:
+    """선호도를 [-limit, limit] 범위로 제한"""
+    return max(-limit, min(limit, value))
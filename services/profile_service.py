@@ -4,6 +4,8 @@
 
 from flask import session
 from typing import Dict, Optional
+from utils.dietary_tag_utils import compile_restriction_mask, get_unknown_restrictions
+import logging
 import uuid
 
 class SessionProfileService:
@@ -27,6 +29,10 @@ class SessionProfileService:
             if field not in profile_data:
                 raise ValueError(f"필수 필드가 누락되었습니다: {field}")
         
+        dietary_restrictions = SessionProfileService._validate_dietary_restrictions(
+            profile_data.get('dietary_restrictions', [])
+        )
+        
         # 프로필 데이터 세션에 저장
         session['profile'] = {
             'age': int(profile_data['age']),
@@ -34,9 +40,9 @@ class SessionProfileService:
             'weight': float(profile_data['weight']),
             'gender': profile_data['gender'],
             'activity_level': profile_data['activity_level'],
-            'goal': profile_data.get('goal', 'maintain'),
-            'dietary_restrictions': profile_data.get('dietary_restrictions', [])
+            'goal': profile_data.get('goal', 'maintain')
         }
+        SessionProfileService._apply_dietary_restrictions(session['profile'], dietary_restrictions)
         
         # BMR/TDEE 계산
         from services.nutrition_service import NutritionCalculatorService
@@ -60,6 +66,10 @@ class SessionProfileService:
         session['profile']['tdee'] = tdee
         session['profile']['nutrition_targets'] = nutrition_targets
         
+        # 새 목표로 세션 영양 상태 재계산
+        from services.nutrition_state_service import SessionNutritionStateService
+        SessionNutritionStateService.rebuild()
+        
         return session['profile']
     
     @staticmethod
@@ -79,6 +89,12 @@ class SessionProfileService:
             if key in ['age', 'height', 'weight', 'gender', 'activity_level', 'goal']:
                 current_profile[key] = value
         
+        if 'dietary_restrictions' in profile_data:
+            dietary_restrictions = SessionProfileService._validate_dietary_restrictions(
+                profile_data['dietary_restrictions']
+            )
+            SessionProfileService._apply_dietary_restrictions(current_profile, dietary_restrictions)
+        
         # BMR/TDEE 재계산
         from services.nutrition_service import NutritionCalculatorService
         calculator = NutritionCalculatorService()
@@ -101,8 +117,54 @@ class SessionProfileService:
         current_profile['nutrition_targets'] = nutrition_targets
         
         session['profile'] = current_profile
+        
+        # 새 목표로 세션 영양 상태 재계산
+        from services.nutrition_state_service import SessionNutritionStateService
+        SessionNutritionStateService.rebuild()
+        
         return current_profile
     
+    @staticmethod
+    def get_restriction_mask() -> int:
+        """
+        프로필 식이 제한의 제외 태그 마스크 (프로필이 없거나 제한이 없으면 0)
+        
+        Returns:
+            compile_restriction_mask()와 같은 형식의 비트 마스크
+        """
+        profile = SessionProfileService.get_profile()
+        if not profile:
+            return 0
+        
+        mask = profile.get('dietary_restriction_mask')
+        if mask is None:
+            # 마스크 도입 이전에 만든 프로필
+            mask = compile_restriction_mask(profile.get('dietary_restrictions'))
+        return mask
+    
+    @staticmethod
+    def _validate_dietary_restrictions(restrictions) -> list:
+        """식이 제한 목록 검증 (자유 입력 제한도 그대로 저장하므로 형식만 확인)"""
+        if not isinstance(restrictions, list):
+            raise ValueError("dietary_restrictions는 목록이어야 합니다.")
+        return restrictions
+    
+    @staticmethod
+    def _apply_dietary_restrictions(profile: Dict, restrictions: list):
+        """
+        식이 제한과 제외 태그 마스크를 프로필에 반영
+        
+        태그 어휘에 없는 제한(예: '저염')은 저장만 하고 음식 필터링에는 쓰이지 않으므로
+        'unmatched_dietary_restrictions'로 응답에 알립니다.
+        """
+        unknown = get_unknown_restrictions(restrictions)
+        if unknown:
+            logging.warning(f"음식 필터링에 적용되지 않는 식이 제한입니다: {', '.join(unknown)}")
+        
+        profile['dietary_restrictions'] = restrictions
+        profile['dietary_restriction_mask'] = compile_restriction_mask(restrictions)
+        profile['unmatched_dietary_restrictions'] = unknown
+    
     @staticmethod
     def has_profile() -> bool:
         """프로필 존재 여부 확인"""
@@ -114,4 +176,8 @@ class SessionProfileService:
         if 'profile' in session:
             del session['profile']
         if 'daily_intake' in session:
-            del session['daily_intake']
\ No newline at end of file
+            del session['daily_intake']
+        
+        # 세션 영양 상태 초기화 (버전은 계속 증가)
+        from services.nutrition_state_service import SessionNutritionStateService
+        SessionNutritionStateService.rebuild()
\ No newline at end of file
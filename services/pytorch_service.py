@@ -2,6 +2,7 @@
 PyTorch 기반 음식 분류 서비스
 """
 import os
+import hashlib
 import numpy as np
 from PIL import Image, ImageOps
 from typing import List, Tuple, Optional
@@ -72,6 +73,7 @@ class PyTorchService:
         self.model = None
         self.class_names = []
         self.is_loaded = False
+        self.model_version = 'unloaded'
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
         # 이미지 전처리 변환 (실제 모델 훈련 방식과 동일)
@@ -138,6 +140,7 @@ class PyTorchService:
             logging.info(f"PyTorch 모델이 성공적으로 로드되었습니다: {self.model_path}")
             logging.info(f"{len(self.class_names)}개의 클래스가 로드되었습니다.")
             logging.info(f"사용 디바이스: {self.device}")
+            self.model_version = self._compute_model_version()
             self.is_loaded = True
             
         except Exception as e:
@@ -220,6 +223,18 @@ class PyTorchService:
             logging.error(f"PyTorch 분류 중 오류 발생: {str(e)}")
             raise RuntimeError(f"음식 분류에 실패했습니다: {str(e)}")
     
+    def _compute_model_version(self) -> str:
+        """모델 파일과 클래스 목록 기반 버전 문자열 생성"""
+        stat = os.stat(self.model_path)
+        digest = hashlib.sha1(
+            f"{self.model_path}:{stat.st_size}:{stat.st_mtime_ns}:{','.join(self.class_names)}".encode('utf-8')
+        )
+        return digest.hexdigest()[:12]
+    
+    def get_model_version(self) -> str:
+        """모델 버전 반환 (ETag 등 캐시 키에 사용)"""
+        return self.model_version
+    
     def get_supported_foods(self) -> List[str]:
         """지원되는 음식 목록 반환"""
         return self.class_names.copy()
@@ -241,7 +256,8 @@ class PyTorchService:
             'num_classes': len(self.class_names),
             'is_loaded': self.is_loaded,
             'device': str(self.device),
-            'torch_available': TORCH_AVAILABLE
+            'torch_available': TORCH_AVAILABLE,
+            'model_version': self.model_version
         }
 
 # 전역 인스턴스 (싱글톤 패턴)
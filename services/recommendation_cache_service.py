@@ -0,0 +1,301 @@
+"""
+양자화 상태 기반 추천 결과 캐시 (세션/워커 간 공유)
+
+비슷한 목표와 섭취량을 가진 사용자들은 같은 추천 결과를 받도록 상태를 양자화해
+키를 만들고, 워커 메모리 LRU와 공유 SQLite(LRU, 카탈로그 세대 표시) 두 단계로
+결과를 보관합니다. 캐시된 결과는 양자화된 대표 상태로 계산한 값이므로 키만으로
+결정되며, 호출 측은 이를 후보 목록으로만 쓰고 실제 상태로 다시 점수를 매깁니다.
+"""
+
+import os
+import json
+import math
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.shared_store import get_shared_connection
+
+class RecommendationResultCache:
+    """양자화 상태 기반 추천 결과 캐시 (워커 메모리 LRU + 공유 SQLite LRU)"""
+    
+    DB_NAME = 'recommendation_cache.db'
+    
+    ENABLED = os.getenv('RECOMMENDATION_CACHE_ENABLED', 'true').lower() == 'true'
+    MEMORY_ENTRIES = int(os.getenv('RECOMMENDATION_CACHE_MEMORY_ENTRIES', '1024'))
+    SHARED_ENTRIES = int(os.getenv('RECOMMENDATION_CACHE_SHARED_ENTRIES', '20000'))
+    
+    # 양자화 간격: 목표량은 5% 로그 간격, 섭취량은 목표량의 5% 단위
+    TARGET_STEP = float(os.getenv('RECOMMENDATION_CACHE_TARGET_STEP', '0.05'))
+    INTAKE_STEP = float(os.getenv('RECOMMENDATION_CACHE_INTAKE_STEP', '0.05'))
+    
+    # 워커별 적중 통계를 공유 DB에 합산하는 주기 (조회 횟수)
+    STATS_FLUSH_EVERY = 32
+    
+    def __init__(self, namespace: str = 'recommendation', memory_entries: int = None,
+                 shared_entries: int = None):
+        """
+        Args:
+            namespace: 공유 DB 테이블 접두어 (같은 DB에 용도별 테이블 사용)
+            memory_entries: 워커 메모리 최대 항목 수 (None이면 기본값)
+            shared_entries: 공유 DB 최대 항목 수 (None이면 기본값)
+        """
+        self.memory_entries = memory_entries or self.MEMORY_ENTRIES
+        self.shared_entries = shared_entries or self.SHARED_ENTRIES
+        self._table = f'{namespace}_cache'
+        self._stats_table = f'{namespace}_cache_stats'
+        self._memory = OrderedDict()  # 키 -> (세대, 결과)
+        self._lock = threading.Lock()
+        self._shared = True
+        self._shared_generation = None
+        self._stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0}
+        self._pending_stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0}
+        
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self._table} ('
+                'cache_key TEXT PRIMARY KEY, '
+                'generation INTEGER NOT NULL, '
+                'payload TEXT NOT NULL, '
+                'last_used REAL NOT NULL)'
+            )
+            conn.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_{self._table}_last_used '
+                f'ON {self._table} (last_used)'
+            )
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self._stats_table} ('
+                'name TEXT PRIMARY KEY, '
+                'value INTEGER NOT NULL)'
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"공유 추천 캐시를 사용할 수 없어 워커 메모리 캐시만 사용합니다: {str(e)}")
+            self._shared = False
+    
+    def quantize_state(self, targets: Dict[str, float], current_intake: Dict[str, float],
+                       excluded_foods: Iterable[str],
+                       restriction_mask: int = 0) -> Tuple[str, Dict[str, float], Dict[str, float]]:
+        """
+        상태 양자화 및 캐시 키 생성
+        
+        Args:
+            targets: 목표 섭취량
+            current_intake: 현재 섭취량
+            excluded_foods: 제외할 음식 (최근 먹은 음식 등)
+            restriction_mask: 식이 제한 제외 태그 마스크
+        
+        Returns:
+            (캐시 키, 양자화된 목표량, 양자화된 섭취량) 튜플
+        """
+        target_log_step = math.log1p(self.TARGET_STEP)
+        signature = []
+        quantized_targets = {}
+        quantized_intake = {}
+        
+        for nutrient, target in targets.items():
+            current = current_intake.get(nutrient, 0)
+            if target > 0:
+                target_bucket = round(math.log(target) / target_log_step)
+                quantized_target = math.exp(target_bucket * target_log_step)
+                intake_bucket = round(current / (quantized_target * self.INTAKE_STEP))
+                quantized_current = intake_bucket * quantized_target * self.INTAKE_STEP
+            else:
+                target_bucket, quantized_target = None, target
+                intake_bucket = quantized_current = round(current)
+            
+            quantized_targets[nutrient] = quantized_target
+            quantized_intake[nutrient] = quantized_current
+            signature.append((nutrient, target_bucket, intake_bucket))
+        
+        payload = json.dumps(
+            [signature, sorted(set(excluded_foods)), restriction_mask], ensure_ascii=False
+        )
+        cache_key = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        return cache_key, quantized_targets, quantized_intake
+    
+    def get(self, cache_key: str, generation: int) -> Optional[List]:
+        """
+        캐시된 추천 결과 조회 (메모리 -> 공유 DB 순서)
+        
+        Args:
+            cache_key: 캐시 키
+            generation: 현재 카탈로그 세대 (다른 세대의 결과는 사용하지 않음)
+        
+        Returns:
+            추천 결과 또는 None
+        """
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None and entry[0] == generation:
+                self._memory.move_to_end(cache_key)
+                self._count('memory_hits')
+                return entry[1]
+        
+        value = self._get_shared(cache_key, generation)
+        with self._lock:
+            if value is None:
+                self._count('misses')
+            else:
+                self._remember(cache_key, generation, value)
+                self._count('shared_hits')
+        return value
+    
+    def put(self, cache_key: str, generation: int, value: List):
+        """
+        추천 결과 저장
+        
+        Args:
+            cache_key: 캐시 키
+            generation: 결과를 계산한 카탈로그 세대
+            value: 추천 결과 (JSON 직렬화 가능해야 함)
+        """
+        with self._lock:
+            self._remember(cache_key, generation, value)
+        
+        if not self._shared:
+            return
+        
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if self._shared_generation != generation:
+                    # 카탈로그가 바뀌면 이전 세대 결과 정리
+                    conn.execute(f'DELETE FROM {self._table} WHERE generation < ?', (generation,))
+                    self._shared_generation = generation
+                
+                conn.execute(
+                    f'INSERT INTO {self._table} (cache_key, generation, payload, last_used) '
+                    'VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(cache_key) DO UPDATE SET generation = excluded.generation, '
+                    'payload = excluded.payload, last_used = excluded.last_used',
+                    (cache_key, generation, json.dumps(value, ensure_ascii=False), time.time())
+                )
+                # 가장 오래 쓰지 않은 항목부터 정리하여 크기 제한 유지
+                conn.execute(
+                    f'DELETE FROM {self._table} WHERE cache_key IN ('
+                    f'SELECT cache_key FROM {self._table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (self.shared_entries,)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logging.error(f"공유 추천 캐시 저장 실패: {str(e)}")
+    
+    def get_stats(self) -> Dict:
+        """
+        캐시 통계 (이 워커 기준과 전체 워커 합산)
+        
+        Returns:
+            적중/실패 횟수, 적중률, 항목 수
+        """
+        with self._lock:
+            worker_stats = dict(self._stats)
+            memory_entries = len(self._memory)
+            self._flush_stats()
+        
+        stats = {
+            'enabled': self.ENABLED,
+            'worker': self._with_hit_ratio(worker_stats),
+            'memory_entries': memory_entries,
+            'memory_capacity': self.memory_entries,
+            'shared': None,
+            'shared_entries': None,
+            'shared_capacity': self.shared_entries
+        }
+        
+        if self._shared:
+            try:
+                conn = get_shared_connection(self.DB_NAME)
+                totals = dict(conn.execute(f'SELECT name, value FROM {self._stats_table}').fetchall())
+                stats['shared'] = self._with_hit_ratio({
+                    name: totals.get(name, 0) for name in worker_stats
+                })
+                stats['shared_entries'] = conn.execute(
+                    f'SELECT COUNT(*) FROM {self._table}'
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                logging.error(f"공유 추천 캐시 통계 조회 실패: {str(e)}")
+        
+        return stats
+    
+    def _get_shared(self, cache_key: str, generation: int) -> Optional[List]:
+        """공유 DB에서 조회 (적중 시 최근 사용 시각 갱신)"""
+        if not self._shared:
+            return None
+        
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            row = conn.execute(
+                f'SELECT payload FROM {self._table} WHERE cache_key = ? AND generation = ?',
+                (cache_key, generation)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            conn.execute(
+                f'UPDATE {self._table} SET last_used = ? WHERE cache_key = ?',
+                (time.time(), cache_key)
+            )
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            logging.error(f"공유 추천 캐시 조회 실패: {str(e)}")
+            return None
+    
+    def _remember(self, cache_key: str, generation: int, value: List):
+        """워커 메모리 LRU에 저장 (잠금 상태에서 호출)"""
+        self._memory[cache_key] = (generation, value)
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _count(self, name: str):
+        """적중 통계 증가 (잠금 상태에서 호출, 일정 횟수마다 공유 DB에 합산)"""
+        self._stats[name] += 1
+        self._pending_stats[name] += 1
+        if sum(self._pending_stats.values()) >= self.STATS_FLUSH_EVERY:
+            self._flush_stats()
+    
+    def _flush_stats(self):
+        """밀린 적중 통계를 공유 DB에 합산 (잠금 상태에서 호출)"""
+        if not self._shared or not any(self._pending_stats.values()):
+            return
+        
+        try:
+            get_shared_connection(self.DB_NAME).executemany(
+                f'INSERT INTO {self._stats_table} (name, value) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                list(self._pending_stats.items())
+            )
+            self._pending_stats = {name: 0 for name in self._pending_stats}
+        except sqlite3.Error as e:
+            logging.error(f"공유 추천 캐시 통계 저장 실패: {str(e)}")
+    
+    @staticmethod
+    def _with_hit_ratio(counts: Dict[str, int]) -> Dict:
+        """적중률 추가"""
+        lookups = sum(counts.values())
+        hits = counts['memory_hits'] + counts['shared_hits']
+        return {
+            **counts,
+            'lookups': lookups,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None
+        }
+
+_recommendation_cache = None
+_recommendation_cache_lock = threading.Lock()
+
+def get_recommendation_cache() -> RecommendationResultCache:
+    """추천 결과 캐시 싱글톤 반환"""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        with _recommendation_cache_lock:
+            if _recommendation_cache is None:
+                _recommendation_cache = RecommendationResultCache()
+    return _recommendation_cache
@@ -0,0 +1,151 @@
+"""
+식사 기록 직후 추천 후보 사전 계산 (백그라운드 스레드 풀)
+
+식사를 기록/삭제하면 요청 스레드에서 바뀐 영양 상태의 계산 입력만 모아 두고,
+점수 계산은 스레드 풀에서 수행해 (세션 ID, 영양 상태 버전) 아래 보관합니다.
+이어지는 추천 조회는 같은 버전이면 이 결과를 그대로 읽습니다. 같은 세션에 새 작업이
+들어오면 시작 전인 이전 작업은 취소되고, 실행 중인 작업의 결과는 버려집니다.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, List, Optional
+
+class _PrecomputeJob:
+    """세션별 사전 계산 작업 (영양 상태 버전과 카탈로그 세대로 식별)"""
+    
+    __slots__ = ('version', 'generation', 'future')
+    
+    def __init__(self, version: int, generation: int):
+        self.version = version
+        self.generation = generation
+        self.future = None
+
+class RecommendationPrecomputer:
+    """세션별 추천 후보 사전 계산기"""
+    
+    ENABLED = os.getenv('RECOMMENDATION_PRECOMPUTE_ENABLED', 'true').lower() == 'true'
+    WORKERS = int(os.getenv('RECOMMENDATION_PRECOMPUTE_WORKERS', '2'))
+    # 추천 조회 시 실행 중인 사전 계산을 기다리는 최대 시간
+    WAIT_MS = float(os.getenv('RECOMMENDATION_PRECOMPUTE_WAIT_MS', '100'))
+    # 결과를 보관하는 최대 세션 수 (오래된 세션부터 정리)
+    MAX_SESSIONS = int(os.getenv('RECOMMENDATION_PRECOMPUTE_MAX_SESSIONS', '4096'))
+    
+    def __init__(self, workers: int = None, max_sessions: int = None):
+        """
+        Args:
+            workers: 스레드 풀 크기 (None이면 기본값)
+            max_sessions: 결과를 보관하는 최대 세션 수 (None이면 기본값)
+        """
+        self.workers = workers or self.WORKERS
+        self.max_sessions = max_sessions or self.MAX_SESSIONS
+        self._jobs = OrderedDict()  # 세션 ID -> 최신 작업
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._stats = {'scheduled': 0, 'superseded': 0, 'hits': 0, 'misses': 0, 'failed': 0}
+    
+    def schedule(self, session_id: str, version: int, generation: int,
+                 compute: Callable[[], List]) -> bool:
+        """
+        사전 계산 예약 (같은 세션의 이전 작업은 대체)
+        
+        Args:
+            session_id: 세션 ID
+            version: 계산 입력을 모은 시점의 영양 상태 버전
+            generation: 카탈로그 세대
+            compute: 추천 후보 계산 함수 (요청 컨텍스트 없이 실행 가능해야 함)
+        
+        Returns:
+            예약 여부
+        """
+        if not self.ENABLED:
+            return False
+        
+        job = _PrecomputeJob(version, generation)
+        with self._lock:
+            previous = self._jobs.pop(session_id, None)
+            if previous is not None and not previous.future.done():
+                # 시작 전이면 취소, 실행 중이면 결과를 더 이상 조회하지 않음
+                previous.future.cancel()
+                self._stats['superseded'] += 1
+            
+            self._jobs[session_id] = job
+            while len(self._jobs) > self.max_sessions:
+                _, evicted = self._jobs.popitem(last=False)
+                evicted.future.cancel()
+            
+            job.future = self._get_executor().submit(self._run, session_id, job, compute)
+            self._stats['scheduled'] += 1
+        return True
+    
+    def get(self, session_id: str, version: int, generation: int) -> Optional[List]:
+        """
+        사전 계산 결과 조회 (실행 중이면 WAIT_MS까지 대기)
+        
+        Args:
+            session_id: 세션 ID
+            version: 현재 영양 상태 버전
+            generation: 현재 카탈로그 세대
+        
+        Returns:
+            추천 후보 목록 또는 None (버전/세대가 다르거나 결과가 없으면)
+        """
+        with self._lock:
+            job = self._jobs.get(session_id)
+        
+        result = None
+        if job is not None and job.version == version and job.generation == generation:
+            try:
+                result = job.future.result(timeout=self.WAIT_MS / 1000)
+            except (CancelledError, TimeoutError):
+                result = None
+            except Exception as e:
+                logging.error(f"추천 사전 계산 실패: {str(e)}")
+                with self._lock:
+                    self._stats['failed'] += 1
+        
+        with self._lock:
+            self._stats['hits' if result is not None else 'misses'] += 1
+        return result
+    
+    def get_stats(self) -> Dict:
+        """사전 계산 통계 (이 워커 기준)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sessions'] = len(self._jobs)
+        stats['enabled'] = self.ENABLED
+        stats['workers'] = self.workers
+        return stats
+    
+    def _run(self, session_id: str, job: _PrecomputeJob, compute: Callable[[], List]) -> Optional[List]:
+        """스레드 풀에서 실행 (시작 전에 대체된 작업은 계산하지 않음)"""
+        with self._lock:
+            if self._jobs.get(session_id) is not job:
+                return None
+        return compute()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """스레드 풀 지연 생성 (잠금 상태에서 호출, fork된 워커 프로세스마다 새로 생성)"""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='recommendation-precompute'
+            )
+            self._executor_pid = pid
+        return self._executor
+
+_precomputer = None
+_precomputer_lock = threading.Lock()
+
+def get_recommendation_precomputer() -> RecommendationPrecomputer:
+    """추천 사전 계산기 싱글톤 반환"""
+    global _precomputer
+    if _precomputer is None:
+        with _precomputer_lock:
+            if _precomputer is None:
+                _precomputer = RecommendationPrecomputer()
+    return _precomputer
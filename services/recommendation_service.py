@@ -2,13 +2,32 @@
 개인 맞춤형 추천 서비스
 """
 
+import numpy as np
 from typing import Dict, List, Tuple, Optional
 from services.nutrition_service import NutritionCalculatorService
 from services.nutrition_data_service import get_nutrition_data_service
 from services.intake_service import SessionIntakeService
 from services.profile_service import SessionProfileService
+from services.analysis_context import NutritionAnalysisContext, get_analysis_context
+from services.nutrient_neighbor_service import get_nutrient_neighbor_index
+from services.recommendation_cache_service import get_recommendation_cache
+from services.preference_service import SessionPreferenceService
+from services.recommendation_precompute_service import get_recommendation_precomputer
+from services.nutrition_state_service import SessionNutritionStateService
+from utils.nutrition_utils import NUTRIENT_KEYS
 import logging
 
+# 최근접 이웃 검색의 한 끼 기본 비율 (남은 허용량의 1/3)
+DEFAULT_MEAL_FRACTION = 1 / 3
+
+# 우선순위 그룹별 최근접 이웃 가중치 (부족/과잉이 심한 영양소를 더 가깝게 맞춤)
+NEIGHBOR_PRIORITY_WEIGHTS = {
+    'high_priority_deficient': 3.0,
+    'moderate_priority_deficient': 2.0,
+    'excess_warning': 2.0,
+    'balanced': 1.0
+}
+
 class RecommendationEngine:
     """추천 엔진"""
     
@@ -16,58 +35,41 @@ class RecommendationEngine:
         self.nutrition_calculator = NutritionCalculatorService()
         self.nutrition_data_service = get_nutrition_data_service()
     
-    def analyze_nutritional_gaps(self, user_profile: Dict = None) -> Dict:
+    def analyze_nutritional_gaps(self, user_profile: Dict = None,
+                                 context: NutritionAnalysisContext = None) -> Dict:
         """
         영양 부족분 분석
         
         Args:
             user_profile: 사용자 프로필 (None이면 세션에서 조회)
+            context: 이미 계산된 분석 컨텍스트 (None이면 현재 요청의 컨텍스트 사용)
             
         Returns:
             영양 분석 결과
         """
         try:
-            # 사용자 프로필 확인
-            if user_profile is None:
-                user_profile = SessionProfileService.get_profile()
-            
-            if not user_profile or 'nutrition_targets' not in user_profile:
-                raise ValueError("사용자 프로필이 설정되지 않았습니다.")
-            
-            # 현재 섭취량 조회
-            current_intake = SessionIntakeService.get_current_totals()
-            targets = user_profile['nutrition_targets']
-            
-            # 부족분과 과잉분 계산
-            deficient, excess = self.nutrition_calculator.identify_nutritional_gaps(
-                current_intake, targets
-            )
-            
-            # 백분율 계산
-            percentages = self.nutrition_calculator.calculate_nutrition_percentage(
-                current_intake, targets
-            )
-            
-            # 남은 허용량 계산
-            remaining = self.nutrition_calculator.get_remaining_allowance(
-                current_intake, targets
-            )
+            if context is None:
+                if user_profile is None:
+                    context = get_analysis_context()
+                else:
+                    context = NutritionAnalysisContext.from_session(user_profile)
             
             # 우선순위 영양소 식별
             priority_nutrients = self._identify_priority_nutrients(
-                deficient, excess, percentages
+                context.deficient, context.excess, context.percentages
             )
             
             return {
-                'current_intake': current_intake,
-                'targets': targets,
-                'deficient_nutrients': deficient,
-                'excess_nutrients': excess,
-                'percentages': percentages,
-                'remaining_allowance': remaining,
+                'current_intake': context.current_intake,
+                'targets': context.targets,
+                'deficient_nutrients': context.deficient,
+                'excess_nutrients': context.excess,
+                'percentages': context.percentages,
+                'remaining_allowance': context.remaining,
                 'priority_nutrients': priority_nutrients,
                 'analysis_summary': self._generate_analysis_summary(
-                    deficient, excess, percentages
+                    context.deficient, context.excess, context.percentages,
+                    context.nutrition_score
                 )
             }
             
@@ -123,7 +125,7 @@ class RecommendationEngine:
         return priority
     
     def _generate_analysis_summary(self, deficient: Dict, excess: Dict, 
-                                 percentages: Dict) -> Dict:
+                                 percentages: Dict, nutrition_score: float) -> Dict:
         """
         분석 요약 생성
         
@@ -131,6 +133,7 @@ class RecommendationEngine:
             deficient: 부족한 영양소
             excess: 과잉 영양소
             percentages: 현재 섭취 백분율
+            nutrition_score: 전체 영양 점수
             
         Returns:
             분석 요약
@@ -140,17 +143,6 @@ class RecommendationEngine:
         deficient_count = len(deficient)
         excess_count = len(excess)
         
-        # 전체 영양 점수 계산
-        from utils.nutrition_utils import calculate_nutrition_score
-        profile = SessionProfileService.get_profile()
-        current_intake = SessionIntakeService.get_current_totals()
-        
-        nutrition_score = 0
-        if profile and 'nutrition_targets' in profile:
-            nutrition_score = calculate_nutrition_score(
-                current_intake, profile['nutrition_targets']
-            )
-        
         return {
             'total_nutrients': total_nutrients,
             'balanced_nutrients': balanced_count,
@@ -201,6 +193,14 @@ class RecommendationEngine:
 class MenuRecommendationEngine:
     """메뉴 추천 엔진"""
     
+    # 남은 허용량 대비 비율 구간별 적절성 점수
+    APPROPRIATENESS_BAND_SCORES = np.array([0, 5, 10, 5, 0], dtype=np.int64)
+    
+    # 캐시/사전 계산에 보관하는 후보 수 (선호도 재정렬과 제외 음식을 감안한 여유분 포함)
+    CACHED_CANDIDATES = 20
+    # 양자화 캐시에 보관하는 대표 상태 후보 수 (실제 상태로 다시 점수를 매겨 CACHED_CANDIDATES개 선택)
+    SHORTLIST_CANDIDATES = 100
+    
     def __init__(self):
         self.nutrition_calculator = NutritionCalculatorService()
         self.nutrition_data_service = get_nutrition_data_service()
@@ -223,55 +223,28 @@ class MenuRecommendationEngine:
             if not analysis['deficient_nutrients']:
                 return self._get_balanced_recommendations(max_recommendations)
             
-            # 사용 가능한 음식 목록 조회
-            available_foods = self.nutrition_data_service.get_available_foods()
+            # 추천 점수 상위 음식 (비슷한 상태의 결과는 공유 캐시에서 재사용)
+            ranked_foods = self._rank_foods(analysis, max_recommendations)
             
-            if not available_foods:
-                return []
-            
-            # 최근 식사 기록에서 먹은 음식 제외
-            recent_foods = self._get_recent_eaten_foods()
-            available_foods = [food for food in available_foods if food not in recent_foods]
-            
-            if not available_foods:
-                return []
-            
-            # 각 음식에 대해 점수 계산
-            food_scores = []
-            
-            for food_name in available_foods:
+            # 점수가 있는 음식 중 상위 추천 메뉴 선택
+            recommendations = []
+            for food_name, score, preference_bonus in ranked_foods:
                 nutrition_data = self.nutrition_data_service.get_nutrition_data(food_name)
                 if nutrition_data:
-                    score = self._calculate_recommendation_score(
-                        nutrition_data['nutrition'],
-                        analysis['deficient_nutrients'],
-                        analysis['excess_nutrients'],
-                        analysis['remaining_allowance']
-                    )
-                    
-                    if score > 0:  # 점수가 있는 음식만 포함
-                        food_scores.append({
-                            'food_name': food_name,
-                            'nutrition_data': nutrition_data,
-                            'score': score,
-                            'reasoning': self._generate_reasoning(
-                                nutrition_data['nutrition'],
-                                analysis['deficient_nutrients']
-                            )
-                        })
-            
-            # 점수순으로 정렬
-            food_scores.sort(key=lambda x: x['score'], reverse=True)
-            
-            # 상위 추천 메뉴 반환
-            recommendations = food_scores[:max_recommendations]
-            
-            # 추천 이유 보강
-            for rec in recommendations:
-                rec['benefits'] = self._identify_nutritional_benefits(
-                    rec['nutrition_data']['nutrition'],
-                    analysis['deficient_nutrients']
-                )
+                    recommendations.append({
+                        'food_name': food_name,
+                        'nutrition_data': nutrition_data,
+                        'score': score,
+                        'preference_bonus': preference_bonus,
+                        'reasoning': self._generate_reasoning(
+                            nutrition_data['nutrition'],
+                            analysis['deficient_nutrients']
+                        ),
+                        'benefits': self._identify_nutritional_benefits(
+                            nutrition_data['nutrition'],
+                            analysis['deficient_nutrients']
+                        )
+                    })
             
             return recommendations
             
@@ -279,80 +252,402 @@ class MenuRecommendationEngine:
             logging.error(f"메뉴 추천 생성 중 오류: {str(e)}")
             return []
     
-    def _calculate_recommendation_score(self, food_nutrition: Dict, 
-                                     deficient: Dict, excess: Dict, 
-                                     remaining: Dict) -> float:
+    def schedule_precompute(self) -> bool:
+        """
+        현재 섭취 상태의 추천 후보를 백그라운드에서 미리 계산 (식사 기록/삭제 직후 호출)
+        
+        세션 조회는 여기서 끝내고 점수 계산만 스레드 풀로 넘기므로, 이어지는 추천
+        조회는 같은 영양 상태 버전이면 계산 없이 결과를 읽습니다.
+        
+        Returns:
+            예약 여부
+        """
+        precomputer = get_recommendation_precomputer()
+        if not precomputer.ENABLED:
+            return False
+        
+        try:
+            analysis = NutritionalGapAnalyzer().get_detailed_analysis()
+            if not analysis['deficient_nutrients']:
+                return False  # 균형 추천은 점수 계산이 없음
+            
+            job = self._prepare_ranking(analysis)
+            if job is None:
+                return False
+            
+            return precomputer.schedule(
+                job['session_id'], job['version'], job['generation'],
+                lambda: self._compute_candidates(job)
+            )
+        except Exception as e:
+            logging.error(f"추천 사전 계산 예약 중 오류: {str(e)}")
+            return False
+    
+    def _rank_foods(self, analysis: Dict, max_recommendations: int) -> List[Tuple[str, float, float]]:
+        """
+        추천 점수 상위 음식 선택
+        
+        목표와 섭취량을 양자화한 대표 상태의 후보 목록을 공유 캐시에 저장하므로
+        비슷한 상태의 다른 세션/워커는 카탈로그 전체 점수 계산 없이 후보를 받고,
+        후보만 실제 상태로 다시 점수를 매깁니다. 식사 기록 직후 사전 계산한 결과가 있으면 먼저 사용합니다. 세션 선호도는
+        후보 위에 가산점/제외로 적용합니다 (캐시 키에는 미포함).
+        
+        Args:
+            analysis: 상세 영양 분석 결과
+            max_recommendations: 최대 추천 개수
+            
+        Returns:
+            (음식명, 점수, 선호도 가산점) 목록 (점수 내림차순)
+        """
+        job = self._prepare_ranking(analysis)
+        if job is None:
+            return []
+        
+        food_names, food_index = job['food_names'], job['food_index']
+        if max_recommendations > self.CACHED_CANDIDATES:
+            # 후보 수보다 많이 요청하면 카탈로그 전체에 선호도 적용
+            bonus, suppressed = SessionPreferenceService.get_rerank_terms(food_names, food_index)
+            ranked_foods = self._score_top_foods(
+                food_names, job['nutrient_matrix'], job['exclude'] | suppressed,
+                analysis['deficient_nutrients'], analysis['excess_nutrients'],
+                analysis['remaining_allowance'], analysis['current_intake'],
+                analysis['targets'], analysis['analysis_summary']['nutrition_score'],
+                max_recommendations, bonus
+            )
+            return [
+                (food_name, score, float(bonus[food_index[food_name]]))
+                for food_name, score in ranked_foods
+            ]
+        
+        ranked_foods = get_recommendation_precomputer().get(
+            job['session_id'], job['version'], job['generation']
+        )
+        if ranked_foods is None:
+            ranked_foods = self._compute_candidates(job)
+        
+        return self._apply_preferences(ranked_foods, food_names, food_index, max_recommendations)
+    
+    def _prepare_ranking(self, analysis: Dict) -> Optional[Dict]:
+        """
+        추천 후보 계산 입력 준비 (세션 조회는 여기서만 수행)
+        
+        Args:
+            analysis: 상세 영양 분석 결과
+            
+        Returns:
+            _compute_candidates() 입력 (카탈로그가 비어 있으면 None)
+        """
+        generation = self.nutrition_data_service.generation
+        food_names, nutrient_matrix, food_index = self.nutrition_data_service.get_nutrient_matrix()
+        
+        if not food_names:
+            return None
+        
+        # 최근 식사 기록에서 먹은 음식 제외 (카탈로그에 없는 음식은 키에서 제외)
+        excluded_foods = [food for food in self._get_recent_eaten_foods() if food in food_index]
+        restriction_mask = SessionProfileService.get_restriction_mask()
+        
+        # 식이 제한 음식과 최근 먹은 음식 제외 (태그 비트셋 AND 한 번)
+        exclude = self.nutrition_data_service.get_restricted_food_mask(food_names, restriction_mask)
+        for food_name in excluded_foods:
+            exclude[food_index[food_name]] = True
+        
+        return {
+            'session_id': SessionProfileService.get_session_id(),
+            'version': SessionNutritionStateService.get_version(),
+            'generation': generation,
+            'food_names': food_names,
+            'nutrient_matrix': nutrient_matrix,
+            'food_index': food_index,
+            'exclude': exclude,
+            'excluded_foods': excluded_foods,
+            'restriction_mask': restriction_mask,
+            'analysis': analysis
+        }
+    
+    def _compute_candidates(self, job: Dict) -> List:
+        """
+        영양 점수 상위 후보 계산 (요청 컨텍스트 없이 실행 가능, 백그라운드 사전 계산에 사용)
+        
+        Args:
+            job: _prepare_ranking() 결과
+            
+        Returns:
+            (음식명, 점수) 후보 목록 (CACHED_CANDIDATES개, 점수 내림차순)
+        """
+        analysis = job['analysis']
+        cache = get_recommendation_cache()
+        if not cache.ENABLED:
+            return self._score_top_foods(
+                job['food_names'], job['nutrient_matrix'], job['exclude'],
+                analysis['deficient_nutrients'], analysis['excess_nutrients'],
+                analysis['remaining_allowance'], analysis['current_intake'],
+                analysis['targets'], analysis['analysis_summary']['nutrition_score'],
+                self.CACHED_CANDIDATES
+            )
+        
+        cache_key, quantized_targets, quantized_intake = cache.quantize_state(
+            analysis['targets'], analysis['current_intake'],
+            job['excluded_foods'], job['restriction_mask']
+        )
+        shortlist = cache.get(cache_key, job['generation'])
+        if shortlist is None:
+            context = NutritionAnalysisContext({'nutrition_targets': quantized_targets}, quantized_intake)
+            shortlist = self._score_top_foods(
+                job['food_names'], job['nutrient_matrix'], job['exclude'],
+                context.deficient, context.excess, context.remaining,
+                quantized_intake, quantized_targets, context.nutrition_score,
+                self.SHORTLIST_CANDIDATES
+            )
+            cache.put(cache_key, job['generation'], shortlist)
+        
+        # 대표 상태의 점수는 근사값이므로 후보만 실제 분석 결과로 다시 점수 계산
+        food_index = job['food_index']
+        rows = np.array(sorted(food_index[name] for name, _ in shortlist if name in food_index), dtype=int)
+        if len(rows) == 0:
+            return []
+        return self._score_top_foods(
+            [job['food_names'][row] for row in rows], job['nutrient_matrix'][rows], job['exclude'][rows],
+            analysis['deficient_nutrients'], analysis['excess_nutrients'],
+            analysis['remaining_allowance'], analysis['current_intake'],
+            analysis['targets'], analysis['analysis_summary']['nutrition_score'],
+            self.CACHED_CANDIDATES
+        )
+    
+    @staticmethod
+    def _apply_preferences(ranked_foods: List, food_names: List[str], food_index: Dict[str, int],
+                           k: int) -> List[Tuple[str, float, float]]:
+        """
+        후보에 세션 선호도 적용 후 상위 k개 선택
+        
+        Args:
+            ranked_foods: (음식명, 점수) 후보 목록 (점수 내림차순)
+            food_names: 영양소 행렬의 음식명 목록
+            food_index: 음식명 -> 행 번호
+            k: 선택할 개수
+            
+        Returns:
+            (음식명, 점수, 선호도 가산점) 목록 (점수 내림차순, 동점이면 원래 순서)
+        """
+        ranked_foods = [(name, score) for name, score in ranked_foods if name in food_index]
+        if not ranked_foods:
+            return []
+        
+        rows = np.array([food_index[name] for name, _ in ranked_foods])
+        bonus, suppressed = SessionPreferenceService.get_rerank_terms(food_names, food_index, rows)
+        scores = np.array([score for _, score in ranked_foods]) + bonus
+        
+        positions = np.flatnonzero(~suppressed)
+        order = positions[np.lexsort((positions, -scores[positions]))][:k]
+        return [(ranked_foods[i][0], float(scores[i]), float(bonus[i])) for i in order]
+    
+    def _score_top_foods(self, food_names: List[str], nutrient_matrix: np.ndarray,
+                         exclude: np.ndarray, deficient: Dict, excess: Dict, remaining: Dict,
+                         current_intake: Dict, targets: Dict,
+                         current_score: float, k: int,
+                         bonus: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """
+        카탈로그 전체 점수 계산 후 상위 k개 선택
+        
+        Args:
+            exclude: 제외할 음식 마스크 (True면 제외)
+            k: 선택할 개수
+            bonus: 음식별 가산점 (세션 선호도, 영양 점수가 있는 음식에만 적용)
+            (나머지 인자는 _calculate_recommendation_scores와 같음)
+            
+        Returns:
+            (음식명, 점수) 목록 (점수 내림차순, 동점이면 카탈로그 순서)
+        """
+        candidate_mask = ~exclude
+        if not candidate_mask.any():
+            return []
+        
+        # 모든 음식의 점수를 한 번에 계산
+        scores = self._calculate_recommendation_scores(
+            nutrient_matrix, deficient, excess, remaining,
+            current_intake, targets, current_score
+        )
+        candidate_mask &= scores > 0
+        if bonus is not None:
+            scores = scores + bonus
+        
+        return [
+            (food_names[row], float(scores[row]))
+            for row in self._select_top_scores(scores, candidate_mask, k)
+        ]
+    
+    @staticmethod
+    def _nutrient_columns(nutrient_matrix: np.ndarray, nutrients: List[str]) -> np.ndarray:
+        """영양소 행렬에서 지정한 영양소 열만 순서대로 조회 (없는 영양소는 0)"""
+        columns = np.zeros((len(nutrient_matrix), len(nutrients)))
+        for position, nutrient in enumerate(nutrients):
+            if nutrient in NUTRIENT_KEYS:
+                columns[:, position] = nutrient_matrix[:, NUTRIENT_KEYS.index(nutrient)]
+        return columns
+    
+    def _calculate_recommendation_scores(self, nutrient_matrix: np.ndarray,
+                                         deficient: Dict, excess: Dict, remaining: Dict,
+                                         current_intake: Dict, targets: Dict,
+                                         current_score: float) -> np.ndarray:
         """
-        추천 점수 계산
+        모든 음식의 추천 점수를 한 번에 계산
+        
+        항목별 점수는 음식 x 영양소 행렬 연산으로 구하고, 영양소별 점수는 음식별로
+        계산하던 방식과 같은 순서로 더해 같은 점수(같은 순위)를 만듭니다.
         
         Args:
-            food_nutrition: 음식의 영양소 정보
+            nutrient_matrix: 음식별 영양소 행렬 (열 순서: NUTRIENT_KEYS)
             deficient: 부족한 영양소
             excess: 과잉 영양소
             remaining: 남은 허용량
+            current_intake: 현재 섭취량
+            targets: 목표 섭취량
+            current_score: 현재 섭취량의 영양 점수
             
         Returns:
-            추천 점수 (0-100)
+            음식별 추천 점수 배열 (0 이상)
         """
-        score = 0
+        scores = np.zeros(len(nutrient_matrix))
+        
+        # 부족한 영양소 보충 점수 (부족분 대비 음식의 영양소 비율, 최대 30점)
+        deficient = {nutrient: value for nutrient, value in deficient.items() if value > 0}
+        if deficient:
+            food_values = self._nutrient_columns(nutrient_matrix, list(deficient))
+            contributions = np.minimum(food_values / np.array(list(deficient.values())), 1.0) * 30
+            contributions = np.where(food_values > 0, contributions, 0.0)
+            for position in range(contributions.shape[1]):
+                scores += contributions[:, position]
+        
+        # 과잉 영양소 페널티 (최대 -20점)
+        excess = {nutrient: value for nutrient, value in excess.items() if value > 0}
+        if excess:
+            food_values = self._nutrient_columns(nutrient_matrix, list(excess))
+            penalties = np.minimum(food_values / np.array(list(excess.values())), 1.0) * 20
+            penalties = np.where(food_values > 0, penalties, 0.0)
+            for position in range(penalties.shape[1]):
+                scores -= penalties[:, position]
+        
+        # 남은 허용량 내에서의 적절성 점수 (남은 허용량의 10-50% 범위가 이상적)
+        remaining = {nutrient: value for nutrient, value in remaining.items() if value > 0}
+        if remaining:
+            ratio = (
+                self._nutrient_columns(nutrient_matrix, list(remaining))
+                / np.array(list(remaining.values()))
+            )
+            # 비율 구간: <0.05, [0.05,0.1), [0.1,0.5], (0.5,0.8], >0.8
+            band = np.zeros(ratio.shape, dtype=np.uint8)
+            for threshold in (0.05, 0.1):
+                band += ratio >= threshold
+            for threshold in (0.5, 0.8):
+                band += ratio > threshold
+            appropriateness = self.APPROPRIATENESS_BAND_SCORES[band]
+            scores += appropriateness.sum(axis=1) / len(remaining)
+        
+        # 전체 영양 균형 점수: 이 음식을 먹었을 때의 예상 영양 상태와 현재 상태 비교
+        if targets:
+            current_values = np.array([current_intake.get(nutrient, 0) for nutrient in targets], dtype=float)
+            projected_intake = current_values + self._nutrient_columns(nutrient_matrix, list(targets))
+            projected_scores = self.nutrition_calculator.calculate_nutrition_score_batch(
+                projected_intake, targets
+            )
+            # 영양 점수 개선도에 따른 보너스
+            scores += (projected_scores - current_score) * 0.5
         
-        # 부족한 영양소 보충 점수
-        for nutrient, deficiency in deficient.items():
-            food_value = food_nutrition.get(nutrient, 0)
-            if food_value > 0:
-                # 부족분 대비 음식의 영양소 비율
-                contribution_ratio = min(food_value / deficiency, 1.0)
-                score += contribution_ratio * 30  # 최대 30점
+        return np.maximum(scores, 0)  # 음수 점수 방지
+    
+    @staticmethod
+    def _select_top_scores(scores: np.ndarray, mask: np.ndarray, k: int) -> List[int]:
+        """
+        상위 k개 점수의 행 번호 (점수 내림차순, 동점이면 카탈로그 순서)
         
-        # 과잉 영양소 페널티
-        for nutrient, excess_amount in excess.items():
-            food_value = food_nutrition.get(nutrient, 0)
-            if food_value > 0:
-                # 과잉 영양소가 많은 음식은 점수 차감
-                penalty_ratio = min(food_value / excess_amount, 1.0)
-                score -= penalty_ratio * 20  # 최대 -20점
+        Args:
+            scores: 음식별 점수
+            mask: 후보 여부
+            k: 선택할 개수
+            
+        Returns:
+            행 번호 목록
+        """
+        candidates = np.flatnonzero(mask)
+        if k <= 0 or len(candidates) == 0:
+            return []
+        
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            # argpartition으로 k번째 점수를 찾고, 경계 동점은 카탈로그 순서대로 채움
+            kth_score = candidate_scores[np.argpartition(-candidate_scores, k - 1)[k - 1]]
+            above = candidates[candidate_scores > kth_score]
+            tied = candidates[candidate_scores == kth_score][:k - len(above)]
+            candidates = np.concatenate([above, tied])
+            candidate_scores = scores[candidates]
+        
+        order = np.lexsort((candidates, -candidate_scores))
+        return candidates[order].tolist()
+    
+    def find_gap_filling_foods(self, k: int = 5, meal_fraction: float = DEFAULT_MEAL_FRACTION,
+                               radius: Optional[float] = None,
+                               exclude_foods: List[str] = None) -> List[Dict]:
+        """
+        남은 필요량과 영양소 구성이 가장 가까운 음식 조회 (최근접 이웃)
         
-        # 남은 허용량 내에서의 적절성 점수
-        appropriateness_score = 0
-        valid_nutrients = 0
+        남은 허용량에 한 끼 비율을 곱한 벡터를 질의로, 목표량 기준으로 정규화하고
+        영양소 우선순위로 가중한 거리를 사용합니다.
         
-        for nutrient, remaining_amount in remaining.items():
-            food_value = food_nutrition.get(nutrient, 0)
-            if remaining_amount > 0:
-                # 남은 허용량의 10-50% 범위가 이상적
-                ratio = food_value / remaining_amount
-                if 0.1 <= ratio <= 0.5:
-                    appropriateness_score += 10
-                elif 0.05 <= ratio <= 0.8:
-                    appropriateness_score += 5
-                valid_nutrients += 1
-        
-        if valid_nutrients > 0:
-            score += appropriateness_score / valid_nutrients
-        
-        # 전체 영양 균형 점수
-        from utils.nutrition_utils import calculate_nutrition_score
-        profile = SessionProfileService.get_profile()
-        if profile and 'nutrition_targets' in profile:
-            current_intake = SessionIntakeService.get_current_totals()
-            
-            # 이 음식을 먹었을 때의 예상 영양 상태
-            projected_intake = current_intake.copy()
-            for nutrient, value in food_nutrition.items():
-                projected_intake[nutrient] = projected_intake.get(nutrient, 0) + value
-            
-            projected_score = calculate_nutrition_score(
-                projected_intake, profile['nutrition_targets']
-            )
-            current_score = calculate_nutrition_score(
-                current_intake, profile['nutrition_targets']
-            )
+        Args:
+            k: 최대 반환 개수
+            meal_fraction: 한 끼가 채울 남은 허용량 비율 (0-1)
+            radius: 최대 거리 (지정하면 반경 검색, 거리는 목표 대비 비율 단위)
+            exclude_foods: 추가로 제외할 음식명
             
-            # 영양 점수 개선도
-            improvement = projected_score - current_score
-            score += improvement * 0.5  # 개선도에 따른 보너스
+        Returns:
+            음식별 거리와 영양 정보 리스트 (거리 오름차순)
+        """
+        analysis = NutritionalGapAnalyzer().get_detailed_analysis()
+        targets = analysis['targets']
+        if not targets:
+            return []
         
-        return max(0, score)  # 음수 점수 방지
+        index = get_nutrient_neighbor_index()
+        query = np.array(
+            [analysis['remaining_allowance'].get(n, 0) * meal_fraction for n in NUTRIENT_KEYS]
+        )
+        weights = self._get_neighbor_weights(targets, analysis['priority_nutrients'])
+        
+        # 최근 먹은 음식, 요청한 음식, 식이 제한 제외
+        exclude = index.exclusion_mask(
+            self._get_recent_eaten_foods() + list(exclude_foods or []),
+            SessionProfileService.get_restriction_mask()
+        )
+        
+        if radius is None:
+            neighbors = index.nearest(query, weights, k, exclude)
+        else:
+            neighbors = index.within_radius(query, weights, radius, exclude, limit=k)
+        
+        results = []
+        for row, distance in neighbors:
+            food_name = index.food_names[row]
+            results.append({
+                'food_name': food_name,
+                'distance': round(distance, 4),
+                'nutrition_data': self.nutrition_data_service.get_nutrition_data(food_name)
+            })
+        return results
+    
+    @staticmethod
+    def _get_neighbor_weights(targets: Dict, priority_nutrients: Dict) -> np.ndarray:
+        """최근접 이웃 가중치 (우선순위 가중치 / 목표량², 목표가 없는 영양소는 0)"""
+        priorities = {}
+        for group, items in priority_nutrients.items():
+            for item in items:
+                priorities[item['nutrient']] = NEIGHBOR_PRIORITY_WEIGHTS.get(group, 1.0)
+        
+        weights = np.zeros(len(NUTRIENT_KEYS))
+        for position, nutrient in enumerate(NUTRIENT_KEYS):
+            target = targets.get(nutrient, 0)
+            if target > 0:
+                weights[position] = priorities.get(nutrient, 1.0) / (target * target)
+        return weights
     
     def _generate_reasoning(self, food_nutrition: Dict, deficient: Dict) -> str:
         """추천 이유 생성"""
@@ -445,9 +740,9 @@ class MenuRecommendationEngine:
         if not available_foods:
             return []
         
-        # 최근 먹은 음식 제외
-        recent_foods = self._get_recent_eaten_foods()
-        available_foods = [food for food in available_foods if food not in recent_foods]
+        # 최근 먹은 음식과 싫어요/관심 없음 음식 제외
+        excluded_foods = set(self._get_recent_eaten_foods()) | SessionPreferenceService.get_suppressed_foods()
+        available_foods = [food for food in available_foods if food not in excluded_foods]
         
         if not available_foods:
             return []
@@ -455,13 +750,20 @@ class MenuRecommendationEngine:
         # 다양한 영양소를 제공하는 음식들 선택
         recommendations = []
         
-        for food_name in available_foods[:max_recommendations]:
+        restriction_mask = SessionProfileService.get_restriction_mask()
+        
+        for food_name in available_foods:
+            if len(recommendations) >= max_recommendations:
+                break
+            
             nutrition_data = self.nutrition_data_service.get_nutrition_data(food_name)
-            if nutrition_data:
+            # 식이 제한에 걸리는 음식 제외
+            if nutrition_data and not nutrition_data.dietary_tags & restriction_mask:
                 recommendations.append({
                     'food_name': food_name,
                     'nutrition_data': nutrition_data,
                     'score': 70,  # 기본 점수
+                    'preference_bonus': 0.0,
                     'reasoning': '균형 잡힌 영양소 제공',
                     'benefits': ['다양한 영양소 공급', '식단 다양성 증진']
                 })
@@ -475,9 +777,14 @@ class NutritionalGapAnalyzer:
         self.recommendation_engine = RecommendationEngine()
     
     def get_detailed_analysis(self) -> Dict:
-        """상세 영양 분석 수행"""
+        """상세 영양 분석 수행 (요청당 한 번만 계산하고 이후에는 재사용)"""
         try:
-            return self.recommendation_engine.analyze_nutritional_gaps()
+            context = get_analysis_context()
+            if context.detailed_analysis is None:
+                context.detailed_analysis = self.recommendation_engine.analyze_nutritional_gaps(
+                    context=context
+                )
+            return context.detailed_analysis
         except Exception as e:
             logging.error(f"상세 영양 분석 중 오류: {str(e)}")
             return self._get_default_analysis()
@@ -485,7 +792,7 @@ class NutritionalGapAnalyzer:
     def get_nutrient_priorities(self) -> List[Dict]:
         """영양소 우선순위 목록 반환"""
         try:
-            analysis = self.recommendation_engine.analyze_nutritional_gaps()
+            analysis = self.get_detailed_analysis()
             priorities = analysis['priority_nutrients']
             
             # 우선순위 순으로 정렬된 리스트 생성
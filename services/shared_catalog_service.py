@@ -0,0 +1,209 @@
+"""
+워커 간 공유 영양 카탈로그 저장소 (SQLite WAL + 세대 번호)
+
+모든 gunicorn 워커가 같은 카탈로그를 보도록 영양 데이터를 공유 SQLite 파일에
+보관합니다. 카탈로그가 바뀔 때마다 세대 번호(generation)가 증가하며, 각 워커는
+요청마다 세대 번호만 확인하고 바뀐 경우에만 전체 카탈로그를 다시 읽습니다.
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import logging
+from typing import Dict, Optional, Tuple
+from utils.nutrition_utils import NutritionRecord
+from utils.shared_store import get_shared_connection
+
+class SharedCatalogStore:
+    """공유 영양 카탈로그 저장소"""
+    
+    DB_NAME = 'nutrition_catalog.db'
+    
+    def __init__(self, db_name: str = None):
+        """
+        Args:
+            db_name: 공유 DB 파일명 (기본: nutrition_catalog.db)
+        """
+        self.db_name = db_name or self.DB_NAME
+        self._create_tables()
+    
+    def _connection(self) -> sqlite3.Connection:
+        return get_shared_connection(self.db_name)
+    
+    def _create_tables(self):
+        """테이블 생성"""
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS catalog_meta ('
+            'key TEXT PRIMARY KEY, '
+            'value TEXT NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS catalog_foods ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'name TEXT NOT NULL UNIQUE, '
+            'record TEXT NOT NULL, '
+            "source TEXT NOT NULL DEFAULT 'file', "
+            'updated_at REAL NOT NULL)'
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('generation', '0')"
+        )
+        # 저장소 ID: 저장소를 새로 만들면 세대 번호가 1부터 다시 시작하므로 세대와 함께 버전에 사용
+        conn.execute(
+            "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('store_id', ?)",
+            (uuid.uuid4().hex,)
+        )
+    
+    def get_generation(self) -> int:
+        """현재 카탈로그 세대 번호 조회 (요청마다 호출되는 가벼운 쿼리)"""
+        row = self._connection().execute(
+            "SELECT value FROM catalog_meta WHERE key = 'generation'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        """메타데이터 조회"""
+        row = self._connection().execute(
+            'SELECT value FROM catalog_meta WHERE key = ?', (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def load_all(self) -> Tuple[int, Dict[str, NutritionRecord]]:
+        """
+        전체 카탈로그 조회
+        
+        Returns:
+            (세대 번호, 음식명 -> 영양 레코드) 튜플
+        """
+        conn = self._connection()
+        # 세대 번호와 데이터를 같은 스냅샷에서 읽음
+        conn.execute('BEGIN')
+        try:
+            generation = self.get_generation()
+            rows = conn.execute('SELECT name, record FROM catalog_foods ORDER BY id').fetchall()
+        finally:
+            conn.execute('COMMIT')
+        
+        records = {
+            name: NutritionRecord.from_dict(json.loads(record_json))
+            for name, record_json in rows
+        }
+        return generation, records
+    
+    def replace_file_records(self, records: Dict[str, NutritionRecord],
+                             fingerprint: str = None, skip_if_current: bool = False) -> Optional[int]:
+        """
+        파일에서 읽은 카탈로그로 교체 (런타임 추가 데이터는 유지)
+        
+        Args:
+            records: 음식명 -> 영양 레코드
+            fingerprint: 데이터 디렉토리 지문 (재시작 시 재로딩 필요 여부 판단용)
+            skip_if_current: 쓰기 잠금을 잡은 뒤 저장된 지문이 같으면 교체하지 않음
+                (동시에 시작한 워커들 중 하나만 게시하고 세대 번호를 한 번만 증가)
+        
+        Returns:
+            새 세대 번호 (교체하지 않았으면 None)
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if skip_if_current and fingerprint is not None:
+                stored = conn.execute(
+                    "SELECT value FROM catalog_meta WHERE key = 'fingerprint'"
+                ).fetchone()
+                if stored is not None and stored[0] == fingerprint and self.get_generation() > 0:
+                    conn.execute('COMMIT')
+                    logging.info("공유 카탈로그가 이미 같은 파일로 게시되어 있어 교체하지 않습니다.")
+                    return None
+            
+            existing_file_names = {
+                row[0] for row in conn.execute(
+                    "SELECT name FROM catalog_foods WHERE source = 'file'"
+                )
+            }
+            removed = existing_file_names - set(records.keys())
+            
+            conn.executemany(
+                'DELETE FROM catalog_foods WHERE name = ?',
+                [(name,) for name in removed]
+            )
+            conn.executemany(
+                'INSERT INTO catalog_foods (name, record, source, updated_at) '
+                "VALUES (?, ?, 'file', ?) "
+                'ON CONFLICT(name) DO UPDATE SET record = excluded.record, '
+                'source = excluded.source, updated_at = excluded.updated_at',
+                [
+                    (name, json.dumps(record.to_dict(), ensure_ascii=False), now)
+                    for name, record in records.items()
+                ]
+            )
+            
+            if fingerprint is not None:
+                self._set_meta(conn, 'fingerprint', fingerprint)
+            self._set_meta(conn, 'last_loaded', str(now))
+            generation = self._bump_generation(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        logging.info(f"공유 카탈로그 갱신: {len(records)}개, 세대 {generation}")
+        return generation
+    
+    def upsert_record(self, food_name: str, record: NutritionRecord,
+                      source: str = 'runtime') -> int:
+        """
+        단일 음식 추가/갱신
+        
+        Args:
+            food_name: 음식명
+            record: 영양 레코드
+            source: 데이터 출처 ('file' 또는 'runtime')
+        
+        Returns:
+            새 세대 번호
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT INTO catalog_foods (name, record, source, updated_at) '
+                'VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET record = excluded.record, '
+                'source = excluded.source, updated_at = excluded.updated_at',
+                (food_name, json.dumps(record.to_dict(), ensure_ascii=False), source, time.time())
+            )
+            generation = self._bump_generation(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        return generation
+    
+    def get_food_ids(self) -> Dict[str, int]:
+        """음식명 -> 고정 ID 매핑 조회 (음식명이 유지되는 한 ID는 바뀌지 않음)"""
+        return {
+            name: food_id for food_id, name in
+            self._connection().execute('SELECT id, name FROM catalog_foods')
+        }
+    
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+        conn.execute(
+            'INSERT INTO catalog_meta (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (key, value)
+        )
+    
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> int:
+        conn.execute(
+            "UPDATE catalog_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'"
+        )
+        return int(conn.execute(
+            "SELECT value FROM catalog_meta WHERE key = 'generation'"
+        ).fetchone()[0])
@@ -0,0 +1,434 @@
+"""
+외부 식품 영양 데이터(CSV/XLSX/JSON) 일괄 수집 유틸리티
+
+식품영양성분 데이터베이스처럼 수만 행 규모의 외부 데이터를 청크 단위로 읽어
+프로세스 풀에서 검증/정규화하고, 서비스가 바로 읽을 수 있는 컴파일된 카탈로그
+파일(JSON)로 저장합니다.
+"""
+
+import os
+import csv
+import json
+import time
+import logging
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.nutrition_utils import validate_nutrition_data, normalize_nutrition_data
+from utils.dietary_tag_utils import detect_dietary_tags, mask_to_tags
+
+# openpyxl은 선택 의존성 (XLSX 입력에만 필요)
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# 컴파일된 카탈로그 형식
+COMPILED_CATALOG_FORMAT = 'babmechu-nutrition-catalog'
+COMPILED_CATALOG_VERSION = 1
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# 원본 영양소 키 -> 허용하는 열 이름 (공백 제거, 소문자 기준으로 비교)
+COLUMN_ALIASES = {
+    'name': ['name', 'food_name', '식품명', '음식명', '식품이름'],
+    'g': ['g', 'serving_size', '1회제공량', '1회제공량(g)', '영양성분함량기준량', '기준량(g)'],
+    'e': ['e', 'calories', '에너지', '에너지(kcal)', '에너지(㎉)', '열량(kcal)'],
+    'cal': ['cal', 'carbohydrates', '탄수화물', '탄수화물(g)'],
+    'sug': ['sug', 'sugars', '당류', '당류(g)', '총당류(g)'],
+    'pro': ['pro', 'protein', '단백질', '단백질(g)'],
+    'fat': ['fat', '지방', '지방(g)'],
+    'total_sfa': ['total_sfa', 'saturated_fat', '포화지방', '포화지방산(g)', '총포화지방산(g)'],
+    'chol': ['chol', 'cholesterol', '콜레스테롤', '콜레스테롤(mg)'],
+    'na': ['na', 'sodium', '나트륨', '나트륨(mg)'],
+    'total_tfa': ['total_tfa', 'fiber', '식이섬유', '식이섬유(g)', '총식이섬유(g)'],
+    'ingredients': ['ingredients', '원재료', '원재료명', '재료'],
+    'allergens': ['allergens', '알레르기', '알레르기유발물질', '알레르기정보']
+}
+
+# 영양소가 아닌 메타데이터 키 (숫자 정리/검증에서 제외하고 식이 태그 생성에 사용)
+METADATA_KEYS = ('name', 'ingredients', 'allergens')
+
+# 결측값 표기
+MISSING_VALUES = {'', '-', 'n/a', 'na', 'null', 'none'}
+
+def _normalize_header(header) -> str:
+    """열 이름 비교용 정규화 (공백 제거, 소문자)"""
+    return ''.join(str(header or '').split()).lower()
+
+def _build_alias_lookup(overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """정규화된 열 이름 -> 원본 영양소 키"""
+    alias_lookup = {
+        _normalize_header(alias): key
+        for key, aliases in COLUMN_ALIASES.items()
+        for alias in aliases
+    }
+    for column, key in (overrides or {}).items():
+        alias_lookup[_normalize_header(column)] = key
+    return alias_lookup
+
+def _map_record_keys(record: Dict, alias_lookup: Dict[str, str]) -> Dict:
+    """JSON 레코드의 키를 원본 영양소 키로 변환 (알 수 없는 키는 무시)"""
+    raw = {}
+    for column, value in record.items():
+        key = alias_lookup.get(_normalize_header(column))
+        if key and key not in raw:
+            raw[key] = value
+    return raw
+
+def build_column_map(headers: List, overrides: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    원본 열 이름을 원본 영양소 키에 매핑
+    
+    Args:
+        headers: 입력 파일의 열 이름 목록
+        overrides: 사용자가 지정한 열 이름 -> 원본 영양소 키 매핑
+    
+    Returns:
+        원본 영양소 키 -> 열 번호
+    """
+    alias_lookup = _build_alias_lookup(overrides)
+    
+    column_map = {}
+    for index, header in enumerate(headers):
+        key = alias_lookup.get(_normalize_header(header))
+        if key and key not in column_map:
+            column_map[key] = index
+    
+    return column_map
+
+def _clean_value(value, missing_as_zero: bool):
+    """숫자 문자열 정리 (천 단위 구분 기호 제거, 결측값 처리)"""
+    if isinstance(value, str):
+        value = value.strip().replace(',', '')
+        if value.lower() in MISSING_VALUES:
+            return 0 if missing_as_zero else None
+    elif value is None:
+        return 0 if missing_as_zero else None
+    return value
+
+def _process_rows(task: Tuple) -> Dict:
+    """
+    청크 단위 행 검증/정규화 (프로세스 풀 작업 함수)
+    
+    Args:
+        task: (원본 레코드 목록, 열 매핑 또는 None, 결측값 0 처리 여부)
+    
+    Returns:
+        {'records': [(음식명, 레코드 딕셔너리)], 'rejects': 사유별 건수, 'rows': 행 수}
+    """
+    rows, column_map, missing_as_zero = task
+    records = []
+    rejects = Counter()
+    
+    for row in rows:
+        if column_map is not None:
+            # CSV/XLSX 행: 열 번호로 원본 영양소 키 구성
+            raw = {
+                key: row[index] for key, index in column_map.items()
+                if index < len(row)
+            }
+        else:
+            raw = row
+        
+        name = str(raw.get('name') or '').strip()
+        if not name:
+            rejects['missing_name'] += 1
+            continue
+        
+        raw_nutrition = {
+            key: _clean_value(value, missing_as_zero)
+            for key, value in raw.items() if key not in METADATA_KEYS
+        }
+        raw_nutrition = {key: value for key, value in raw_nutrition.items() if value is not None}
+        
+        # 서비스 로딩과 같은 검증 규칙 적용
+        if not validate_nutrition_data(raw_nutrition):
+            rejects['invalid_nutrition'] += 1
+            continue
+        
+        try:
+            serving_size = float(raw_nutrition.get('g', 100))
+        except (ValueError, TypeError):
+            rejects['invalid_serving_size'] += 1
+            continue
+        
+        records.append((name, {
+            'name': name,
+            'serving_size': serving_size,
+            'nutrition': normalize_nutrition_data(raw_nutrition),
+            'dietary_tags': mask_to_tags(
+                detect_dietary_tags(name, raw.get('ingredients'), raw.get('allergens'))
+            )
+        }))
+    
+    return {'records': records, 'rejects': rejects, 'rows': len(rows)}
+
+def _chunked(rows: Iterator, chunk_size: int) -> Iterator[List]:
+    """행 이터레이터를 청크 목록으로 분할"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _iter_csv_tasks(path: str, chunk_size: int, overrides: Optional[Dict],
+                    missing_as_zero: bool) -> Iterator[Tuple]:
+    """CSV 파일을 청크 단위 작업으로 읽기 (UTF-8 BOM/CP949 인코딩 지원)"""
+    encodings = ('utf-8-sig', 'cp949')
+    
+    for encoding in encodings:
+        try:
+            with open(path, 'r', encoding=encoding, newline='') as f:
+                f.readline()
+            break
+        except UnicodeDecodeError:
+            continue
+    
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        column_map = build_column_map(headers, overrides)
+        _check_column_map(path, column_map)
+        
+        for chunk in _chunked(reader, chunk_size):
+            yield chunk, column_map, missing_as_zero
+
+def _iter_xlsx_tasks(path: str, chunk_size: int, overrides: Optional[Dict],
+                     missing_as_zero: bool) -> Iterator[Tuple]:
+    """XLSX 파일(첫 번째 시트)을 청크 단위 작업으로 읽기"""
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("XLSX 입력을 읽으려면 openpyxl이 필요합니다: pip install openpyxl")
+    
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = list(next(rows, []))
+        column_map = build_column_map(headers, overrides)
+        _check_column_map(path, column_map)
+        
+        for chunk in _chunked(rows, chunk_size):
+            yield chunk, column_map, missing_as_zero
+    finally:
+        workbook.close()
+
+def _iter_json_tasks(path: str, chunk_size: int, overrides: Optional[Dict],
+                     missing_as_zero: bool) -> Iterator[Tuple]:
+    """
+    JSON/JSON Lines 파일을 청크 단위 작업으로 읽기
+    
+    지원 형식:
+        - 기존 음식 파일 형식 ({'data': {'food_info': {...} 또는 [...]}}) 또는 그 목록
+        - 평면 레코드 목록 ([{'식품명': ..., '에너지(kcal)': ...}, ...])
+        - JSON Lines (.jsonl, 한 줄에 레코드 하나, 스트리밍 처리)
+    """
+    if path.endswith('.jsonl'):
+        def iter_items():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        items = iter_items()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('records', [data])
+        items = iter(data)
+    
+    alias_lookup = _build_alias_lookup(overrides)
+    for chunk in _chunked(items, chunk_size):
+        raw_rows = []
+        for item in chunk:
+            if not isinstance(item, dict):
+                raw_rows.append({})
+                continue
+            
+            data = item.get('data')
+            food_info = data.get('food_info') if isinstance(data, dict) else None
+            if food_info is None:
+                raw_rows.append(_map_record_keys(item, alias_lookup))
+                continue
+            
+            # 기존 음식 파일 형식 (food_info가 목록인 묶음 파일 포함)
+            for info in (food_info if isinstance(food_info, list) else [food_info]):
+                raw = _map_record_keys(info.get('nutrition', {}), alias_lookup)
+                raw['name'] = info.get('name')
+                raw['ingredients'] = info.get('ingredients')
+                raw['allergens'] = info.get('allergens')
+                raw_rows.append(raw)
+        
+        yield raw_rows, None, missing_as_zero
+
+def _check_column_map(path: str, column_map: Dict[str, int]):
+    """필수 열 존재 확인 (음식명 열이 없으면 모든 행이 거부되므로 즉시 중단)"""
+    if 'name' not in column_map:
+        raise ValueError(f"음식명 열을 찾을 수 없습니다: {path} (--map 옵션으로 지정하세요)")
+    
+    missing = [
+        key for key in COLUMN_ALIASES
+        if key not in METADATA_KEYS and key != 'g' and key not in column_map
+    ]
+    if missing:
+        logging.warning(f"매핑되지 않은 영양소 열이 있습니다: {path} -> {missing}")
+
+SOURCE_READERS = {
+    '.csv': _iter_csv_tasks,
+    '.xlsx': _iter_xlsx_tasks,
+    '.json': _iter_json_tasks,
+    '.jsonl': _iter_json_tasks
+}
+
+def iter_source_tasks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      overrides: Optional[Dict[str, str]] = None,
+                      missing_as_zero: bool = False) -> Iterator[Tuple]:
+    """
+    입력 파일 형식에 맞는 청크 작업 이터레이터 반환
+    
+    Args:
+        path: 입력 파일 경로 (.csv, .xlsx, .json, .jsonl)
+        chunk_size: 청크당 행 수
+        overrides: 열 이름 -> 원본 영양소 키 매핑
+        missing_as_zero: 결측값('-', 빈 값)을 0으로 처리할지 여부
+    """
+    extension = os.path.splitext(path)[1].lower()
+    reader = SOURCE_READERS.get(extension)
+    if reader is None:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+    
+    return reader(path, chunk_size, overrides, missing_as_zero)
+
+def ingest_sources(paths: List[str], output_path: str, workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   overrides: Optional[Dict[str, str]] = None,
+                   missing_as_zero: bool = False) -> Dict:
+    """
+    여러 입력 파일을 병렬 처리해 컴파일된 카탈로그 작성
+    
+    같은 음식명이 여러 번 나오면 나중에 읽은 행이 우선합니다.
+    
+    Args:
+        paths: 입력 파일 경로 목록
+        output_path: 컴파일된 카탈로그 출력 경로
+        workers: 프로세스 수 (기본: CPU 수)
+        chunk_size: 청크당 행 수
+        overrides: 열 이름 -> 원본 영양소 키 매핑
+        missing_as_zero: 결측값을 0으로 처리할지 여부
+    
+    Returns:
+        처리 통계 (행 수, 채택/거부 건수, 처리 시간, 처리량)
+    """
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2  # 읽기가 처리보다 앞서 메모리를 채우지 않도록 제한
+    
+    foods = {}
+    rejects = Counter()
+    total_rows = 0
+    accepted_rows = 0
+    
+    def collect(result: Dict):
+        nonlocal total_rows, accepted_rows
+        total_rows += result['rows']
+        accepted_rows += len(result['records'])
+        rejects.update(result['rejects'])
+        foods.update(result['records'])
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path in paths:
+            # 중복 음식명의 우선순위가 일정하도록 결과는 청크 순서대로 반영
+            pending = {}
+            completed = {}
+            next_index = 0
+            
+            for index, task in enumerate(iter_source_tasks(path, chunk_size, overrides, missing_as_zero)):
+                pending[executor.submit(_process_rows, task)] = index
+                
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        completed[pending.pop(future)] = future.result()
+                    
+                    while next_index in completed:
+                        collect(completed.pop(next_index))
+                        next_index += 1
+            
+            for future, index in pending.items():
+                completed[index] = future.result()
+            for index in sorted(completed):
+                collect(completed[index])
+    
+    write_compiled_catalog(output_path, foods, sources=paths)
+    
+    elapsed = time.perf_counter() - start_time
+    return {
+        'sources': len(paths),
+        'rows': total_rows,
+        'accepted': accepted_rows,
+        'rejected': sum(rejects.values()),
+        'reject_reasons': dict(rejects),
+        'duplicates': accepted_rows - len(foods),
+        'foods': len(foods),
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(total_rows / elapsed) if elapsed > 0 else total_rows,
+        'output': output_path
+    }
+
+def write_compiled_catalog(output_path: str, foods: Dict[str, Dict], sources: List[str] = None):
+    """
+    컴파일된 카탈로그를 원자적으로 저장 (임시 파일 작성 후 교체)
+    
+    Args:
+        output_path: 출력 경로
+        foods: 음식명 -> {'name', 'serving_size', 'nutrition', 'dietary_tags'}
+        sources: 입력 파일 목록 (기록용)
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    
+    catalog = {
+        'format': COMPILED_CATALOG_FORMAT,
+        'version': COMPILED_CATALOG_VERSION,
+        'created_at': time.time(),
+        'sources': [os.path.basename(source) for source in (sources or [])],
+        'count': len(foods),
+        'foods': foods
+    }
+    
+    fd, temp_path = tempfile.mkstemp(prefix='.catalog-', suffix='.tmp', dir=output_dir)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            # json.dump는 작은 조각으로 나눠 쓰므로 한 번에 직렬화해서 기록
+            f.write(json.dumps(catalog, ensure_ascii=False, separators=(',', ':')))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def load_compiled_catalog(path: str) -> Dict[str, Dict]:
+    """
+    컴파일된 카탈로그 읽기
+    
+    Args:
+        path: 카탈로그 파일 경로
+    
+    Returns:
+        음식명 -> {'name', 'serving_size', 'nutrition', 'dietary_tags'}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    
+    if catalog.get('format') != COMPILED_CATALOG_FORMAT:
+        raise ValueError(f"컴파일된 카탈로그 형식이 아닙니다: {path}")
+    if catalog.get('version') != COMPILED_CATALOG_VERSION:
+        raise ValueError(f"지원하지 않는 카탈로그 버전입니다: {catalog.get('version')}")
+    
+    return catalog.get('foods', {})
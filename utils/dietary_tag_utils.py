@@ -0,0 +1,220 @@
+"""
+알레르기/식단 태그 비트셋 유틸리티
+
+음식마다 알레르기 유발 재료와 식단 분류(육류, 해산물 등)를 정수 비트셋으로 보관하고,
+프로필의 식이 제한을 같은 비트 배치의 마스크로 컴파일합니다. 카탈로그 전체 필터링은
+(태그 배열 & 제한 마스크) != 0 한 번으로 끝납니다.
+"""
+
+import re
+from typing import Iterable, List, Optional, Union
+
+# 태그 목록 (비트 순서 고정: 새 태그는 끝에만 추가)
+# 식품 알레르기 표시 대상 + 식단 구분용 태그
+DIETARY_TAGS = (
+    'egg', 'milk', 'buckwheat', 'peanut', 'soybean', 'wheat', 'mackerel', 'crab',
+    'shrimp', 'pork', 'peach', 'tomato', 'sulfite', 'walnut', 'chicken', 'beef',
+    'squid', 'shellfish', 'pine_nut', 'fish', 'other_seafood', 'other_meat'
+)
+
+DIETARY_TAG_BITS = {tag: 1 << position for position, tag in enumerate(DIETARY_TAGS)}
+
+DIETARY_TAG_NAMES = {
+    'egg': '난류', 'milk': '우유', 'buckwheat': '메밀', 'peanut': '땅콩',
+    'soybean': '대두', 'wheat': '밀', 'mackerel': '고등어', 'crab': '게',
+    'shrimp': '새우', 'pork': '돼지고기', 'peach': '복숭아', 'tomato': '토마토',
+    'sulfite': '아황산류', 'walnut': '호두', 'chicken': '닭고기', 'beef': '쇠고기',
+    'squid': '오징어', 'shellfish': '조개류', 'pine_nut': '잣', 'fish': '생선',
+    'other_seafood': '기타 해산물', 'other_meat': '기타 육류'
+}
+
+# 음식명/원재료에 포함되면 해당 태그를 붙이는 재료 키워드
+# 알레르기 필터는 놓치는 것보다 더 걸러내는 편이 안전하므로 넓게 잡음
+TAG_KEYWORDS = {
+    'egg': ('계란', '달걀', '메추리알', '에그', '오믈렛', '지단'),
+    'milk': ('우유', '치즈', '크림', '버터', '요거트', '요구르트', '라떼', '밀크'),
+    'buckwheat': ('메밀', '막국수'),
+    'peanut': ('땅콩', '피넛'),
+    'soybean': ('콩', '두부', '된장', '청국장', '유부', '두유'),
+    'wheat': ('밀가루', '국수', '수제비', '라면', '우동', '짜장', '짬뽕', '만두', '빵',
+              '파스타', '스파게티', '피자', '부침개', '전병', '케이크', '쿠키', '과자',
+              '튀김', '돈가스', '돈까스'),
+    'mackerel': ('고등어',),
+    'crab': ('꽃게', '대게', '게장', '게살', '킹크랩', '크랩'),
+    'shrimp': ('새우', '대하', '쉬림프'),
+    'pork': ('돼지', '돈육', '삼겹', '목살', '항정', '제육', '족발', '보쌈', '순대', '순댓',
+             '감자탕', '돈가스', '돈까스', '베이컨', '소시지', '부대찌개'),
+    'peach': ('복숭아', '황도', '백도'),
+    'tomato': ('토마토', '케첩'),
+    'sulfite': ('와인', '건포도'),
+    'walnut': ('호두',),
+    'chicken': ('닭', '치킨', '삼계탕', '백숙'),
+    'beef': ('소고기', '쇠고기', '한우', '불고기', '소갈비', '갈비탕', '갈비찜', '육회',
+             '육개장', '곰탕', '설렁탕', '사골', '차돌', '곱창', '대창', '스테이크', '장조림'),
+    'squid': ('오징어', '한치'),
+    'shellfish': ('조개', '홍합', '바지락', '전복', '꼬막', '가리비', '재첩', '소라', '골뱅이',
+                  '굴국', '굴전', '굴밥', '생굴', '굴무침', '어리굴젓'),
+    'pine_nut': ('잣',),
+    'fish': ('생선', '갈치', '조기', '굴비', '명태', '동태', '황태', '북어', '코다리', '삼치',
+             '꽁치', '연어', '참치', '광어', '우럭', '도미', '멸치', '어묵', '장어', '아귀',
+             '대구', '가자미', '생선회', '물회', '회덮밥'),
+    'other_seafood': ('낙지', '문어', '쭈꾸미', '주꾸미', '해삼', '멍게', '해물'),
+    'other_meat': ('오리', '양고기', '염소')
+}
+
+MEAT_TAGS = ('pork', 'beef', 'chicken', 'other_meat')
+SEAFOOD_TAGS = ('fish', 'mackerel', 'crab', 'shrimp', 'squid', 'shellfish', 'other_seafood')
+
+# 식단 유형 -> 제외할 태그
+DIET_TYPE_TAGS = {
+    'vegetarian': MEAT_TAGS + SEAFOOD_TAGS,
+    'vegan': MEAT_TAGS + SEAFOOD_TAGS + ('egg', 'milk'),
+    'pescatarian': MEAT_TAGS,
+    'no_pork': ('pork',),
+    'halal': ('pork', 'sulfite'),
+    'no_beef': ('beef',),
+    'gluten_free': ('wheat',),
+    'lactose_free': ('milk',)
+}
+
+DIET_TYPE_NAMES = {
+    'vegetarian': '채식', 'vegan': '비건', 'pescatarian': '페스코',
+    'no_pork': '돼지고기 제외', 'halal': '할랄', 'no_beef': '소고기 제외',
+    'gluten_free': '글루텐 프리', 'lactose_free': '유당 제외'
+}
+
+# 제한 이름 별칭 (태그 코드, 한글 이름 외에 자주 쓰는 표현)
+RESTRICTION_ALIASES = {
+    '계란': 'egg', '달걀': 'egg', '쇠고기': 'beef', '소고기': 'beef', '콩': 'soybean',
+    '갑각류': 'crab', '해산물': 'seafood', '육류': 'meat', '고기': 'meat',
+    '채식주의': 'vegetarian', '락토오보': 'vegetarian', '베지테리언': 'vegetarian',
+    '페스코테리언': 'pescatarian', '글루텐': 'gluten_free', '유당': 'lactose_free'
+}
+
+_SEPARATORS = re.compile(r'[,/·;|]')
+
+def _normalize(text: str) -> str:
+    """비교용 정규화 (공백 제거, 소문자)"""
+    return ''.join(str(text).split()).lower()
+
+def _build_restriction_lookup() -> dict:
+    """정규화된 제한 이름 -> 제외할 태그 비트 마스크"""
+    lookup = {}
+    for tag, bit in DIETARY_TAG_BITS.items():
+        lookup[_normalize(tag)] = bit
+        lookup[_normalize(DIETARY_TAG_NAMES[tag])] = bit
+    
+    for diet_type, tags in DIET_TYPE_TAGS.items():
+        mask = tags_to_mask(tags)
+        lookup[_normalize(diet_type)] = mask
+        lookup[_normalize(DIET_TYPE_NAMES[diet_type])] = mask
+    
+    lookup['meat'] = tags_to_mask(MEAT_TAGS)
+    lookup['seafood'] = tags_to_mask(SEAFOOD_TAGS)
+    for alias, target in RESTRICTION_ALIASES.items():
+        lookup[_normalize(alias)] = lookup[target]
+    return lookup
+
+def tags_to_mask(tags: Iterable[str]) -> int:
+    """
+    태그 코드 목록을 비트셋으로 변환 (알 수 없는 태그는 무시)
+    
+    Args:
+        tags: 태그 코드 목록 (예: ['peanut', 'milk'])
+    
+    Returns:
+        태그 비트셋
+    """
+    mask = 0
+    for tag in tags:
+        mask |= DIETARY_TAG_BITS.get(tag, 0)
+    return mask
+
+def mask_to_tags(mask: int) -> List[str]:
+    """
+    비트셋을 태그 코드 목록으로 변환 (저장/응답용, DIETARY_TAGS 순서)
+    
+    Args:
+        mask: 태그 비트셋
+    
+    Returns:
+        태그 코드 목록
+    """
+    return [tag for tag in DIETARY_TAGS if mask & DIETARY_TAG_BITS[tag]]
+
+def _split_terms(value: Union[str, Iterable[str], None]) -> List[str]:
+    """쉼표 등으로 구분된 문자열 또는 목록을 항목 목록으로 변환"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = _SEPARATORS.split(value)
+    return [str(term).strip() for term in value if str(term).strip()]
+
+def detect_dietary_tags(food_name: str,
+                        ingredients: Union[str, Iterable[str], None] = None,
+                        allergens: Union[str, Iterable[str], None] = None) -> int:
+    """
+    음식의 알레르기/식단 태그 비트셋 생성
+    
+    원재료/알레르기 메타데이터가 있으면 함께 사용하고, 음식명의 재료 키워드는
+    항상 확인합니다 (메타데이터가 불완전해도 놓치지 않도록 합집합 사용).
+    
+    Args:
+        food_name: 음식명
+        ingredients: 원재료 목록 또는 쉼표로 구분된 문자열
+        allergens: 알레르기 유발 물질 목록 (태그 코드 또는 한글 이름)
+    
+    Returns:
+        태그 비트셋
+    """
+    mask = 0
+    
+    # 명시된 알레르기 정보
+    for allergen in _split_terms(allergens):
+        mask |= _RESTRICTION_LOOKUP.get(_normalize(allergen), 0)
+    
+    # 음식명과 원재료의 재료 키워드
+    texts = [_normalize(food_name)] + [_normalize(term) for term in _split_terms(ingredients)]
+    for tag, keywords in TAG_KEYWORDS.items():
+        if any(keyword in text for text in texts for keyword in keywords):
+            mask |= DIETARY_TAG_BITS[tag]
+    
+    return mask
+
+def compile_restriction_mask(restrictions: Optional[Iterable]) -> int:
+    """
+    프로필 식이 제한을 제외 태그 마스크로 컴파일
+    
+    Args:
+        restrictions: 제한 목록. 문자열(태그 코드, 한글 이름, 식단 유형) 또는
+            {'restriction_type': ..., 'value': ...} 형식의 딕셔너리 (DietaryRestriction과 같은 형식)
+    
+    Returns:
+        제외할 태그 비트 마스크 (알 수 없는 제한은 무시)
+    """
+    mask = 0
+    for restriction in restrictions or []:
+        if isinstance(restriction, dict):
+            restriction = restriction.get('value')
+        if isinstance(restriction, str) and restriction.strip():
+            mask |= _RESTRICTION_LOOKUP.get(_normalize(restriction), 0)
+    return mask
+
+def get_unknown_restrictions(restrictions: Optional[Iterable]) -> List[str]:
+    """
+    인식할 수 없는 식이 제한 목록 (입력 검증용)
+    
+    Args:
+        restrictions: 제한 목록
+    
+    Returns:
+        알 수 없는 제한 이름 목록
+    """
+    unknown = []
+    for restriction in restrictions or []:
+        value = restriction.get('value') if isinstance(restriction, dict) else restriction
+        if not isinstance(value, str) or _normalize(value) not in _RESTRICTION_LOOKUP:
+            unknown.append(str(value))
+    return unknown
+
+_RESTRICTION_LOOKUP = _build_restriction_lookup()
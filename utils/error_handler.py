@@ -4,11 +4,16 @@
 
 import logging
 import smtplib
+import sqlite3
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 import os
+from utils.notification_dispatcher import NotificationDispatcher, register_shutdown_flush
+from utils.shared_store import get_shared_connection
 
 class AdminNotificationService:
     """관리자 알림 서비스"""
@@ -20,6 +25,15 @@ class AdminNotificationService:
         self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
         self.smtp_username = os.getenv('SMTP_USERNAME', '')
         self.smtp_password = os.getenv('SMTP_PASSWORD', '')
+        self.smtp_use_tls = os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
+        self.smtp_sender = os.getenv('SMTP_FROM', self.smtp_username or self.admin_email)
+        
+        # 요청 처리와 분리된 백그라운드 전송 (중복 알림은 시간 창 단위로 병합)
+        self.dispatcher = NotificationDispatcher(
+            self._send_digest,
+            window_seconds=float(os.getenv('ADMIN_NOTIFICATION_WINDOW', '60'))
+        )
+        register_shutdown_flush(self.dispatcher)
     
     def notify_missing_nutrition_data(self, food_name: str, context: Dict = None):
         """영양 데이터 누락 알림"""
@@ -38,7 +52,7 @@ class AdminNotificationService:
         if context:
             message += f"\n추가 정보: {context}"
         
-        self._send_notification("영양 데이터 누락", message)
+        self._send_notification("영양 데이터 누락", message, f"missing:{food_name}")
         
         # 로그에도 기록
         logging.warning(f"영양 데이터 누락: {food_name}")
@@ -55,7 +69,7 @@ class AdminNotificationService:
         조치 필요: JSON 파일의 형식을 확인하고 수정해주세요.
         """
         
-        self._send_notification("JSON 파싱 오류", message)
+        self._send_notification("JSON 파싱 오류", message, f"parsing:{file_path}")
         
         # 로그에도 기록
         logging.error(f"JSON 파싱 오류 {file_path}: {error_message}")
@@ -76,64 +90,254 @@ class AdminNotificationService:
         
         message += "\n조치 필요: 영양 데이터의 형식과 값을 확인해주세요."
         
-        self._send_notification("데이터 유효성 오류", message)
+        self._send_notification("데이터 유효성 오류", message, f"validation:{food_name}")
         
         # 로그에도 기록
         logging.error(f"데이터 유효성 오류 {food_name}: {validation_errors}")
     
-    def _send_notification(self, subject: str, message: str):
-        """실제 알림 전송"""
+    def _send_notification(self, subject: str, message: str, dedupe_key: str = None):
+        """알림 전송 예약 (요청 처리를 막지 않음)"""
         # 콘솔 로그 (항상 실행)
         logging.info(f"관리자 알림: {subject}")
         
-        # 이메일 전송 (설정된 경우에만)
+        # 이메일 전송 (설정된 경우에만) - 백그라운드 큐에 등록
         if self.email_enabled and self.admin_email:
-            try:
-                self._send_email(subject, message)
-            except Exception as e:
-                logging.error(f"이메일 전송 실패: {str(e)}")
+            self.dispatcher.submit(dedupe_key or subject, subject, message)
     
-    def _send_email(self, subject: str, message: str):
-        """이메일 전송"""
-        if not all([self.smtp_server, self.smtp_username, self.smtp_password, self.admin_email]):
+    def _send_digest(self, entries: List[Dict]):
+        """
+        병합된 알림 전송 (하나의 SMTP 연결 재사용)
+        
+        Args:
+            entries: 디스패처가 병합한 알림 목록 (subject, message, count, first_seen, last_seen)
+        """
+        # SMTP_USERNAME/SMTP_PASSWORD는 선택 사항 (둘 다 있을 때만 로그인, 인증 없는 내부 릴레이 허용)
+        if not all([self.smtp_server, self.admin_email]):
             return
         
+        if len(entries) == 1 and entries[0]['count'] == 1:
+            subject = entries[0]['subject']
+            message = entries[0]['message']
+        else:
+            subject = f"알림 요약 ({len(entries)}건)"
+            message = self._build_digest_message(entries)
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10)
+        try:
+            if self.smtp_use_tls:
+                server.starttls()
+            if self.smtp_username and self.smtp_password:
+                server.login(self.smtp_username, self.smtp_password)
+            server.send_message(self._build_email(subject, message))
+        finally:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                server.close()
+    
+    def _build_digest_message(self, entries: List[Dict]) -> str:
+        """알림 요약 본문 생성"""
+        sections = []
+        
+        for entry in entries:
+            first_seen = datetime.fromtimestamp(entry['first_seen']).strftime('%Y-%m-%d %H:%M:%S')
+            last_seen = datetime.fromtimestamp(entry['last_seen']).strftime('%Y-%m-%d %H:%M:%S')
+            sections.append(
+                f"[{entry['subject']}] {entry['count']}회 발생 ({first_seen} ~ {last_seen})\n"
+                f"{entry['message']}"
+            )
+        
+        return "\n\n".join(sections)
+    
+    def _build_email(self, subject: str, message: str) -> MIMEMultipart:
+        """이메일 메시지 생성"""
         msg = MIMEMultipart()
-        msg['From'] = self.smtp_username
+        msg['From'] = self.smtp_sender
         msg['To'] = self.admin_email
         msg['Subject'] = f"[밥메추] {subject}"
         
         msg.attach(MIMEText(message, 'plain', 'utf-8'))
+        return msg
+
+class SharedErrorCounter:
+    """
+    워커 간 공유되는 오류 횟수 카운터 (시간 창 단위 집계, 최대 항목 수 제한)
+    
+    요청 경로에서는 메모리에 증가분만 쌓고, 알림 디스패처 워커가 모인 증가분을
+    하나의 트랜잭션으로 공유 DB에 반영합니다. 집계는 시간 창마다 새로 시작하므로
+    재시작이나 오래 전 오류와 관계없이 창의 첫 발생 시 다시 알림이 나갑니다.
+    """
+    
+    DB_NAME = 'admin_notifications.db'
+    MAX_ENTRIES = 500
+    WINDOW_SECONDS = float(os.getenv('ADMIN_ERROR_COUNT_WINDOW', '3600'))
+    
+    def __init__(self, dispatcher: NotificationDispatcher, max_entries: int = None,
+                 window_seconds: float = None):
+        self.dispatcher = dispatcher
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.window_seconds = window_seconds or self.WINDOW_SECONDS
+        self._memory_counts = {}  # 공유 DB를 쓸 수 없을 때의 대체 저장소 (키 -> [횟수, 창 시작 시각])
+        self._pending = {}  # 아직 반영되지 않은 증가분 (키 -> [증가분, 알림 콜백])
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+        self._shared = True
+        
+        try:
+            get_shared_connection(self.DB_NAME).execute(
+                'CREATE TABLE IF NOT EXISTS error_windows ('
+                'error_key TEXT PRIMARY KEY, '
+                'count INTEGER NOT NULL, '
+                'window_start REAL NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"공유 오류 카운터를 사용할 수 없어 메모리 카운터를 사용합니다: {str(e)}")
+            self._shared = False
+    
+    def increment(self, key: str, on_milestone: Callable[[int], None] = None):
+        """
+        오류 횟수 증가 예약 (논블로킹)
+        
+        Args:
+            key: 오류 키
+            on_milestone: 시간 창의 첫 발생 또는 10회 단위를 넘었을 때 누적 횟수로 호출할 함수
+                (디스패처 워커 스레드에서 호출됨)
+        """
+        with self._lock:
+            entry = self._pending.setdefault(key, [0, None])
+            entry[0] += 1
+            if on_milestone is not None:
+                entry[1] = on_milestone
+            
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        if not self.dispatcher.run_in_worker(self.flush):
+            with self._lock:
+                self._flush_scheduled = False
+    
+    def flush(self):
+        """모인 증가분을 반영하고 알림 기준을 넘은 키의 콜백 호출"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._flush_scheduled = False
         
-        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-        server.starttls()
-        server.login(self.smtp_username, self.smtp_password)
-        server.send_message(msg)
-        server.quit()
+        if not pending:
+            return
+        
+        changes = None
+        if self._shared:
+            try:
+                changes = self._apply_shared(pending)
+            except sqlite3.Error as e:
+                logging.error(f"공유 오류 카운터 갱신 실패: {str(e)}")
+        if changes is None:
+            changes = self._apply_memory(pending)
+        
+        for key, (previous, count) in changes.items():
+            on_milestone = pending[key][1]
+            # 첫 번째 오류이거나 10회 단위를 넘었을 때 알림
+            if on_milestone is not None and (previous == 0 or count // 10 > previous // 10):
+                on_milestone(count)
+    
+    def _apply_shared(self, pending: Dict) -> Dict[str, tuple]:
+        """증가분을 하나의 트랜잭션으로 공유 DB에 반영 (키 -> (이전 횟수, 누적 횟수))"""
+        now = time.time()
+        changes = {}
+        conn = get_shared_connection(self.DB_NAME)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for key, (delta, _) in pending.items():
+                row = conn.execute(
+                    'SELECT count, window_start FROM error_windows WHERE error_key = ?', (key,)
+                ).fetchone()
+                if row is None or now - row[1] >= self.window_seconds:
+                    previous, window_start = 0, now
+                else:
+                    previous, window_start = row
+                
+                conn.execute(
+                    'INSERT OR REPLACE INTO error_windows (error_key, count, window_start, updated_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, previous + delta, window_start, now)
+                )
+                changes[key] = (previous, previous + delta)
+            
+            # 오래된 항목부터 정리하여 크기 제한 유지
+            conn.execute(
+                'DELETE FROM error_windows WHERE error_key IN ('
+                'SELECT error_key FROM error_windows ORDER BY updated_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            conn.execute('COMMIT')
+            return changes
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def _apply_memory(self, pending: Dict) -> Dict[str, tuple]:
+        """증가분을 메모리 카운터에 반영 (키 -> (이전 횟수, 누적 횟수))"""
+        now = time.time()
+        changes = {}
+        
+        with self._lock:
+            for key, (delta, _) in pending.items():
+                entry = self._memory_counts.pop(key, None)
+                if entry is None or now - entry[1] >= self.window_seconds:
+                    entry = [0, now]
+                
+                # 가장 오래 갱신되지 않은 항목부터 정리하여 크기 제한 유지
+                if len(self._memory_counts) >= self.max_entries:
+                    del self._memory_counts[next(iter(self._memory_counts))]
+                changes[key] = (entry[0], entry[0] + delta)
+                self._memory_counts[key] = [entry[0] + delta, entry[1]]
+        
+        return changes
+    
+    def snapshot(self) -> Dict[str, int]:
+        """현재 시간 창의 오류 횟수 스냅샷 반환"""
+        cutoff = time.time() - self.window_seconds
+        
+        if self._shared:
+            try:
+                rows = get_shared_connection(self.DB_NAME).execute(
+                    'SELECT error_key, count FROM error_windows WHERE window_start > ? '
+                    'ORDER BY updated_at DESC',
+                    (cutoff,)
+                ).fetchall()
+                return {key: count for key, count in rows}
+            except sqlite3.Error as e:
+                logging.error(f"공유 오류 카운터 조회 실패: {str(e)}")
+        
+        with self._lock:
+            return {key: count for key, (count, window_start) in self._memory_counts.items()
+                    if window_start > cutoff}
 
 class NutritionDataErrorHandler:
     """영양 데이터 오류 처리기"""
     
     def __init__(self):
         self.notification_service = AdminNotificationService()
-        self.error_counts = {}  # 오류 발생 횟수 추적
+        # 오류 발생 횟수 추적 (워커 간 공유, 알림 디스패처 워커에서 일괄 반영)
+        self.error_counts = SharedErrorCounter(self.notification_service.dispatcher)
     
     def handle_missing_data(self, food_name: str) -> Dict:
         """영양 데이터 누락 처리"""
-        # 오류 횟수 증가
-        self.error_counts[f"missing_{food_name}"] = self.error_counts.get(f"missing_{food_name}", 0) + 1
-        
-        # 첫 번째 오류이거나 10회마다 알림
-        if self.error_counts[f"missing_{food_name}"] == 1 or self.error_counts[f"missing_{food_name}"] % 10 == 0:
-            self.notification_service.notify_missing_nutrition_data(
-                food_name, 
-                {'error_count': self.error_counts[f"missing_{food_name}"]}
+        # 오류 횟수 증가 (시간 창의 첫 번째 오류이거나 10회마다 알림)
+        self.error_counts.increment(
+            f"missing_{food_name}",
+            lambda error_count: self.notification_service.notify_missing_nutrition_data(
+                food_name,
+                {'error_count': error_count}
             )
+        )
         
-        # 대체 데이터 생성
-        from services.nutrition_data_service import get_nutrition_data_service
-        nutrition_service = get_nutrition_data_service()
-        fallback_data = nutrition_service.get_fallback_nutrition_data(food_name)
+        # 대체 데이터 생성 (서비스 초기화 중에도 호출되므로 싱글톤을 거치지 않음)
+        from services.nutrition_data_service import NutritionDataService
+        fallback_data = NutritionDataService.get_fallback_nutrition_data(food_name)
         
         return {
             'status': 'fallback_used',
@@ -151,10 +355,9 @@ class NutritionDataErrorHandler:
         # 파일명에서 음식명 추출
         food_name = os.path.splitext(os.path.basename(file_path))[0]
         
-        # 대체 데이터 제공
-        from services.nutrition_data_service import get_nutrition_data_service
-        nutrition_service = get_nutrition_data_service()
-        fallback_data = nutrition_service.get_fallback_nutrition_data(food_name)
+        # 대체 데이터 제공 (서비스 초기화 중에도 호출되므로 싱글톤을 거치지 않음)
+        from services.nutrition_data_service import NutritionDataService
+        fallback_data = NutritionDataService.get_fallback_nutrition_data(food_name)
         
         return {
             'status': 'parsing_error',
@@ -168,10 +371,9 @@ class NutritionDataErrorHandler:
         # 관리자에게 알림
         self.notification_service.notify_data_validation_error(food_name, validation_errors)
         
-        # 대체 데이터 제공
-        from services.nutrition_data_service import get_nutrition_data_service
-        nutrition_service = get_nutrition_data_service()
-        fallback_data = nutrition_service.get_fallback_nutrition_data(food_name)
+        # 대체 데이터 제공 (서비스 초기화 중에도 호출되므로 싱글톤을 거치지 않음)
+        from services.nutrition_data_service import NutritionDataService
+        fallback_data = NutritionDataService.get_fallback_nutrition_data(food_name)
         
         return {
             'status': 'validation_error',
@@ -182,9 +384,12 @@ class NutritionDataErrorHandler:
     
     def get_error_statistics(self) -> Dict:
         """오류 통계 반환"""
+        error_details = self.error_counts.snapshot()
+        
         return {
-            'total_errors': len(self.error_counts),
-            'error_details': self.error_counts.copy()
+            'total_errors': len(error_details),
+            'error_details': error_details,
+            'notification_queue': self.notification_service.dispatcher.get_statistics()
         }
 
 # 전역 인스턴스
@@ -0,0 +1,76 @@
+"""
+한글 자모 분해/초성 추출 유틸리티 (음식 검색용)
+"""
+
+from functools import lru_cache
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+# 겹모음/겹받침은 입력 순서대로 나눔 (입력 중인 글자와 비교하기 위함)
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ'
+}
+
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+def normalize_search_text(text: str) -> str:
+    """검색 비교용 정규화 (공백 제거, 소문자)"""
+    return ''.join(text.split()).lower()
+
+def get_choseong(text: str) -> str:
+    """
+    초성 문자열 추출 (한글 음절이 아닌 문자는 그대로 유지)
+    
+    Args:
+        text: 원본 문자열 (예: '감자탕')
+    
+    Returns:
+        초성 문자열 (예: 'ㄱㅈㅌ')
+    """
+    result = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            result.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(char)
+    return ''.join(result)
+
+def decompose_jamo(text: str) -> str:
+    """
+    자모 단위 분해 (겹모음/겹받침도 나눔)
+    
+    Args:
+        text: 원본 문자열 (예: '감자탕')
+    
+    Returns:
+        자모 문자열 (예: 'ㄱㅏㅁㅈㅏㅌㅏㅇ')
+    """
+    return ''.join(map(_decompose_char, text))
+
+@lru_cache(maxsize=None)
+def _decompose_char(char: str) -> str:
+    """한 글자 자모 분해 (음식명에 쓰이는 글자 종류는 많지 않아 결과를 보관)"""
+    code = ord(char)
+    if not HANGUL_BASE <= code <= HANGUL_END:
+        return COMPOUND_JAMO.get(char, char)
+    
+    offset = code - HANGUL_BASE
+    jamo = (
+        CHOSEONG[offset // 588]
+        + JUNGSEONG[(offset % 588) // 28]
+        + JONGSEONG[offset % 28]
+    )
+    return ''.join(COMPOUND_JAMO.get(part, part) for part in jamo)
+
+def is_choseong_query(text: str) -> bool:
+    """초성으로만 이루어진 검색어인지 확인 (예: 'ㄱㅈㅌ')"""
+    return bool(text) and all(char in _CHOSEONG_SET for char in text)
@@ -0,0 +1,204 @@
+"""
+HTTP 캐시(ETag/조건부 GET) 관련 유틸리티
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from flask import request, jsonify, Response, current_app
+
+# brotli는 선택 의존성 (없으면 gzip만 제공)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 응답 구조가 바뀌면 올려서 기존 ETag를 모두 무효화
+RESPONSE_SCHEMA_VERSION = '1'
+
+# 코드에 고정된 응답의 버전 (프로세스당 한 번만 생성, ETag는 본문 해시라 내용이 바뀌면 함께 바뀜)
+STATIC_CONTENT_VERSION = 'static'
+
+# 압축본 ETag 접미사 (인코딩별로 다른 강한 ETag 사용)
+ENCODING_ETAG_SUFFIXES = {'br': 'br', 'gzip': 'gz'}
+
+# 캐시 정책
+CATALOG_MAX_AGE = 300  # 카탈로그 기반 응답 (5분)
+STATIC_MAX_AGE = 3600  # 정적 안내 문구 (1시간)
+
+def make_etag(*parts) -> str:
+    """
+    버전 구성 요소로부터 ETag 생성
+
+    Args:
+        parts: ETag에 반영할 값들 (엔드포인트명, 카탈로그 세대, 모델 버전 등)
+
+    Returns:
+        따옴표 없는 ETag 문자열
+    """
+    digest = hashlib.sha1(RESPONSE_SCHEMA_VERSION.encode('utf-8'))
+    for part in parts:
+        digest.update(b'\x00')
+        digest.update(str(part).encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+def get_catalog_version() -> str:
+    """영양 카탈로그 버전 (세대 번호 + 카탈로그 지문, 저장소를 새로 만들어 세대가 다시 시작해도 구분)"""
+    from services.nutrition_data_service import get_nutrition_data_service
+    service = get_nutrition_data_service()
+    return f"catalog-{service.generation}-{service.fingerprint}"
+
+def get_profile_version(profile: Optional[Dict]) -> str:
+    """프로필 목표 기반 버전 (프로필이 없으면 'anonymous')"""
+    if not profile or 'nutrition_targets' not in profile:
+        return 'anonymous'
+
+    targets = json.dumps(profile['nutrition_targets'], sort_keys=True)
+    return 'profile-' + hashlib.sha1(targets.encode('utf-8')).hexdigest()[:12]
+
+def conditional_json_response(etag: str, build_payload: Callable[[], Dict],
+                              max_age: int = CATALOG_MAX_AGE,
+                              private: bool = False) -> Response:
+    """
+    If-None-Match를 처리하는 JSON 응답 생성
+
+    ETag가 일치하면 응답 본문을 만들지 않고 304를 반환합니다.
+
+    Args:
+        etag: 현재 응답의 ETag
+        build_payload: 응답 데이터를 만드는 함수 (ETag 불일치 시에만 호출)
+        max_age: 캐시 유지 시간 (초)
+        private: 사용자(세션)별 응답 여부 (공유 캐시 저장 금지)
+
+    Returns:
+        200 또는 304 응답
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build_payload())
+
+    response.set_etag(etag)
+    _apply_cache_headers(response, max_age, private)
+    return response
+
+def _apply_cache_headers(response: Response, max_age: int, private: bool):
+    """Cache-Control/Vary 헤더 설정"""
+    if private:
+        # 세션마다 다른 응답: 브라우저만 보관하고 매번 ETag로 재검증
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add('Cookie')
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+
+class PrecomputedResponseCache:
+    """
+    정적 JSON 응답 사전 계산 캐시
+
+    등록된 응답을 한 번만 만들어 직렬화된 바이트와 압축본(gzip, br)을 보관하고,
+    요청 시에는 그대로 전송합니다. 버전이 바뀔 때만 다시 만들며, 외부 데이터에 의존하지
+    않는 응답은 버전을 생략해 프로세스당 한 번만 만듭니다.
+    """
+
+    def __init__(self):
+        self._builders = {}
+        self._entries = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable[[], Dict]):
+        """
+        사전 계산할 응답 등록
+
+        Args:
+            name: 응답 이름
+            builder: 응답 데이터를 만드는 함수
+        """
+        with self._lock:
+            self._builders[name] = builder
+            self._entries.pop(name, None)
+
+    def warm(self, version: str = STATIC_CONTENT_VERSION):
+        """
+        등록된 모든 응답 사전 계산 (버전이 같으면 아무것도 하지 않음)
+
+        Args:
+            version: 응답 내용이 의존하는 데이터의 버전 (외부 데이터와 무관하면 생략)
+        """
+        if version == self._version and len(self._entries) == len(self._builders):
+            return
+
+        with self._lock:
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+
+            for name, builder in self._builders.items():
+                if name not in self._entries:
+                    self._entries[name] = self._build_entry(builder)
+
+        logging.info(f"정적 응답 사전 계산 완료: {len(self._entries)}개 (버전 {version})")
+
+    def get_payload(self, name: str, version: str = STATIC_CONTENT_VERSION) -> Dict:
+        """사전 계산된 응답 데이터 반환 (다른 응답에 포함할 때 사용, 수정 금지)"""
+        self.warm(version)
+        return self._entries[name]['payload']
+
+    def response(self, name: str, version: str = STATIC_CONTENT_VERSION,
+                 max_age: int = STATIC_MAX_AGE) -> Response:
+        """
+        사전 계산된 응답 전송 (If-None-Match 처리 및 압축본 선택 포함)
+
+        Args:
+            name: 응답 이름
+            version: 응답 내용이 의존하는 데이터의 버전 (외부 데이터와 무관하면 생략)
+            max_age: 캐시 유지 시간 (초)
+
+        Returns:
+            200 또는 304 응답
+        """
+        self.warm(version)
+        entry = self._entries[name]
+
+        # 인코딩마다 다른 표현이므로 ETag도 인코딩별로 구분 (강한 검증자 공유 금지)
+        accept_encodings = request.accept_encodings
+        if entry['br'] is not None and accept_encodings['br']:
+            encoding, body = 'br', entry['br']
+        elif accept_encodings['gzip']:
+            encoding, body = 'gzip', entry['gzip']
+        else:
+            encoding, body = None, entry['body']
+        etag = f"{entry['etag']}-{ENCODING_ETAG_SUFFIXES[encoding]}" if encoding else entry['etag']
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        _apply_cache_headers(response, max_age, private=False)
+        return response
+
+    @staticmethod
+    def _build_entry(builder: Callable[[], Dict]) -> Dict:
+        """응답 데이터 생성, 직렬화, 압축"""
+        payload = builder()
+        # jsonify와 같은 직렬화 결과 사용
+        body = current_app.json.response(payload).get_data()
+
+        return {
+            'payload': payload,
+            'body': body,
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+            'br': brotli.compress(body) if BROTLI_AVAILABLE else None,
+            'etag': make_etag('precomputed', hashlib.sha1(body).hexdigest())
+        }
@@ -0,0 +1,51 @@
+"""
+한 끼 구성용 음식 분류 유틸리티 (밥 + 국/찌개 + 반찬)
+"""
+
+import re
+
+# 한 끼 구성 분류
+STAPLE = 'staple'  # 주식 (밥, 죽, 면)
+SOUP = 'soup'      # 국/찌개/탕/전골
+SIDE = 'side'      # 반찬
+OTHER = 'other'    # 떡, 후식, 음료 등
+
+MEAL_CATEGORIES = (STAPLE, SOUP, SIDE, OTHER)
+
+MEAL_CATEGORY_NAMES = {
+    STAPLE: '주식',
+    SOUP: '국/찌개',
+    SIDE: '반찬',
+    OTHER: '기타'
+}
+
+# 음식명 끝부분으로 분류 (위에서부터 순서대로 확인: '떡국'은 국보다 주식이 먼저)
+CATEGORY_SUFFIXES = (
+    (STAPLE, ('떡국', '만둣국', '만두국', '수제비', '칼국수', '국수', '냉면', '라면', '우동',
+              '짬뽕', '짜장면', '면', '밥', '죽', '덮밥', '김밥')),
+    (SOUP, ('국', '탕', '찌개', '전골', '육개장')),
+    (OTHER, ('떡', '빵', '케이크', '과자', '쿠키', '아이스크림', '주스', '음료', '우유')),
+    (SIDE, ('나물', '김치', '무침', '조림', '볶음', '구이', '찜', '전', '부침', '튀김',
+            '장아찌', '젓갈', '샐러드', '잡채', '두부', '계란말이', '쌈'))
+)
+
+_PARENTHESES = re.compile(r'\([^)]*\)')
+
+def get_meal_category(food_name: str) -> str:
+    """
+    음식명으로 한 끼 구성 분류 판단
+    
+    Args:
+        food_name: 음식명 (예: '김치찌개', '시금치나물')
+    
+    Returns:
+        STAPLE, SOUP, SIDE, OTHER 중 하나
+    """
+    name = ''.join(_PARENTHESES.sub('', food_name).split())
+    
+    # 식품 DB 형식('국밥_돼지머리')은 전체 이름, 앞부분 순서로 확인
+    for part in (name, *name.split('_')):
+        for category, suffixes in CATEGORY_SUFFIXES:
+            if part.endswith(suffixes):
+                return category
+    return OTHER
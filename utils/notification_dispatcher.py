@@ -0,0 +1,213 @@
+"""
+관리자 알림 비동기 전송 디스패처
+
+요청 처리 중 발생한 알림을 제한된 크기의 큐에 넣고, 단일 백그라운드 스레드가
+일정 시간 동안 모은 뒤 중복을 합쳐 한 번에 전송합니다. 오류 횟수 기록처럼
+요청 경로에서 떼어낼 작업도 같은 스레드에서 실행합니다.
+"""
+
+import time
+import queue
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+_STOP = object()
+
+class NotificationDispatcher:
+    """알림 큐잉/병합/재시도 디스패처"""
+    
+    def __init__(self, send_batch: Callable[[List[Dict]], None],
+                 window_seconds: float = 60.0, max_queue_size: int = 1000,
+                 max_pending_keys: int = 200, base_backoff: float = 5.0,
+                 max_backoff: float = 600.0):
+        """
+        Args:
+            send_batch: 병합된 알림 목록을 실제로 전송하는 함수 (실패 시 예외 발생)
+            window_seconds: 중복 알림을 모으는 시간 (초)
+            max_queue_size: 대기 큐 최대 크기 (초과 시 알림 폐기)
+            max_pending_keys: 한 번에 모아둘 수 있는 서로 다른 알림 수
+            base_backoff: 전송 실패 시 첫 재시도 대기 시간 (초)
+            max_backoff: 재시도 대기 시간 상한 (초)
+        """
+        self.send_batch = send_batch
+        self.window_seconds = window_seconds
+        self.max_pending_keys = max_pending_keys
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        
+        # 운영 통계
+        self.dropped_count = 0
+        self.sent_batches = 0
+        self.failed_attempts = 0
+    
+    def submit(self, key: str, subject: str, message: str) -> bool:
+        """
+        알림 등록 (논블로킹)
+        
+        Args:
+            key: 중복 판단 키 (같은 키는 한 항목으로 병합)
+            subject: 알림 제목
+            message: 알림 본문
+        
+        Returns:
+            큐 등록 성공 여부
+        """
+        self._ensure_worker()
+        
+        try:
+            self._queue.put_nowait({
+                'key': key,
+                'subject': subject,
+                'message': message,
+                'created_at': time.time()
+            })
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            logging.warning(f"알림 큐가 가득 차 알림을 폐기합니다: {subject}")
+            return False
+    
+    def run_in_worker(self, task: Callable[[], None]) -> bool:
+        """
+        작업을 워커 스레드에서 실행하도록 예약 (논블로킹)
+        
+        Args:
+            task: 인자 없이 호출되는 함수 (예외는 워커가 기록하고 무시)
+        
+        Returns:
+            큐 등록 성공 여부
+        """
+        self._ensure_worker()
+        
+        try:
+            self._queue.put_nowait({'task': task})
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            logging.warning("알림 큐가 가득 차 작업을 예약하지 못했습니다.")
+            return False
+    
+    def stop(self, timeout: float = 5.0):
+        """남은 알림을 전송하고 워커 종료"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logging.warning("알림 큐가 가득 차 종료 신호를 보내지 못했습니다.")
+            return
+        thread.join(timeout)
+    
+    def get_statistics(self) -> Dict:
+        """디스패처 통계 반환"""
+        return {
+            'queued': self._queue.qsize(),
+            'dropped': self.dropped_count,
+            'sent_batches': self.sent_batches,
+            'failed_attempts': self.failed_attempts,
+            'worker_alive': bool(self._thread and self._thread.is_alive())
+        }
+    
+    def _ensure_worker(self):
+        """워커 스레드 지연 시작 (fork된 워커 프로세스마다 새로 시작)"""
+        with self._lock:
+            # fork 이후 자식 프로세스에서는 부모의 스레드가 살아있지 않음
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            self._thread = threading.Thread(
+                target=self._run, name='admin-notification-dispatcher', daemon=True
+            )
+            self._thread.start()
+    
+    def _run(self):
+        """큐를 비우며 시간 창 단위로 병합 전송"""
+        pending = OrderedDict()
+        next_flush_at: Optional[float] = None
+        backoff = 0.0
+        
+        while True:
+            timeout = None
+            if next_flush_at is not None:
+                timeout = max(0.0, next_flush_at - time.monotonic())
+            
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if item is _STOP:
+                if pending:
+                    self._flush(pending)
+                return
+            
+            if item is not None and 'task' in item:
+                self._run_task(item['task'])
+                item = None
+            
+            if item is not None:
+                self._coalesce(pending, item)
+                if next_flush_at is None:
+                    next_flush_at = time.monotonic() + self.window_seconds
+            
+            if pending and next_flush_at is not None and time.monotonic() >= next_flush_at:
+                if self._flush(pending):
+                    backoff = 0.0
+                    next_flush_at = None
+                else:
+                    backoff = min(max(backoff * 2, self.base_backoff), self.max_backoff)
+                    next_flush_at = time.monotonic() + backoff
+                    logging.warning(f"알림 전송 실패, {backoff:.0f}초 후 재시도합니다.")
+    
+    def _run_task(self, task: Callable[[], None]):
+        """예약된 작업 실행 (실패해도 워커는 계속 동작)"""
+        try:
+            task()
+        except Exception as e:
+            logging.error(f"알림 워커 작업 실행 중 오류 발생: {str(e)}")
+    
+    def _coalesce(self, pending: OrderedDict, item: Dict):
+        """같은 키의 알림을 하나로 병합"""
+        entry = pending.get(item['key'])
+        if entry is not None:
+            entry['count'] += 1
+            entry['last_seen'] = item['created_at']
+            return
+        
+        if len(pending) >= self.max_pending_keys:
+            self.dropped_count += 1
+            return
+        
+        pending[item['key']] = {
+            'subject': item['subject'],
+            'message': item['message'],
+            'count': 1,
+            'first_seen': item['created_at'],
+            'last_seen': item['created_at']
+        }
+    
+    def _flush(self, pending: OrderedDict) -> bool:
+        """모인 알림 전송 (성공 시 비움)"""
+        try:
+            self.send_batch(list(pending.values()))
+        except Exception as e:
+            self.failed_attempts += 1
+            logging.error(f"관리자 알림 일괄 전송 실패: {str(e)}")
+            return False
+        
+        self.sent_batches += 1
+        pending.clear()
+        return True
+
+def register_shutdown_flush(dispatcher: NotificationDispatcher):
+    """프로세스 종료 시 남은 알림 전송"""
+    atexit.register(dispatcher.stop)
@@ -2,7 +2,103 @@
 영양소 관련 유틸리티 함수들
 """
 
-from typing import Dict, List
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List
+from utils.dietary_tag_utils import detect_dietary_tags, tags_to_mask, mask_to_tags
+
+# 표준 영양소 키 (순서 고정)
+NUTRIENT_KEYS = (
+    'calories', 'carbohydrates', 'sugars', 'protein', 'fat',
+    'saturated_fat', 'cholesterol', 'sodium', 'fiber'
+)
+
+@dataclass(frozen=True, slots=True)
+class NutritionRecord(Mapping):
+    """
+    읽기 전용 음식 영양 레코드
+    
+    여러 요청/호출자가 복사 없이 공유할 수 있도록 불변으로 유지합니다.
+    기존 딕셔너리 접근 방식(record['nutrition'], record.get('is_fallback'))을
+    그대로 지원하며, JSON 직렬화가 필요할 때만 to_dict()로 변환합니다.
+    
+    dietary_tags(알레르기/식단 태그 비트셋)는 속성으로만 읽고 딕셔너리 접근에는
+    나타나지 않으며, to_dict()에서는 태그 코드 목록으로 저장합니다.
+    """
+    name: str
+    serving_size: float
+    nutrition: Mapping
+    dietary_tags: int = 0
+    is_fallback: bool = False
+    
+    # 딕셔너리 접근으로 노출하는 필드 (기존 딕셔너리 형식과 같은 키)
+    _MAPPING_FIELDS = ('name', 'serving_size', 'nutrition', 'is_fallback')
+    
+    def __post_init__(self):
+        if not isinstance(self.nutrition, MappingProxyType):
+            object.__setattr__(self, 'nutrition', MappingProxyType(dict(self.nutrition)))
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NutritionRecord':
+        """
+        딕셔너리 형식의 영양 데이터를 레코드로 변환
+        
+        Args:
+            data: {'name', 'serving_size', 'nutrition', 'dietary_tags', 'is_fallback'} 형식의 딕셔너리
+                (dietary_tags가 없으면 음식명으로 태그 생성)
+            
+        Returns:
+            영양 레코드
+        """
+        if isinstance(data, NutritionRecord):
+            return data
+        
+        name = data.get('name', '')
+        dietary_tags = data.get('dietary_tags')
+        
+        return cls(
+            name=name,
+            serving_size=data.get('serving_size', 100),
+            nutrition=data.get('nutrition', {}),
+            dietary_tags=(
+                tags_to_mask(dietary_tags) if dietary_tags is not None
+                else detect_dietary_tags(name)
+            ),
+            is_fallback=bool(data.get('is_fallback', False))
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화용 딕셔너리 반환"""
+        result = {
+            'name': self.name,
+            'serving_size': self.serving_size,
+            'nutrition': dict(self.nutrition)
+        }
+        
+        if self.dietary_tags:
+            result['dietary_tags'] = mask_to_tags(self.dietary_tags)
+        
+        if self.is_fallback:
+            result['is_fallback'] = True
+        
+        return result
+    
+    def __getitem__(self, key: str):
+        if key == 'is_fallback' and not self.is_fallback:
+            # 기존 딕셔너리에는 대체 데이터일 때만 키가 존재
+            raise KeyError(key)
+        if key in self._MAPPING_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        for key in self._MAPPING_FIELDS:
+            if key != 'is_fallback' or self.is_fallback:
+                yield key
+    
+    def __len__(self):
+        return len(self._MAPPING_FIELDS) - (0 if self.is_fallback else 1)
 
 def validate_nutrition_data(nutrition_data: Dict) -> bool:
     """
@@ -135,20 +231,30 @@ def calculate_nutrition_score(nutrition_data: Dict[str, float],
     
     for nutrient, target in targets.items():
         if target > 0:
-            current = nutrition_data.get(nutrient, 0)
-            ratio = current / target
-            
-            # 최적 비율 (80-120%)에서 최고점
-            if 0.8 <= ratio <= 1.2:
-                score = 100
-            elif 0.5 <= ratio < 0.8 or 1.2 < ratio <= 1.5:
-                score = 70
-            elif 0.3 <= ratio < 0.5 or 1.5 < ratio <= 2.0:
-                score = 40
-            else:
-                score = 10
-            
-            total_score += score
+            total_score += calculate_nutrient_balance_score(nutrition_data.get(nutrient, 0), target)
             nutrient_count += 1
     
-    return round(total_score / nutrient_count if nutrient_count > 0 else 0, 1)
\ No newline at end of file
+    return round(total_score / nutrient_count if nutrient_count > 0 else 0, 1)
+
+def calculate_nutrient_balance_score(current: float, target: float) -> int:
+    """
+    영양소 하나의 균형 점수 (calculate_nutrition_score의 영양소별 점수)
+    
+    Args:
+        current: 현재 섭취량
+        target: 목표 섭취량 (0보다 커야 함)
+        
+    Returns:
+        10, 40, 70, 100 중 하나
+    """
+    ratio = current / target
+    
+    # 최적 비율 (80-120%)에서 최고점
+    if 0.8 <= ratio <= 1.2:
+        return 100
+    elif 0.5 <= ratio < 0.8 or 1.2 < ratio <= 1.5:
+        return 70
+    elif 0.3 <= ratio < 0.5 or 1.5 < ratio <= 2.0:
+        return 40
+    else:
+        return 10
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""
+서버 측 세션 저장소 (SQLite WAL, 키 단위 지연 로딩)
+
+기본 쿠키 세션은 프로필, 날짜별 섭취 기록, 추천 이력 등 세션 전체를 응답마다 직렬화/
+서명해 쿠키로 보내므로 크기 제한(4KB)을 쉽게 넘습니다. 이 저장소는 쿠키에는 임의의
+세션 ID만 싣고, 값은 (세션 ID, 키) 단위로 공유 SQLite에 보관합니다. 요청에서 읽은
+키만 조회하고, 응답 시에는 바뀐 키만 다시 씁니다.
+"""
+
+import os
+import re
+import time
+import random
+import sqlite3
+import logging
+import secrets
+from datetime import timedelta
+from typing import Dict, Iterator, Optional, Set
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from utils.shared_store import get_shared_connection
+
+_SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{43}$')
+
+class ServerSideSession(SessionMixin):
+    """서버 측 세션 (키 단위 지연 로딩, 바뀐 키 추적)"""
+    
+    def __init__(self, interface: 'SQLiteSessionInterface', session_id: Optional[str] = None,
+                 last_access: float = 0.0):
+        """
+        Args:
+            interface: 값을 읽을 세션 저장소
+            session_id: 기존 세션 ID (None이면 새 세션, 값을 처음 쓸 때 ID 발급)
+            last_access: 기존 세션의 마지막 접근 시각
+        """
+        self.interface = interface
+        self.session_id = session_id
+        self.last_access = last_access
+        self.new = session_id is None
+        self.modified = False
+        self.accessed = False
+        
+        self._values = {}      # 읽었거나 쓴 값
+        self._originals = {}   # 읽은 시점의 직렬화 값 (변경 비교용)
+        self._missing = set()  # 저장소에 없다고 확인한 키
+        self._deleted = set()  # 이번 요청에서 삭제한 키
+        self._keys = None      # 저장소의 키 목록 (순회할 때만 조회)
+    
+    def __getitem__(self, key: str):
+        self.accessed = True
+        if key in self._values:
+            return self._values[key]
+        if key in self._deleted or key in self._missing or self.new:
+            raise KeyError(key)
+        if self._keys is not None and key not in self._keys:
+            raise KeyError(key)
+        
+        text = self.interface.load_value(self.session_id, key)
+        if text is None:
+            self._missing.add(key)
+            raise KeyError(key)
+        
+        value = self.interface.serializer.loads(text)
+        self._values[key] = value
+        self._originals[key] = text
+        return value
+    
+    def __setitem__(self, key: str, value):
+        self.accessed = True
+        self.modified = True
+        self._values[key] = value
+        self._deleted.discard(key)
+        self._missing.discard(key)
+    
+    def __delitem__(self, key: str):
+        self[key]  # 없으면 KeyError
+        self.modified = True
+        del self._values[key]
+        self._deleted.add(key)
+    
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current_keys())
+    
+    def __len__(self) -> int:
+        return len(self._current_keys())
+    
+    def clear(self):
+        """모든 키 삭제 (응답 시 세션 행과 쿠키 삭제)"""
+        keys = self._current_keys()
+        self.accessed = True
+        if keys:
+            self.modified = True
+        self._deleted.update(keys)
+        self._values.clear()
+    
+    def get_dirty_values(self) -> Dict[str, str]:
+        """
+        저장할 키와 직렬화 값 (새로 쓴 키, 읽은 뒤 내용이 바뀐 키)
+        
+        Returns:
+            키 -> 직렬화 값
+        """
+        if not self.modified:
+            return {}
+        
+        dirty = {}
+        for key, value in self._values.items():
+            text = self.interface.serializer.dumps(value)
+            if text != self._originals.get(key):
+                dirty[key] = text
+        return dirty
+    
+    def get_deleted_keys(self) -> Set[str]:
+        """저장소에서 지울 키"""
+        return set() if self.new else set(self._deleted)
+    
+    def _current_keys(self) -> Set[str]:
+        """저장소 키 목록 + 이번 요청에서 쓴 키 - 삭제한 키"""
+        self.accessed = True
+        if self._keys is None:
+            self._keys = set() if self.new else self.interface.load_keys(self.session_id)
+        return (self._keys | set(self._values)) - self._deleted
+
+class SQLiteSessionInterface(SessionInterface):
+    """공유 SQLite 기반 서버 측 세션 인터페이스 (쿠키에는 세션 ID만 저장)"""
+    
+    DB_NAME = 'sessions.db'
+    
+    # 마지막 접근 시각 갱신 간격 (값이 바뀌지 않은 요청도 이 간격마다 한 번 기록)
+    TOUCH_INTERVAL = float(os.getenv('SESSION_TOUCH_INTERVAL', '300'))
+    # 만료 세션 정리 확률 (저장 요청당)
+    CLEANUP_PROBABILITY = 0.01
+    
+    serializer = TaggedJSONSerializer()
+    
+    def __init__(self):
+        conn = get_shared_connection(self.DB_NAME)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'session_id TEXT PRIMARY KEY, '
+            'created_at REAL NOT NULL, '
+            'last_access REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions (last_access)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS session_values ('
+            'session_id TEXT NOT NULL, '
+            'key TEXT NOT NULL, '
+            'value TEXT NOT NULL, '
+            'PRIMARY KEY (session_id, key)) WITHOUT ROWID'
+        )
+    
+    def open_session(self, app, request) -> ServerSideSession:
+        """쿠키의 세션 ID로 세션 열기 (없거나 만료된 ID는 새 세션)"""
+        session_id = request.cookies.get(self.get_cookie_name(app))
+        if not session_id or not _SESSION_ID_PATTERN.match(session_id):
+            return ServerSideSession(self)
+        
+        try:
+            row = get_shared_connection(self.DB_NAME).execute(
+                'SELECT last_access FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"세션 조회 실패: {str(e)}")
+            return ServerSideSession(self)
+        
+        if row is None or row[0] < time.time() - self._get_lifetime_seconds(app):
+            return ServerSideSession(self)
+        return ServerSideSession(self, session_id, row[0])
+    
+    def save_session(self, app, session: ServerSideSession, response):
+        """바뀐 키만 저장하고 필요할 때만 쿠키 설정"""
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+        
+        if session.accessed:
+            response.vary.add('Cookie')
+        
+        dirty = session.get_dirty_values()
+        deleted = session.get_deleted_keys() - set(dirty)
+        now = time.time()
+        
+        # 모든 키가 삭제된 세션은 저장소와 쿠키에서 제거 (삭제가 있을 때만 키 목록 확인)
+        if deleted and not session:
+            self._delete_session(session.session_id)
+            response.delete_cookie(
+                name, domain=domain, path=path, secure=secure,
+                samesite=samesite, httponly=httponly
+            )
+            return
+        
+        if session.new and not dirty:
+            return
+        
+        touch = now - session.last_access >= self.TOUCH_INTERVAL
+        if dirty or deleted or touch:
+            if session.new:
+                session.session_id = secrets.token_urlsafe(32)
+            self._write(session.session_id, dirty, deleted, now)
+            if random.random() < self.CLEANUP_PROBABILITY:
+                self._delete_expired(now - self._get_lifetime_seconds(app))
+        
+        # 쿠키 값(세션 ID)은 바뀌지 않으므로 새 세션이거나 만료 시각을 연장할 때만 설정
+        if session.new or (session.permanent and app.config['SESSION_REFRESH_EACH_REQUEST']):
+            response.set_cookie(
+                name, session.session_id, expires=self.get_expiration_time(app, session),
+                httponly=httponly, domain=domain, path=path, secure=secure, samesite=samesite
+            )
+            response.vary.add('Cookie')
+    
+    def load_value(self, session_id: str, key: str) -> Optional[str]:
+        """키 하나의 직렬화 값 조회"""
+        try:
+            row = get_shared_connection(self.DB_NAME).execute(
+                'SELECT value FROM session_values WHERE session_id = ? AND key = ?',
+                (session_id, key)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"세션 값 조회 실패 ({key}): {str(e)}")
+            return None
+        return row[0] if row else None
+    
+    def load_keys(self, session_id: str) -> Set[str]:
+        """세션의 키 목록 조회 (값은 읽지 않음)"""
+        try:
+            rows = get_shared_connection(self.DB_NAME).execute(
+                'SELECT key FROM session_values WHERE session_id = ?', (session_id,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"세션 키 목록 조회 실패: {str(e)}")
+            return set()
+        return {row[0] for row in rows}
+    
+    def _write(self, session_id: str, dirty: Dict[str, str], deleted: Set[str], now: float):
+        """바뀐 키 저장, 삭제한 키 제거, 마지막 접근 시각 갱신 (한 트랜잭션)"""
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT INTO sessions (session_id, created_at, last_access) VALUES (?, ?, ?) '
+                    'ON CONFLICT(session_id) DO UPDATE SET last_access = excluded.last_access',
+                    (session_id, now, now)
+                )
+                if dirty:
+                    conn.executemany(
+                        'INSERT INTO session_values (session_id, key, value) VALUES (?, ?, ?) '
+                        'ON CONFLICT(session_id, key) DO UPDATE SET value = excluded.value',
+                        [(session_id, key, text) for key, text in dirty.items()]
+                    )
+                if deleted:
+                    conn.executemany(
+                        'DELETE FROM session_values WHERE session_id = ? AND key = ?',
+                        [(session_id, key) for key in deleted]
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logging.error(f"세션 저장 실패: {str(e)}")
+    
+    def _delete_session(self, session_id: str):
+        """세션 행과 값 전체 삭제"""
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('DELETE FROM session_values WHERE session_id = ?', (session_id,))
+                conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logging.error(f"세션 삭제 실패: {str(e)}")
+    
+    def _delete_expired(self, cutoff: float):
+        """마지막 접근이 cutoff 이전인 세션 정리"""
+        try:
+            conn = get_shared_connection(self.DB_NAME)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'DELETE FROM session_values WHERE session_id IN ('
+                    'SELECT session_id FROM sessions WHERE last_access < ?)', (cutoff,)
+                )
+                removed = conn.execute('DELETE FROM sessions WHERE last_access < ?', (cutoff,)).rowcount
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            if removed:
+                logging.info(f"만료 세션 {removed}개 정리")
+        except sqlite3.Error as e:
+            logging.error(f"만료 세션 정리 실패: {str(e)}")
+    
+    @staticmethod
+    def _get_lifetime_seconds(app) -> float:
+        """세션 유효 기간 (마지막 접근 기준, PERMANENT_SESSION_LIFETIME)"""
+        lifetime = app.permanent_session_lifetime
+        if isinstance(lifetime, timedelta):
+            return lifetime.total_seconds()
+        return float(lifetime)
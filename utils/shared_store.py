@@ -0,0 +1,75 @@
+"""
+워커 간 공유 상태 저장소 유틸리티 (SQLite WAL 모드)
+
+gunicorn 워커들은 서로 메모리를 공유하지 않으므로, 여러 워커가 함께 봐야 하는
+작은 상태(카운터, 세대 번호 등)는 로컬 SQLite 파일에 보관합니다.
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+
+SHARED_STATE_DIR = os.getenv('SHARED_STATE_DIR', 'instance')
+
+_thread_local = threading.local()
+
+def get_shared_db_path(db_name: str) -> str:
+    """
+    공유 DB 파일 경로 반환
+    
+    Args:
+        db_name: DB 파일명 (예: 'admin_notifications.db')
+    
+    Returns:
+        DB 파일 경로
+    """
+    return os.path.join(SHARED_STATE_DIR, db_name)
+
+def connect_shared_db(db_name: str, timeout: float = 5.0) -> sqlite3.Connection:
+    """
+    WAL 모드로 공유 DB 연결 생성
+    
+    Args:
+        db_name: DB 파일명
+        timeout: 잠금 대기 시간 (초)
+    
+    Returns:
+        SQLite 연결 (autocommit 모드)
+    """
+    os.makedirs(SHARED_STATE_DIR, exist_ok=True)
+    
+    conn = sqlite3.connect(
+        get_shared_db_path(db_name),
+        timeout=timeout,
+        isolation_level=None,  # 명시적 BEGIN/COMMIT 사용
+        check_same_thread=False
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def get_shared_connection(db_name: str) -> sqlite3.Connection:
+    """
+    현재 스레드 전용 공유 DB 연결 반환 (스레드별로 재사용)
+    
+    Args:
+        db_name: DB 파일명
+    
+    Returns:
+        SQLite 연결
+    """
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    
+    # fork 이후에는 부모 프로세스의 연결을 재사용하지 않음
+    pid = os.getpid()
+    cached = connections.get(db_name)
+    if cached is not None and cached[0] == pid:
+        return cached[1]
+    
+    conn = connect_shared_db(db_name)
+    connections[db_name] = (pid, conn)
+    logging.debug(f"공유 DB 연결 생성: {db_name} (pid={pid})")
+    return conn
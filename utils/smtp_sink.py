@@ -0,0 +1,130 @@
+"""
+로컬 테스트용 SMTP 수신 서버
+
+관리자 알림 메일을 실제로 보내지 않고 받은 메시지를 기록/출력합니다.
+STARTTLS와 인증은 지원하지 않으므로 SMTP_USE_TLS=false 로 설정해서 사용합니다.
+
+사용법:
+    python -m utils.smtp_sink --port 1025
+"""
+
+import socketserver
+import threading
+import logging
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from typing import List, Dict
+
+class _SmtpSinkHandler(socketserver.StreamRequestHandler):
+    """SMTP 명령 처리기 (HELO/EHLO/MAIL/RCPT/DATA/RSET/NOOP/QUIT)"""
+    
+    def handle(self):
+        self._reply(220, 'babmechu smtp sink ready')
+        envelope = self._new_envelope()
+        
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            
+            if verb in ('HELO', 'EHLO'):
+                self._reply(250, 'localhost')
+            elif verb == 'MAIL':
+                envelope = self._new_envelope()
+                envelope['mail_from'] = command[10:].strip('<> ')
+                self._reply(250, 'OK')
+            elif verb == 'RCPT':
+                envelope['rcpt_to'].append(command[8:].strip('<> '))
+                self._reply(250, 'OK')
+            elif verb == 'DATA':
+                self._reply(354, 'End data with <CR><LF>.<CR><LF>')
+                envelope['data'] = self._read_data()
+                self.server.store(envelope)
+                self._reply(250, 'OK: queued')
+            elif verb == 'RSET':
+                envelope = self._new_envelope()
+                self._reply(250, 'OK')
+            elif verb == 'NOOP':
+                self._reply(250, 'OK')
+            elif verb == 'QUIT':
+                self._reply(221, 'Bye')
+                return
+            else:
+                self._reply(502, 'Command not implemented')
+    
+    def _read_data(self) -> bytes:
+        """DATA 본문 읽기 (dot-stuffing 해제)"""
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            if line.startswith(b'..'):
+                line = line[1:]
+            lines.append(line)
+        return b''.join(lines)
+    
+    def _reply(self, code: int, text: str):
+        self.wfile.write(f"{code} {text}\r\n".encode('utf-8'))
+    
+    @staticmethod
+    def _new_envelope() -> Dict:
+        return {'mail_from': None, 'rcpt_to': [], 'data': b''}
+
+class LocalSmtpSink(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """수신한 메일을 메모리에 보관하는 로컬 SMTP 서버"""
+    
+    allow_reuse_address = True
+    daemon_threads = True
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 1025):
+        super().__init__((host, port), _SmtpSinkHandler)
+        self.messages: List[Dict] = []
+        self._messages_lock = threading.Lock()
+        self._thread = None
+    
+    def store(self, envelope: Dict):
+        """수신 메시지 기록"""
+        message = message_from_bytes(envelope['data'])
+        record = {
+            'mail_from': envelope['mail_from'],
+            'rcpt_to': list(envelope['rcpt_to']),
+            'subject': str(make_header(decode_header(message.get('Subject', '')))),
+            'message': message
+        }
+        
+        with self._messages_lock:
+            self.messages.append(record)
+        
+        logging.info(f"SMTP sink 수신: {record['subject']} -> {record['rcpt_to']}")
+    
+    def start(self) -> 'LocalSmtpSink':
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """서버 종료"""
+        self.shutdown()
+        self.server_close()
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='로컬 테스트용 SMTP 수신 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    
+    sink = LocalSmtpSink(args.host, args.port)
+    print(f"SMTP sink 실행 중: {args.host}:{args.port} (Ctrl+C로 종료)")
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        sink.server_close()